@@ -0,0 +1,179 @@
+import glob
+import os
+import re
+import sys
+import tempfile
+import threading
+import unittest
+
+from transpiler.ast_nodes import LineTable, Program
+from transpiler.aura_parser import AuraParser, COMMAND_RULES, grammar, parse_action_sequence
+from transpiler.correction_queue import CorrectionQueue
+from transpiler.logic_parser import LogicParser
+from transpiler.regex_audit import audit, audit_rule, witness
+from transpiler.syntax_fixer import fixer
+
+EXAMPLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'examples')
+
+
+def _example_lines():
+    lines = set()
+    for path in glob.glob(os.path.join(EXAMPLES_DIR, '*.aura')):
+        with open(path, encoding='utf-8') as f:
+            lines.update(line.strip() for line in f if line.strip())
+    return sorted(lines)
+
+
+class TestGrammarRegistry(unittest.TestCase):
+    def test_parsers_share_one_compiled_grammar(self):
+        self.assertIs(AuraParser().patterns, AuraParser().patterns)
+        self.assertEqual(list(grammar().patterns), [rule[0] for rule in COMMAND_RULES])
+
+    def test_keyword_dispatch_matches_full_scan(self):
+        parser = AuraParser()
+        for line in _example_lines() + ["bold the heading", "CENTER the card", "Go live"]:
+            expected = next(((cmd_type, match.groupdict()) for cmd_type, pattern in parser.patterns.items()
+                             if (match := pattern.match(line))), None)
+            command = parser._parse_line(line, 1)
+            self.assertEqual(command and (command.command_type, command.data), expected, line)
+
+    def test_action_sequence(self):
+        actions = parse_action_sequence(
+            "display 'Hi', then go to page 'about', then make the title bold, then wiggle")
+        self.assertEqual(actions, [
+            {'type': 'display', 'params': {'content': 'Hi'}},
+            {'type': 'navigate_page', 'params': {'page': 'about'}},
+            {'type': 'style_color', 'params': {'element': 'title', 'color': 'bold'}},
+            {'type': 'unknown', 'params': {'raw': 'wiggle'}},
+        ])
+
+
+class TestRegexAudit(unittest.TestCase):
+    def test_no_grammar_rule_is_superlinear(self):
+        offenders = {name: result['input'] for name, result in audit().items() if result['superlinear']}
+        self.assertEqual(offenders, {})
+
+    def test_harness_flags_backtracking_rule(self):
+        pattern = re.compile(r"add\s+(.+)\s+to\s+(.+)", re.IGNORECASE)
+        self.assertTrue(pattern.match(witness(pattern)))
+        self.assertTrue(audit_rule(pattern)['superlinear'])
+
+    def test_add_and_remove_split_on_last_keyword(self):
+        lines = ["add item to cart", "remove gift to mom from cart", "add " + " " * 5000 + "x"]
+        nodes = [LogicParser()._parse_line(line, 1, lines, i) for i, line in enumerate(lines)]
+        self.assertEqual((nodes[0].item, nodes[0].target), ('item', 'cart'))
+        self.assertEqual((nodes[1].item, nodes[1].target), ('gift to mom', 'cart'))
+        self.assertIsNone(nodes[2])
+
+
+class TestCompactNodes(unittest.TestCase):
+    def setUp(self):
+        self.path = os.path.join(EXAMPLES_DIR, 'kingenious_store.aura')
+        with open(self.path, encoding='utf-8') as f:
+            self.lines = f.readlines()
+        self.program = LogicParser().parse_file(self.path)
+
+    def _nodes(self, nodes):
+        for node in nodes:
+            yield node
+            for attr in ('children', 'pages', 'body', 'on_click'):
+                yield from self._nodes(getattr(node, attr, None) or [])
+
+    def test_nodes_are_slotted_and_share_the_line_table(self):
+        nodes = list(self._nodes(self.program.statements))
+        self.assertGreater(len(nodes), 20)
+        for node in nodes:
+            self.assertFalse(hasattr(node, '__dict__'), type(node).__name__)
+            self.assertIsInstance(node._source, LineTable)
+            self.assertEqual(node.raw_line, self.lines[node.line_number - 1].strip())
+
+    def test_same_tree_as_per_line_strings(self):
+        expected = Program(statements=LogicParser()._parse_lines(self.lines))
+        self.assertIsInstance(expected.statements[0]._source, str)
+        self.assertEqual(self.program, expected)
+
+    def test_identifiers_are_interned(self):
+        pages = [node for node in self._nodes(self.program.statements) if type(node).__name__ == 'PageNode']
+        self.assertIs(pages[0].layout, sys.intern('shop_layout'))
+
+
+class _RecordingBrain:
+    def __init__(self):
+        self.batches = []
+
+    def correct_batch(self, lines, use_model=True):
+        self.batches.append(list(lines))
+        return [fixer().fix(line) or (use_model and self.model_fix(line)) or None for line in lines]
+
+    def model_fix(self, line):
+        return "Scroll to the top" if line.startswith("zzq") else None
+
+
+class TestBatchedCorrection(unittest.TestCase):
+    def test_unrecognized_lines_are_corrected_in_one_batch(self):
+        source = ("Use dark theme\n"
+                  "Create a button with the text 'Go'\n"
+                  "When clicked, display 'Hi'\n"
+                  "then refresh the page\n"
+                  "crete a heading with the txt 'Welcome'\n"
+                  "complete gibberish here\n")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'app.aura')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(source)
+            parser = AuraParser()
+            parser.brain = _RecordingBrain()
+            commands = parser.parse_file(path)
+            with open(path, encoding='utf-8') as f:
+                rewritten = f.read().splitlines()
+
+        self.assertEqual(parser.brain.batches, [
+            ["Use dark theme", "crete a heading with the txt 'Welcome'", "complete gibberish here"]])
+        self.assertEqual([c.command_type for c in commands], ['theme', 'ui_button', 'action_sequence', 'ui_heading'])
+        self.assertIn('refresh the page', commands[2].data['actions'])
+        self.assertEqual(rewritten[0], "Use the dark theme")
+        self.assertEqual(rewritten[4], "Create a heading with the text 'Welcome'")
+        self.assertEqual(rewritten[5], "complete gibberish here")
+
+    def test_then_line_after_a_broken_line_is_not_corrected(self):
+        source = ("When clicked, display 'Hi'\n"
+                  "complete gibberish here\n"
+                  "then refresh the page\n")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'app.aura')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(source)
+            parser = AuraParser()
+            parser.brain = _RecordingBrain()
+            commands = parser.parse_file(path)
+
+        # parse_file folds the 'then' line into the sequence, so the brain never sees it
+        self.assertEqual(parser.brain.batches, [["complete gibberish here"]])
+        self.assertEqual([c.command_type for c in commands], ['action_sequence'])
+        self.assertIn('refresh the page', commands[0].data['actions'])
+
+
+class TestDeferredCorrection(unittest.TestCase):
+    def test_build_skips_model_lines_and_the_fix_arrives_later(self):
+        source = "Use dark theme\nzzq qqx\nCreate a button with the text 'Go'\n"
+        patched = threading.Event()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'app.aura')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(source)
+            parser = AuraParser()
+            parser.brain = _RecordingBrain()
+            corrections = CorrectionQueue(lambda filepath: patched.set(), brain=parser.brain)
+            parser.correct_later = corrections.submit
+            try:
+                # The fast path still fixes the typo in the build; the model line is left out
+                commands = parser.parse_file(path)
+                self.assertEqual([c.command_type for c in commands], ['theme', 'ui_button'])
+                self.assertTrue(patched.wait(5))
+                self.assertTrue(corrections.wrote(path))
+                with open(path, encoding='utf-8') as f:
+                    self.assertEqual(f.read().splitlines()[1], "Scroll to the top")
+                self.assertEqual([c.command_type for c in parser.parse_file(path)], ['theme', 'scroll', 'ui_button'])
+            finally:
+                corrections.stop()
+        self.assertEqual(parser.brain.batches[:2], [["Use dark theme", "zzq qqx"], ["zzq qqx"]])
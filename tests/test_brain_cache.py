@@ -0,0 +1,147 @@
+import os
+import re
+import tempfile
+import unittest
+
+from transpiler.brain import AuraBrain
+from transpiler.brain_cache import CorrectionCache, MISS, brain_key
+from transpiler.brain_prompts import PREFIX, SYSTEM_PROMPT, PromptPrefix, complete, decoding
+from transpiler.setup import MODEL_PATH
+
+
+class TestCorrectionCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = CorrectionCache(self.tmp.name)
+        self.brain = brain_key(MODEL_PATH, SYSTEM_PROMPT)
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def test_hits_ignore_whitespace_and_persist(self):
+        self.assertIs(self.cache.lookup("crete a butn", self.brain), MISS)
+        self.cache.store("crete a butn", self.brain, "Create a button with the text 'Go'")
+        self.cache.store("gibberish", self.brain, None)
+
+        reopened = CorrectionCache(self.tmp.name)
+        self.assertEqual(reopened.lookup("  crete   a\tbutn ", self.brain), "Create a button with the text 'Go'")
+        self.assertIsNone(reopened.lookup("gibberish", self.brain))
+        self.assertIs(reopened.lookup("crete a butn", brain_key(MODEL_PATH, SYSTEM_PROMPT + "v2")), MISS)
+        # Free-form answers and those of another grammar aren't reused for constrained decoding
+        self.assertIs(reopened.lookup("crete a butn", brain_key(MODEL_PATH, SYSTEM_PROMPT, decoding(True, True))), MISS)
+        self.assertNotEqual(decoding(True, True), decoding(False, True))
+        self.assertNotEqual(decoding(True, True), decoding(True, False))
+        reopened.close()
+
+    def test_size_bound_evicts_oldest(self):
+        cache = CorrectionCache(self.tmp.name, max_entries=10)
+        for i in range(100):
+            cache.store(f"line {i}", self.brain, None)
+        cache._evict(cache._connect())
+        count = cache._connect().execute("SELECT COUNT(*) FROM corrections").fetchone()[0]
+        self.assertEqual(count, 10)
+        cache._memory.clear()
+        self.assertIs(cache.lookup("line 0", self.brain), MISS)
+        self.assertIsNone(cache.lookup("line 99", self.brain))
+        cache.close()
+
+    def test_brain_answers_from_cache_without_model(self):
+        brain = AuraBrain()
+        previous = AuraBrain._cache
+        AuraBrain._cache = self.cache
+        try:
+            self.cache.store("crete a butn with text 'Hi'", self.brain, "Create a button with the text 'Hi'")
+            self.assertEqual(brain.fix_syntax("crete a butn  with text 'Hi'"), "Create a button with the text 'Hi'")
+            self.assertIsNone(brain._model)
+        finally:
+            AuraBrain._cache = previous
+
+
+class _CountingModel:
+    """Answers every numbered line with a valid command"""
+
+    def __init__(self):
+        self.prompts = []
+
+    def __call__(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        user = prompt.split("<|im_start|>user\n", 1)[1].split("<|im_end|>", 1)[0]
+        numbers = [row.split('.', 1)[0] for row in user.splitlines()]
+        text = "\n".join(f"{n}. Scroll to the top" for n in numbers)
+        if kwargs.get('stream'):
+            return ({'choices': [{'text': piece}]} for piece in re.findall(r"\s*\S+", text))
+        return {'choices': [{'text': text}]}
+
+
+class TestBatchCorrection(unittest.TestCase):
+    def test_distinct_model_lines_share_completions(self):
+        brain = AuraBrain()
+        model = _CountingModel()
+        with tempfile.TemporaryDirectory() as tmp:
+            previous, AuraBrain._cache = AuraBrain._cache, CorrectionCache(tmp)
+            brain._model = model
+            try:
+                lines = [f"zzq qqx {i}" for i in range(20)] * 2 + ["Use dark theme"]
+                results = brain.correct_batch(lines)
+                # 20 distinct lines for the model -> 3 completions of at most 8 lines
+                self.assertEqual(len(model.prompts), 3)
+                self.assertEqual(results[:40], ["Scroll to the top"] * 40)
+                self.assertEqual(results[40], "Use the dark theme")
+                # Answered from the cache now
+                self.assertEqual(brain.fix_syntax("zzq  qqx 7"), "Scroll to the top")
+                self.assertEqual(len(model.prompts), 3)
+            finally:
+                brain._model = None
+                AuraBrain._cache.close()
+                AuraBrain._cache = previous
+
+
+class _StatefulModel(_CountingModel):
+    """Records the state calls a llama.cpp model gets around each prompt"""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def tokenize(self, text, add_bos=True, special=False):
+        return list(text.decode('utf-8'))
+
+    def reset(self):
+        self.calls.append('reset')
+
+    def eval(self, tokens):
+        self.calls.append(('eval', "".join(tokens)))
+
+    def save_state(self):
+        return 'after-prefix'
+
+    def load_state(self, state):
+        self.calls.append(('load', state))
+
+    def __call__(self, prompt, **kwargs):
+        self.calls.append('prompt')
+        return super().__call__(prompt, **kwargs)
+
+
+class TestPromptPrefix(unittest.TestCase):
+    def test_prefix_evaluated_once_and_restored_per_request(self):
+        model = _StatefulModel()
+        prefix = PromptPrefix(model)
+        self.assertTrue(prefix.enabled)
+        self.assertEqual(model.calls, ['reset', ('eval', PREFIX)])
+        for _ in range(3):
+            complete(model, ["zzq", "qqx"], max_tokens=8, prefix=prefix)
+        self.assertEqual(model.calls[2:], [('load', 'after-prefix'), 'prompt'] * 3)
+        self.assertTrue(all(prompt.startswith(PREFIX) for prompt in model.prompts))
+
+    def test_backend_without_state_falls_back_to_full_prompts(self):
+        model = _CountingModel()
+        prefix = PromptPrefix(model)
+        self.assertFalse(prefix.enabled)
+        complete(model, ["zzq"], max_tokens=8, prefix=prefix)
+        self.assertTrue(model.prompts[0].startswith(PREFIX))
+
+
+if __name__ == '__main__':
+    unittest.main()
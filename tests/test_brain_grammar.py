@@ -0,0 +1,119 @@
+import random
+import re
+import unittest
+from unittest import mock
+
+from transpiler import brain_prompts
+from transpiler.brain_grammar import NO_FIX, CommandStream, command_gbnf, derives, sample
+from transpiler.brain_prompts import complete, validated
+from transpiler.syntax_fixer import fixer
+
+
+class _GrammarModel:
+    """Records the sampling arguments of each completion"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, prompt, **kwargs):
+        self.calls.append(kwargs)
+        return {'choices': [{'text': "Scroll to the top"}]}
+
+
+class _StreamingModel:
+    """Streams a fixed answer word by word, and notes when generation is cut off"""
+
+    def __init__(self, answer):
+        self.answer = answer
+        self.generated = 0
+        self.closed = False
+
+    def __call__(self, prompt, stream=False, **kwargs):
+        def chunks():
+            try:
+                for piece in re.findall(r"\s*\S+", self.answer):
+                    self.generated += 1
+                    yield {'choices': [{'text': piece}]}
+            finally:
+                self.closed = True
+        return chunks()
+
+
+class TestCommandGrammar(unittest.TestCase):
+    def test_every_derivation_parses(self):
+        rng = random.Random(7)
+        for _ in range(300):
+            line = sample(rng)
+            self.assertTrue(fixer().accepts(line), line)
+            self.assertTrue(derives(line), line)
+
+    def test_canonical_lines_only(self):
+        for line in ["Create a button with the text 'Go'",
+                     "Create a card with the title 'A' and description 'B'",
+                     "When clicked, display 'Hi', then refresh the page",
+                     "Use the dark theme"]:
+            self.assertTrue(derives(line), line)
+        for line in ["crete a butn", "Use the dark theme please", "Use  the dark theme",
+                     "When clicked, explode the page"]:
+            self.assertFalse(derives(line), line)
+
+    def test_gbnf_defines_every_rule_it_uses(self):
+        text = command_gbnf(3)
+        self.assertTrue(text.startswith('root ::= "1. " answer "\\n" "2. " answer "\\n" "3. " answer\n'))
+        bodies = [re.sub(r'"(\\.|[^"\\])*"|\[(\\.|[^\]\\])*\]', ' ', row.split(" ::= ", 1)[1])
+                  for row in text.splitlines()]
+        defined = {row.split(" ::= ", 1)[0] for row in text.splitlines()}
+        used = set(re.findall(r"[a-z][a-z0-9-]*", " ".join(bodies)))
+        self.assertEqual(used - defined, set())
+
+    def test_garbage_can_escape_to_no_fix(self):
+        self.assertTrue(command_gbnf(1).startswith("root ::= answer\n"))
+        self.assertTrue(derives(NO_FIX, 'answer'))
+        self.assertTrue(derives("Use the dark theme", 'answer'))
+        self.assertFalse(derives(NO_FIX))
+        self.assertIsNone(validated(NO_FIX))
+        self.assertEqual(validated("Use the dark theme"), "Use the dark theme")
+
+    def test_complete_passes_the_grammar_when_constrained(self):
+        model = _GrammarModel()
+        with mock.patch.object(brain_prompts, 'llama_grammar', lambda count: ("grammar", count)):
+            complete(model, ["zzq"], max_tokens=16, constrain=True)
+            complete(model, ["zzq"], max_tokens=16)
+        self.assertEqual(model.calls[0]['grammar'], ("grammar", 1))
+        self.assertNotIn('grammar', model.calls[1])
+
+
+class TestEarlyStop(unittest.TestCase):
+    def _stream(self, answer):
+        model, usage, partials = _StreamingModel(answer), {}, []
+        result = complete(model, ["zzq"], max_tokens=64, stream=True, usage=usage,
+                          on_partial=lambda index, text, whole: partials.append((text, whole)))
+        return result[0], model, usage, partials
+
+    def test_stops_when_the_command_cannot_go_on(self):
+        answer, model, usage, partials = self._stream(
+            "Create a button with the text 'Go' because the user wanted a button")
+        self.assertEqual(answer, "Create a button with the text 'Go'")
+        self.assertEqual(usage['completion_tokens'], 7)
+        self.assertEqual(model.generated, 7)
+        self.assertTrue(model.closed)
+        self.assertEqual(partials[0], ("Create", False))
+        self.assertEqual(partials[-1], ("Create a button with the text 'Go'", True))
+
+    def test_cuts_text_run_on_past_a_command(self):
+        answer, model, _, partials = self._stream("hide the button now please")
+        self.assertEqual(answer, "hide the button")
+        self.assertEqual(model.generated, 4)
+        self.assertEqual(partials[-1], ("hide the button", True))
+
+    def test_unrecognized_answers_run_to_the_end(self):
+        stream = CommandStream()
+        self.assertIsNone(stream.feed("Well"))
+        self.assertTrue(stream.given_up)
+        answer, model, usage, _ = self._stream("Well, I think it means scroll up")
+        self.assertEqual(answer, "Well, I think it means scroll up")
+        self.assertEqual(usage['completion_tokens'], 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
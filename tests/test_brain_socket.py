@@ -0,0 +1,238 @@
+import asyncio
+import os
+import re
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from transpiler.brain import AuraBrain
+from transpiler.brain_cache import CorrectionCache
+from transpiler.brain_client import AuraBrainClient
+from transpiler.brain_daemon import AlreadyRunning, AuraBrainDaemon
+from transpiler.brain_ipc import PID_FILE, lock_daemon, running_pid, socket_path, unlock_daemon
+
+
+class _SlowModel:
+    """Answers every numbered line after a short delay, like a model would"""
+
+    def __init__(self):
+        self.prompts = []
+
+    def __call__(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        time.sleep(0.02)
+        user = prompt.split("<|im_start|>user\n", 1)[1].split("<|im_end|>", 1)[0]
+        rows = user.splitlines()
+        if len(rows) == 1:
+            text = "Scroll to the top"
+        else:
+            text = "\n".join(f"{row.split('.', 1)[0]}. Scroll to the top" for row in rows)
+        if kwargs.get('stream'):
+            return ({'choices': [{'text': piece}]} for piece in re.findall(r"\s*\S+", text))
+        return {'choices': [{'text': text}]}
+
+
+class TestSocketDaemon(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.model = _SlowModel()
+        self.daemon = AuraBrainDaemon(model=self.model, brain_dir=self.tmp.name)
+        self.daemon.start()
+        self.thread = threading.Thread(target=lambda: asyncio.run(self.daemon.serve()), daemon=True)
+        self.thread.start()
+        self.clients = [AuraBrainClient(self.tmp.name) for _ in range(2)]
+        deadline = time.time() + 5
+        while not all(client.connect() for client in self.clients) and time.time() < deadline:
+            time.sleep(0.01)
+
+    def tearDown(self):
+        self.clients[0].stop_daemon()
+        self.thread.join(5)
+        self.clients[1].close()
+        self.daemon.cache.close()
+        self.tmp.cleanup()
+
+    def test_pipelined_requests_from_two_clients_share_the_model(self):
+        futures = [(line, client.submit("correct", {"line": line}))
+                   for i in range(6) for client, line in ((self.clients[0], f"zzq a {i}"), (self.clients[1], f"zzq b {i}"))]
+        for line, future in futures:
+            result = future.result(10)["result"]
+            self.assertEqual(result["original"], line)
+            self.assertEqual(result["corrected"], "Scroll to the top")
+        # Requests queued while the model was busy were answered together
+        self.assertLess(len(self.model.prompts), len(futures))
+
+    def test_ping_errors_and_shared_answers(self):
+        self.assertTrue(self.clients[1].ping())
+        self.assertIn("Unknown method", self.clients[0]._send_request("nope", {})["error"]["message"])
+        self.assertEqual(self.clients[0].correct_batch(["zzq same", "Use dark theme"])[1]["corrected"],
+                         "Use the dark theme")
+        prompts = len(self.model.prompts)
+        self.assertEqual(self.clients[1].correct("zzq  same")["corrected"], "Scroll to the top")
+        self.assertEqual(len(self.model.prompts), prompts)
+
+    def test_streamed_correction_reports_partials(self):
+        partials = []
+        result = self.clients[0].correct("zzq stream", on_partial=lambda text, whole: partials.append((text, whole)))
+        self.assertEqual(result["corrected"], "Scroll to the top")
+        self.assertEqual(partials, [("Scroll", False), ("Scroll to", False), ("Scroll to the", False),
+                                    ("Scroll to the top", True)])
+        self.assertEqual(result["tokens"], 4)
+        self.assertEqual(self.clients[1].status()["tokens_per_correction"], 4)
+
+    def test_in_process_brain_prefers_the_daemon(self):
+        brain = AuraBrain()
+        previous = AuraBrain._client, AuraBrain._cache
+        AuraBrain._client, AuraBrain._cache = self.clients[1], CorrectionCache(self.tmp.name)
+        try:
+            self.assertEqual(brain.correct_batch(["zzq x", "Use dark theme"]), ["Scroll to the top", "Use the dark theme"])
+            self.assertIsNone(brain._model)
+            self.assertEqual(len(self.model.prompts), 1)
+        finally:
+            AuraBrain._cache.close()
+            AuraBrain._client, AuraBrain._cache = previous
+
+
+class TestDaemonLifecycle(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _serve(self, daemon):
+        thread = threading.Thread(target=lambda: asyncio.run(daemon.serve()), daemon=True)
+        thread.start()
+        return thread
+
+    def test_requests_wait_while_the_model_loads(self):
+        daemon = AuraBrainDaemon(model=_SlowModel(), brain_dir=self.tmp.name, idle_timeout=0)
+        load = daemon.start
+        daemon.start = lambda: time.sleep(0.3) or load()
+        thread = self._serve(daemon)
+        client = AuraBrainClient(self.tmp.name)
+        deadline = time.time() + 5
+        while not client.connect() and time.time() < deadline:
+            time.sleep(0.01)
+        # Listening before the model is loaded, and the pidfile already names the daemon
+        self.assertEqual(client.status()["state"], "loading")
+        self.assertEqual(running_pid(self.tmp.name), os.getpid())
+        pending = client.submit("correct", {"line": "zzq early"})
+        self.assertTrue(client.wait_ready(timeout=5))
+        self.assertEqual(pending.result(5)["result"]["corrected"], "Scroll to the top")
+
+        # A second client reuses the daemon instead of spawning one
+        other = AuraBrainClient(self.tmp.name)
+        self.assertTrue(other.start_daemon())
+        self.assertIsNone(other.process)
+        other.close()
+        client.stop_daemon()
+        thread.join(5)
+        daemon.cache.close()
+
+    def test_in_process_brain_never_loads_beside_a_loading_daemon(self):
+        daemon = AuraBrainDaemon(model=_SlowModel(), brain_dir=self.tmp.name, idle_timeout=0)
+        loaded = threading.Event()
+        load = daemon.start
+
+        def slow_load():
+            loaded.wait(5)
+            load()
+        daemon.start = slow_load
+        thread = self._serve(daemon)
+        client = AuraBrainClient(self.tmp.name)
+        deadline = time.time() + 5
+        while not client.connect() and time.time() < deadline:
+            time.sleep(0.01)
+        wait_ready = client.wait_ready
+        client.wait_ready = lambda timeout=0.3: wait_ready(timeout)
+        previous = AuraBrain._client, AuraBrain._cache
+        AuraBrain._client, AuraBrain._cache = client, CorrectionCache(self.tmp.name)
+        try:
+            with mock.patch.object(AuraBrain, 'initialize', return_value=False) as initialize:
+                # The daemon makes no progress within the timeout: no answer, and no second model
+                self.assertEqual(AuraBrain().correct_batch(["zzq loading"]), [None])
+                loaded.set()
+                self.assertEqual(AuraBrain().correct_batch(["zzq loading"]), ["Scroll to the top"])
+            initialize.assert_not_called()
+        finally:
+            loaded.set()
+            AuraBrain._cache.close()
+            AuraBrain._client, AuraBrain._cache = previous
+            client.stop_daemon()
+            thread.join(5)
+            daemon.cache.close()
+
+    def test_idle_daemon_exits_and_cleans_up(self):
+        daemon = AuraBrainDaemon(model=_SlowModel(), brain_dir=self.tmp.name, idle_timeout=0.2)
+        thread = self._serve(daemon)
+        client = AuraBrainClient(self.tmp.name)
+        deadline = time.time() + 5
+        while not client.connect() and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(client.wait_ready(timeout=5))
+        self.assertEqual(client.correct("zzq once")["corrected"], "Scroll to the top")
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertFalse(os.path.exists(socket_path(self.tmp.name)))
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, PID_FILE)))
+        client.close()
+        daemon.cache.close()
+
+    def test_second_daemon_leaves_the_running_one_alone(self):
+        daemon = AuraBrainDaemon(model=_SlowModel(), brain_dir=self.tmp.name, idle_timeout=0)
+        thread = self._serve(daemon)
+        client = AuraBrainClient(self.tmp.name)
+        deadline = time.time() + 5
+        while not client.connect() and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(client.wait_ready(timeout=5))
+
+        second = AuraBrainDaemon(model=_SlowModel(), brain_dir=self.tmp.name, idle_timeout=0)
+        with self.assertRaises(AlreadyRunning):
+            asyncio.run(second.serve())
+        second.cache.close()
+        self.assertTrue(os.path.exists(socket_path(self.tmp.name)))
+        self.assertEqual(running_pid(self.tmp.name), os.getpid())
+        self.assertEqual(client.correct("zzq still")["corrected"], "Scroll to the top")
+        client.stop_daemon()
+        thread.join(5)
+        daemon.cache.close()
+
+    def test_daemon_still_starting_keeps_the_project(self):
+        # Another daemon has taken the lock but isn't listening yet
+        lock = lock_daemon(self.tmp.name)
+        with open(socket_path(self.tmp.name), 'w'):
+            pass
+        try:
+            late = AuraBrainDaemon(model=_SlowModel(), brain_dir=self.tmp.name, idle_timeout=0)
+            with self.assertRaises(AlreadyRunning):
+                asyncio.run(late.serve())
+            late.cache.close()
+            self.assertTrue(os.path.exists(socket_path(self.tmp.name)))
+        finally:
+            unlock_daemon(lock)
+
+    def test_files_of_a_dead_daemon_are_replaced(self):
+        with open(socket_path(self.tmp.name), 'w'):
+            pass
+        with open(os.path.join(self.tmp.name, PID_FILE), 'w') as f:
+            f.write("999999999")
+        daemon = AuraBrainDaemon(model=_SlowModel(), brain_dir=self.tmp.name, idle_timeout=0)
+        thread = self._serve(daemon)
+        client = AuraBrainClient(self.tmp.name)
+        deadline = time.time() + 5
+        while not client.connect() and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(client.wait_ready(timeout=5))
+        self.assertEqual(running_pid(self.tmp.name), os.getpid())
+        client.stop_daemon()
+        thread.join(5)
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, PID_FILE)))
+        daemon.cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
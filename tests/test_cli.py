@@ -0,0 +1,31 @@
+import unittest
+
+from transpiler.cli import _build_options
+
+
+class TestBuildOptions(unittest.TestCase):
+    def test_flags_become_transpiler_options(self):
+        options = _build_options(['store.aura', '--prerender', '--fetch-ttl=2.5'])
+        self.assertEqual(options, {'prerender': True, 'fetch_ttl': 2.5})
+        self.assertEqual(_build_options(['--fetch-ttl=0']), {'fetch_ttl': 0.0})
+
+    def test_bad_fetch_ttl_is_a_usage_error(self):
+        for value in ['soon', '-5', 'nan', 'inf', '']:
+            with self.assertRaises(ValueError, msg=value):
+                _build_options([f'--fetch-ttl={value}'])
+
+    def test_prefetch_modes_and_unknown_flags(self):
+        self.assertEqual(_build_options(['--prefetch=IDLE']), {'prefetch': 'idle'})
+        self.assertEqual(_build_options(['--prefetch=none']), {'prefetch': None})
+        for args in (['--prefetch=eager'], ['--prerendr'], ['--fetch-ttl', '30']):
+            with self.assertRaises(ValueError, msg=args):
+                _build_options(args)
+
+    def test_css_modes(self):
+        self.assertEqual(_build_options(['--css=Precompute']), {'css_mode': 'precompute'})
+        with self.assertRaises(ValueError):
+            _build_options(['--css=tailwind'])
+
+
+if __name__ == '__main__':
+    unittest.main()
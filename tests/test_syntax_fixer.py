@@ -0,0 +1,78 @@
+import tempfile
+import unittest
+
+from transpiler.brain import AuraBrain
+from transpiler.brain_cache import CorrectionCache
+from transpiler.syntax_fixer import edit_distance, fixer
+
+
+class TestSyntaxFixer(unittest.TestCase):
+    def test_typos_and_missing_fillers(self):
+        cases = {
+            "crete a button with text 'Click'": "Create a button with the text 'Click'",
+            "crteate a butn with the text 'Go'": "Create a button with the text 'Go'",
+            "create is card with title 'Hello'": "Create a card with title 'Hello'",
+            "Use dark theme": "Use the dark theme",
+            "make button red": "Make the button red",
+            "when clicked show card": "When clicked, show the card",
+            "Create input with the txet 'Name'": "Create an input with the text 'Name'",
+            "Creat a paragraph with the text \"Hi\".": "Create a paragraph with the text \"Hi\".",
+        }
+        for broken, expected in cases.items():
+            self.assertEqual(fixer().fix(broken), expected, broken)
+
+    def test_articles_only_before_grammar_nouns(self):
+        for line in ["show me", "make it red", "hide it"]:
+            self.assertIsNone(fixer().fix(line), line)
+        self.assertIn("card", fixer().nouns)
+        self.assertNotIn("it", fixer().nouns)
+
+    def test_quoted_values_are_kept(self):
+        cases = {
+            "Create a card with the title 'A' and description 'B'": "Create a card with the title 'A' and description 'B'",
+            "create a button with text 'a'": "Create a button with the text 'a'",
+            "crete a heading with the text 'The'": "Create a heading with the text 'The'",
+            "create a paragraph with the text 'with  the  a'": "Create a paragraph with the text 'with  the  a'",
+        }
+        for broken, expected in cases.items():
+            self.assertEqual(fixer().fix(broken), expected, broken)
+
+    def test_identifiers_and_values_are_never_respelled(self):
+        # Each identifier or value is close to a grammar word: card/cart, email/small, form/from, blue/value
+        cases = {
+            "Make teh card blue": "Make the card blue",
+            "Hide teh cart": "Hide the cart",
+            "Fcus on the email": "Focus on the email",
+            "Shwo the form": "Show the form",
+            "Teh user's name is 'Bob'": "The user's name is 'Bob'",
+            "When clicked, hide teh cart, then fcus on the email":
+                "When clicked, hide the cart, then focus on the email",
+        }
+        for broken, expected in cases.items():
+            self.assertEqual(fixer().fix(broken), expected, broken)
+
+    def test_leaves_unfixable_lines_to_the_model(self):
+        self.assertIsNone(fixer().fix("asdf qwer zxcv"))
+        self.assertIsNone(fixer().fix("Create a paragraph 'Hello'"))
+        # Technically parseable, but not a correction of the line
+        self.assertIsNone(fixer().fix("slot"))
+        self.assertIsNone(fixer().fix("slot # This is where pages render dynamically"))
+
+    def test_suggestions_come_from_the_grammar(self):
+        self.assertEqual(fixer().suggest("butn")[0], "button")
+        self.assertEqual(edit_distance("teh", "the"), 1)
+        self.assertGreater(edit_distance("display", "toggle"), 2)
+
+    def test_brain_uses_fast_path_before_the_model(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            previous, AuraBrain._cache = AuraBrain._cache, CorrectionCache(tmp)
+            try:
+                self.assertEqual(AuraBrain().fix_syntax("Scrol to teh top"), "Scroll to the top")
+                self.assertIsNone(AuraBrain()._model)
+            finally:
+                AuraBrain._cache.close()
+                AuraBrain._cache = previous
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,560 @@
+import difflib
+import json
+import os
+import re
+import tempfile
+import unittest
+import urllib.request
+from pathlib import Path
+from unittest import mock
+
+from transpiler.analyzer import build_report, diff_reports, format_summary
+from transpiler.dev_server import AuraDevServer
+from transpiler.html_generator import HTMLGenerator
+from transpiler.image_pipeline import Image, ImagePipeline
+from transpiler.logic_parser import LogicParser
+from transpiler.ast_nodes import PageNode, VariableNode
+from transpiler.module_server import ModuleServer
+from transpiler.prerender import evaluate, render_page
+from transpiler.source_map import encode_vlq
+from transpiler.stylesheet import build_stylesheet, extract_classes
+from transpiler.transpiler import AuraTranspiler
+from transpiler.ui_nodes import ListNode, TextNode
+
+
+STORE_APP = """app "Test Store"
+
+set cart to []
+set user to "guest"
+set catalog to fetch from "inventory.json"
+
+layout shop_layout
+    sidebar
+        button "Home" goes to home
+    slot
+
+page home uses shop_layout
+    main
+        text "Welcome"
+        button "Shop" goes to shop
+
+page shop uses shop_layout
+    set deals to fetch from "inventory.json"
+    main
+        text "Inventory"
+        text cart.length
+        text sum(cart)
+        panel "About"
+            text "Hand-picked goods"
+        grid products from cart columns 4 virtual 96
+            text item.name
+        list cart
+            text item.name
+"""
+
+
+class TranspilerOutputTestCase(unittest.TestCase):
+    """Builds a small app into a temporary .aura_engine and reads it back"""
+
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        with open('store.aura', 'w', encoding='utf-8') as f:
+            f.write(STORE_APP)
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def build(self, **options):
+        self.assertTrue(AuraTranspiler(**options).build('store.aura'))
+
+    def read(self, *parts):
+        with open(os.path.join(AuraTranspiler.ENGINE_DIR, *parts), encoding='utf-8') as f:
+            return f.read()
+
+
+class TestRouterCodeSplitting(TranspilerOutputTestCase):
+    def test_pages_are_lazy_loaded(self):
+        self.build()
+        app = self.read('src', 'App.jsx')
+        self.assertIn("const Home = lazy(pageLoaders.Home);", app)
+        self.assertIn("<Suspense", app)
+        self.assertNotIn("from './pages/", app)
+        self.assertIn("Shop: () => import('./pages/Shop')", self.read('src', 'routes.js'))
+
+    def test_static_imports_when_disabled(self):
+        self.build(code_split=False)
+        app = self.read('src', 'App.jsx')
+        self.assertIn("import Home from './pages/Home';", app)
+        self.assertNotIn("Suspense", app)
+
+    def test_hover_prefetch_for_navigation_targets(self):
+        self.build()
+        home = self.read('src', 'pages', 'Home.jsx')
+        self.assertIn("import { prefetchRoute } from '../routes';", home)
+        self.assertIn("onMouseEnter={handleMouseEnterEl3}", home)
+        self.assertIn("useCallback(() => { prefetchRoute('/shop'); }, []);", home)
+
+    def test_layout_chunk_grouping(self):
+        self.build(group_layout_chunks=True)
+        vite_config = self.read('vite.config.js')
+        self.assertIn('"Home": "layout-shoplayout"', vite_config)
+        self.assertIn("manualChunks", vite_config)
+
+
+class TestGlobalStore(TranspilerOutputTestCase):
+    def test_store_uses_external_subscriptions(self):
+        self.build()
+        context = self.read('src', 'context', 'GlobalContext.jsx')
+        self.assertIn("useSyncExternalStore", context)
+        self.assertIn("setCart: (value) => setGlobalValue('cart', value),", context)
+
+    def test_pages_subscribe_only_to_keys_they_read(self):
+        self.build()
+        shop = self.read('src', 'pages', 'Shop.jsx')
+        self.assertIn("const cart = useGlobalValue('cart');", shop)
+        self.assertNotIn("useGlobalValue('user')", shop)
+        home = self.read('src', 'pages', 'Home.jsx')
+        self.assertNotIn("useGlobalValue", home)
+
+
+class TestFetchCache(TranspilerOutputTestCase):
+    def test_page_fetches_go_through_the_cache(self):
+        self.build()
+        shop = self.read('src', 'pages', 'Shop.jsx')
+        self.assertIn("import { subscribeFetch } from '../fetchCache';", shop)
+        self.assertIn("const stopDeals = subscribeFetch('inventory.json', setDeals);", shop)
+        self.assertIn("return () => { stopDeals(); };", shop)
+        self.assertNotIn("fetch('", shop)
+
+    def test_global_fetches_share_the_cache(self):
+        self.build()
+        context = self.read('src', 'context', 'GlobalContext.jsx')
+        self.assertIn("subscribeFetch('inventory.json', globalSetters.setCatalog)", context)
+
+    def test_cache_module_uses_configured_ttl(self):
+        self.build(fetch_ttl=5)
+        cache = self.read('src', 'fetchCache.js')
+        self.assertIn("const FETCH_TTL = 5000;", cache)
+        self.assertIn("if (!entry.request)", cache)
+
+
+class TestVirtualRepeaters(TranspilerOutputTestCase):
+    def test_virtual_grid_is_always_windowed(self):
+        self.build()
+        shop = self.read('src', 'pages', 'Shop.jsx')
+        self.assertIn("import VirtualRepeater from '../components/VirtualRepeater';", shop)
+        self.assertIn("<VirtualRepeater items={cart} columns={4} threshold={0}", shop)
+        self.assertIn("rowHeight={96}", shop)
+        self.assertIn("ResizeObserver", self.read('src', 'components', 'VirtualRepeater.jsx'))
+
+    def test_plain_lists_use_the_automatic_threshold(self):
+        self.build(virtualize_threshold=50)
+        shop = self.read('src', 'pages', 'Shop.jsx')
+        self.assertIn("<VirtualRepeater items={cart} columns={1} threshold={50}", shop)
+
+    def test_threshold_disabled_keeps_plain_map(self):
+        self.build(virtualize_threshold=None)
+        shop = self.read('src', 'pages', 'Shop.jsx')
+        self.assertIn("{cart && cart.map((item, index) => (", shop)
+
+    def test_legacy_pages_use_the_threshold(self):
+        with open('legacy.aura', 'w', encoding='utf-8') as f:
+            f.write("Create a button with the text 'Go'\n")
+        with mock.patch('transpiler.transpiler.HTMLGenerator', wraps=HTMLGenerator) as generator:
+            self.assertTrue(AuraTranspiler(virtualize_threshold=50).build('legacy.aura'))
+        self.assertEqual(generator.call_args.kwargs['virtualize_threshold'], 50)
+
+    def test_ref_and_handlers_are_forwarded(self):
+        generator = HTMLGenerator(component_name='Feed', virtualize_threshold=50)
+        generator._handle_ast_node(ListNode(1, 'list posts', items_expr='posts', children=[
+            TextNode(2, 'text item.title', value='item.title', is_binding=True)]), generator.elements)
+        el_id = generator.elements[0]['id']
+        generator.handlers[el_id] = {'onScroll': f"() => {{ loadMore({el_id}_ref); }}"}
+        feed = generator._build_jsx()
+        self.assertIn(f'rowClassName="gap-4" ref={{{el_id}_ref}} onScroll={{', feed)
+        self.build()
+        repeater = self.read('src', 'components', 'VirtualRepeater.jsx')
+        self.assertIn("export default forwardRef(function VirtualRepeater(", repeater)
+        self.assertIn("{...rest}", repeater)
+
+
+class TestDeadCodeElimination(TranspilerOutputTestCase):
+    def test_unused_refs_and_helpers_are_dropped(self):
+        self.build()
+        shop = self.read('src', 'pages', 'Shop.jsx')
+        self.assertNotIn("useRef", shop)
+        self.assertNotIn("ref={", shop)
+        self.assertNotIn("useNavigate", shop)
+        self.assertNotIn("const sum =", self.read('src', 'pages', 'Home.jsx'))
+
+    def test_navigate_kept_when_referenced(self):
+        self.build()
+        home = self.read('src', 'pages', 'Home.jsx')
+        self.assertIn("const navigate = useNavigate();", home)
+        self.assertIn("import { useNavigate } from 'react-router-dom';", home)
+
+    def test_report_records_bytes_saved(self):
+        transpiler = AuraTranspiler(report_dce=True)
+        self.assertTrue(transpiler.build('store.aura'))
+        self.assertGreater(transpiler.dce_report['Shop'], 0)
+
+    def test_report_counts_only_pruned_code(self):
+        program = LogicParser().parse_file('store.aura')
+        shared = {stmt.name: stmt.value for stmt in program.statements if isinstance(stmt, VariableNode)}
+        shop = next(stmt for stmt in program.statements if isinstance(stmt, PageNode) and stmt.name == 'shop')
+        generator = HTMLGenerator(component_name='Shop', shared_states=shared)
+        pruned = generator.generate(shop)
+        full = HTMLGenerator(component_name='Shop', shared_states=shared, eliminate_dead_code=False).generate(shop)
+        self.assertIn("staticBlock1", full)
+
+        # Every difference is a dropped ref, state, helper or import, nothing hoisting or memoization changed
+        removed = 0
+        full_lines, pruned_lines = full.splitlines(), pruned.splitlines()
+        for op, i1, i2, j1, j2 in difflib.SequenceMatcher(None, full_lines, pruned_lines).get_opcodes():
+            if op == 'equal':
+                continue
+            self.assertIn(op, ('delete', 'replace'), full_lines[i1:i2])
+            for line in full_lines[i1:i2]:
+                stripped = re.sub(r" ref=\{el_\d+_ref\}", "", line)
+                if stripped in pruned_lines[j1:j2]:
+                    removed += len(line) - len(stripped)
+                else:
+                    self.assertRegex(line, r"^import |^    const (navigate|sum|el_\d+_ref|\[\w+, set\w+\]) = ")
+                    removed += len(line) + 1
+            for line in pruned_lines[j1:j2]:
+                if line.startswith("import "):
+                    removed -= len(line) + 1
+        self.assertEqual(generator.dead_code_savings(pruned), removed)
+
+
+class TestMemoization(TranspilerOutputTestCase):
+    def test_static_subtrees_are_hoisted(self):
+        self.build()
+        shop = self.read('src', 'pages', 'Shop.jsx')
+        hoisted, component = shop.split("export default function Shop()")
+        self.assertIn("const staticBlock1 = (", hoisted)
+        self.assertIn(">Hand-picked goods<", hoisted)
+        self.assertIn("{staticBlock1}", component)
+        self.assertNotIn("staticBlock", self.read('src', 'pages', 'Home.jsx'))
+
+    def test_derived_bindings_use_memo(self):
+        self.build()
+        shop = self.read('src', 'pages', 'Shop.jsx')
+        self.assertIn("const derived1 = useMemo(() => sum(cart), [cart]);", shop)
+        self.assertIn(">{derived1}<", shop)
+        self.assertIn(">{cart.length}<", shop)
+        self.assertIn(">{item.name}<", shop)
+
+    def test_handlers_use_callback(self):
+        self.build()
+        home = self.read('src', 'pages', 'Home.jsx')
+        self.assertIn("import React, { useCallback } from 'react';", home)
+        self.assertIn("const handleClickEl3 = useCallback(() => {", home)
+        self.assertIn("}, [navigate]);", home)
+        self.assertIn("onClick={handleClickEl3}", home)
+
+    def test_memoization_can_be_disabled(self):
+        self.build(memoize=False)
+        shop = self.read('src', 'pages', 'Shop.jsx')
+        self.assertNotIn("staticBlock", shop)
+        self.assertNotIn("useMemo", shop)
+        self.assertIn(">{sum(cart)}<", shop)
+
+    def test_hoisted_blocks_never_reference_component_refs(self):
+        program = LogicParser().parse_file('store.aura')
+        shop = next(stmt for stmt in program.statements if isinstance(stmt, PageNode) and stmt.name == 'shop')
+        full = HTMLGenerator(component_name='Shop', eliminate_dead_code=False).generate(shop)
+        hoisted, component = full.split("export default function Shop()")
+        self.assertIn("const staticBlock1 = (", hoisted)
+        self.assertNotIn("ref={", hoisted)
+        self.assertIn("const el_5_ref = useRef(null);", component)
+
+
+class TestClassManifest(TranspilerOutputTestCase):
+    def test_manifest_lists_used_classes_once(self):
+        self.build()
+        classes = json.loads(self.read('aura-classes.json'))
+        self.assertEqual(classes, sorted(set(classes)))
+        self.assertIn("lg:grid-cols-4", classes)
+        self.assertIn("dark:hover:bg-gray-800", classes)
+        self.assertIn("./aura-classes.json", self.read('tailwind.config.js'))
+        self.assertNotIn("./src/**", self.read('tailwind.config.js'))
+
+    def test_scan_mode_keeps_source_globs(self):
+        self.build(css_mode='scan')
+        self.assertIn("./src/**/*.{js,ts,jsx,tsx}", self.read('tailwind.config.js'))
+
+    def test_precompute_mode_skips_tailwind(self):
+        self.build(css_mode='precompute')
+        css = self.read('src', 'index.css')
+        self.assertNotIn("@tailwind", css)
+        self.assertIn("@media (min-width: 1024px) {\n  .lg\\:grid-cols-4 { grid-template-columns: repeat(4, minmax(0, 1fr)) }", css)
+        self.assertNotIn("tailwindcss", self.read('postcss.config.js'))
+
+    def test_extract_classes_from_template_literals(self):
+        code = "<a className={`px-3 ${active ? 'text-blue-500' : 'text-gray-700'}`}>x</a> ref.current.classList.add('italic');"
+        self.assertEqual(extract_classes(code), {'px-3', 'text-blue-500', 'text-gray-700', 'italic'})
+
+    def test_stylesheet_variants_and_unknown_classes(self):
+        css, unsupported = build_stylesheet(['hover:bg-white/80', 'dark:text-white', '-mr-2', 'text-huge'], preflight=False)
+        self.assertIn(".hover\\:bg-white\\/80:hover { background-color: rgb(255 255 255 / 0.8) }", css)
+        self.assertIn("@media (prefers-color-scheme: dark) {\n  .dark\\:text-white { color: #ffffff }", css)
+        self.assertIn(".-mr-2 { margin-right: -0.5rem }", css)
+        self.assertEqual(unsupported, ['text-huge'])
+
+
+@unittest.skipIf(Image is None, "Pillow not installed")
+class TestImagePipeline(TranspilerOutputTestCase):
+    GALLERY_APP = """app "Gallery"
+
+page home
+    main
+        image "photos/hero.png"
+        image "photos/hero.png"
+        image "https://example.com/remote.png"
+        list photos
+            image item.url
+"""
+
+    def setUp(self):
+        super().setUp()
+        os.makedirs('photos')
+        Image.new('RGB', (1000, 500), (10, 20, 30)).save(os.path.join('photos', 'hero.png'))
+        with open('store.aura', 'w', encoding='utf-8') as f:
+            f.write(self.GALLERY_APP)
+
+    def test_local_images_get_variants_and_dimensions(self):
+        self.build()
+        home = self.read('src', 'pages', 'Home.jsx')
+        self.assertIn("<picture>", home)
+        self.assertIn('<source type="image/webp" srcSet="/aura-images/hero-', home)
+        self.assertIn('-640.webp 640w', home)
+        self.assertIn('width="1000" height="500"', home)
+        self.assertIn('src="https://example.com/remote.png"', home)
+        self.assertIn("src={item.url}", home)
+
+    def test_only_the_first_image_loads_eagerly(self):
+        self.build()
+        images = [line for line in self.read('src', 'pages', 'Home.jsx').split('\n') if '<img' in line]
+        self.assertNotIn('loading="lazy"', images[0])
+        self.assertTrue(all('loading="lazy"' in line for line in images[1:]))
+
+    def test_unchanged_images_are_not_reencoded(self):
+        self.build()
+        pipeline = ImagePipeline(AuraTranspiler.ENGINE_DIR)
+        self.assertIsNotNone(pipeline.process('photos/hero.png', os.getcwd()))
+        self.assertEqual(pipeline.processed, 0)
+
+
+class TestPrerender(TranspilerOutputTestCase):
+    def test_routes_get_static_html_to_hydrate(self):
+        with open('store.aura', 'w', encoding='utf-8') as f:
+            f.write(STORE_APP.replace('        text "Welcome"\n', '        text "Welcome"\n'
+                                      '        image "https://example.com/hero.png"\n'
+                                      '        image "https://example.com/more.png"\n'))
+        self.build(prerender=True)
+        home = self.read('index.html')
+        self.assertIn('<div id=\'root\'><!--$--><div class="min-h-screen', home)
+        self.assertIn('>Welcome</h2>', home)
+        # The same loading hints as the JSX, so hydration has nothing to patch
+        self.assertIn('alt="Shop Item" decoding="async"/>', home)
+        self.assertIn('alt="Shop Item" decoding="async" loading="lazy"/>', home)
+        self.assertIn('alt="Shop Item" decoding="async" loading="lazy" />', self.read('src', 'pages', 'Home.jsx'))
+        self.assertIn('>AURA CORE</div>', home)  # layout markup around the page
+        shop = self.read('shop', 'index.html')
+        self.assertIn('>Inventory</h2>', shop)
+        self.assertIn('>0</h2>', shop)  # cart.length with the initial []
+        self.assertIn("ReactDOM.hydrateRoot(root, app)", self.read('src', 'main.jsx'))
+        self.assertIn("\"shop\": 'shop/index.html'", self.read('vite.config.js'))
+
+    def test_global_navbar_is_rendered_like_app(self):
+        with open('nav.aura', 'w', encoding='utf-8') as f:
+            f.write("Create a global navbar with logo 'Shop' and links [Home, About]\n"
+                    "Create a heading with the text 'Hi'\n")
+        self.assertTrue(AuraTranspiler(prerender=True).build('nav.aura'))
+        home = self.read('index.html')
+        # Navbar before the Suspense boundary, with Home active at /
+        self.assertIn("<div id='root'><nav class=", home)
+        self.assertIn('</nav><!--$-->', home)
+        self.assertIn('text-blue-500 bg-gray-100 dark:bg-gray-800" href="/">Home</a>', home)
+        self.assertIn('hover:text-blue-500" href="/about">About</a>', home)
+        self.assertIn("() => store[key], () => store[key])", self.read('src', 'context', 'GlobalContext.jsx'))
+
+    def test_home_with_params_keeps_the_spa_index(self):
+        with open('item.aura', 'w', encoding='utf-8') as f:
+            f.write('app "Items"\n\npage home(id)\n    text "Item"\n\npage about\n    text "About us"\n')
+        self.assertTrue(AuraTranspiler(prerender=True).build('item.aura'))
+        self.assertIn("<div id='root'></div>", self.read('index.html'))
+        self.assertIn('>About us</', self.read('about', 'index.html'))
+        self.assertIn("\"main\": 'index.html'", self.read('vite.config.js'))
+
+    def test_client_render_without_prerender(self):
+        self.build()
+        self.assertIn("<div id='root'></div>", self.read('index.html'))
+        self.assertNotIn("hydrateRoot", self.read('src', 'main.jsx'))
+
+    def test_bindings_and_repeaters_use_initial_state(self):
+        scope = {'cart': [{'name': 'Mug', 'price': '4.5'}, {'name': 'Pen', 'price': 2}]}
+        self.assertEqual(evaluate('"$" + sum(cart)', scope), '$6.5')
+        tree = {'wrappers': [], 'states': {'cart': json.dumps(scope['cart'])}, 'elements': [{
+            'id': 'el_1', 'type': 'ul', 'props': {'className': 'list', 'ref': 'el_1_ref'}, 'text_content': None,
+            'repeater': {'data': 'cart', 'item_name': 'item'},
+            'children': [{'id': 'el_2', 'type': 'li', 'props': {}, 'children': [],
+                          'text_content': 'Item: {item.name}'}]}]}
+        html = render_page({'page': tree, 'virtualize_threshold': None})
+        self.assertEqual(html, '<ul class="list"><li>Item: <!-- -->Mug</li><li>Item: <!-- -->Pen</li></ul>')
+
+
+class TestBuildAnalysis(TranspilerOutputTestCase):
+    def test_report_measures_each_component(self):
+        self.build(analyze=True)
+        report = json.loads(self.read('aura-build-report.json'))
+        shop = report['components']['Shop']
+        self.assertEqual(shop['kind'], 'page')
+        self.assertEqual(report['components']['ShoplayoutLayout']['kind'], 'layout')
+        self.assertEqual(shop['jsx_bytes'], len(self.read('src', 'pages', 'Shop.jsx').encode('utf-8'))
+                         - len("//# sourceMappingURL=Shop.jsx.map\n"))
+        self.assertGreater(shop['elements'], 0)
+        self.assertGreater(shop['hooks'], 0)
+        self.assertIn('react', shop['imports'])
+        self.assertEqual(report['totals']['jsx_bytes'],
+                         sum(stats['jsx_bytes'] for stats in report['components'].values()))
+
+    def test_diff_against_previous_build(self):
+        self.build(analyze=True)
+        path = os.path.join(AuraTranspiler.ENGINE_DIR, 'aura-build-report.json')
+        previous = json.loads(self.read('aura-build-report.json'))
+        previous['components']['Shop']['jsx_bytes'] //= 2
+        previous['components']['Gone'] = dict(previous['components']['Home'])
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(previous, f)
+
+        transpiler = AuraTranspiler(analyze=True)
+        self.assertTrue(transpiler.build('store.aura'))
+        current = build_report(transpiler.analysis)
+        diff = diff_reports(previous, current)
+        self.assertEqual(diff['removed'], ['Gone'])
+        self.assertIn('jsx_bytes', diff['changed']['Shop'])
+        self.assertTrue(diff['regressions'][0].startswith('Shop: JSX'))
+        self.assertIn('⚠️ Regression: Shop', format_summary(current, diff))
+
+
+class TestInMemoryModules(TranspilerOutputTestCase):
+    def test_generated_modules_stay_in_memory(self):
+        transpiler = AuraTranspiler(module_server_url='http://127.0.0.1:5199')
+        self.assertTrue(transpiler.build('store.aura'))
+        self.assertIn('pages/Shop.jsx', transpiler.modules)
+        self.assertIn('App.jsx', transpiler.modules)
+        self.assertFalse(os.path.exists(os.path.join(AuraTranspiler.ENGINE_DIR, 'src', 'pages', 'Shop.jsx')))
+        self.assertIn("import App from 'virtual:aura/App.jsx'", self.read('src', 'main.jsx'))
+        self.assertIn('auraModules("http://127.0.0.1:5199")', self.read('vite.config.js'))
+        self.assertIn("const PREFIX = 'virtual:aura/'", self.read('aura-modules-plugin.js'))
+
+    def test_server_serves_modules_and_pushes_changes(self):
+        server = ModuleServer().start()
+        try:
+            self.assertEqual(server.publish({'App.jsx': 'v1', 'routes.js': 'r'}), ['App.jsx', 'routes.js'])
+            with urllib.request.urlopen(server.url + '/modules/App.jsx') as res:
+                self.assertEqual(res.read().decode(), 'v1')
+            with urllib.request.urlopen(server.url + '/modules') as res:
+                self.assertEqual(json.load(res)['modules'], ['App.jsx', 'routes.js'])
+
+            with urllib.request.urlopen(server.url + '/events') as events:
+                self.assertEqual(server.publish({'App.jsx': 'v2', 'routes.js': 'r'}), ['App.jsx'])
+                line = events.readline().decode()
+            event = json.loads(line[len('data: '):])
+            self.assertEqual(event['changed'], ['App.jsx'])
+            self.assertEqual(event['version'], 2)
+            self.assertEqual(server.publish({'App.jsx': 'v2', 'routes.js': 'r'}), [])
+        finally:
+            server.stop()
+
+    def test_failed_rebuild_keeps_the_last_good_modules(self):
+        dev = AuraDevServer(Path('.'), 'store.aura', in_memory=True)
+        try:
+            dev._build_all_pages()
+            served = dict(dev.module_server.modules)
+            self.assertIn('App.jsx', served)
+            with mock.patch.object(dev.transpiler.logic_parser, 'parse_file', side_effect=SyntaxError("bad line")):
+                dev._rebuild_project()
+            self.assertEqual(dev.module_server.modules, served)
+            self.assertEqual(dev.module_server.version, 1)
+        finally:
+            dev.corrections.stop()
+            dev.module_server.stop()
+
+    def test_initial_build_holds_the_build_lock(self):
+        dev = AuraDevServer(Path('.'), 'store.aura', in_memory=True)
+        locked = []
+        build = dev.transpiler.build
+
+        def watched(target):
+            locked.append(dev._build_lock.locked())
+            return build(target)
+        try:
+            with mock.patch.object(dev.transpiler, 'build', watched):
+                dev._build_all_pages()
+            self.assertEqual(locked, [True])
+            self.assertFalse(dev._build_lock.locked())
+        finally:
+            dev.corrections.stop()
+            dev.module_server.stop()
+
+
+class TestSourceMaps(TranspilerOutputTestCase):
+    def test_vlq_encoding(self):
+        self.assertEqual([encode_vlq(v) for v in (0, 1, -1, 15, 16)],
+                         ['A', 'C', 'D', 'e', 'gB'])
+
+    def mapped_lines(self):
+        """Shop.jsx lines and {generated line: .aura line} decoded from Shop.jsx.map"""
+        shop = self.read('src', 'pages', 'Shop.jsx')
+        self.assertTrue(shop.rstrip().endswith("//# sourceMappingURL=Shop.jsx.map"))
+        source_map = json.loads(self.read('src', 'pages', 'Shop.jsx.map'))
+        self.assertEqual(source_map['sources'], ['../../../store.aura'])
+
+        # Decode the VLQ segments back to (generated line -> .aura line)
+        digits = {c: i for i, c in enumerate(
+            'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/')}
+        source_line = 0
+        mapped = {}
+        for jsx_line, segments in enumerate(source_map['mappings'].split(';')):
+            for segment in filter(None, segments.split(',')):
+                values, value, shift = [], 0, 0
+                for char in segment:
+                    digit = digits[char]
+                    value += (digit & 31) << shift
+                    shift += 5
+                    if not digit & 32:
+                        values.append(-(value >> 1) if value & 1 else value >> 1)
+                        value, shift = 0, 0
+                source_line += values[2]
+                mapped.setdefault(jsx_line, source_line + 1)
+        return shop.split('\n'), mapped
+
+    def assert_inventory_mapped(self):
+        jsx_lines, mapped = self.mapped_lines()
+        inventory_line = next(i for i, line in enumerate(jsx_lines) if '>Inventory<' in line)
+        self.assertEqual(mapped[inventory_line], STORE_APP.split('\n').index('        text "Inventory"') + 1)
+
+    def test_component_maps_back_to_aura_lines(self):
+        self.build()
+        self.assert_inventory_mapped()
+
+    def test_maps_describe_the_pruned_file_with_dce_report(self):
+        self.build()
+        plain = self.mapped_lines()
+        self.build(report_dce=True, source_maps=True)
+        self.assertEqual(self.mapped_lines(), plain)
+        self.assert_inventory_mapped()
+
+    def test_source_maps_can_be_disabled(self):
+        self.build(source_maps=False)
+        self.assertNotIn("sourceMappingURL", self.read('src', 'pages', 'Shop.jsx'))
+
+
+if __name__ == '__main__':
+    unittest.main()
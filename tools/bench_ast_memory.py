@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Aura AST Memory Benchmark - Heap held by a parsed program
+Generates a large multi-page .aura program, parses it with LogicParser and
+reports the bytes its AST keeps alive (tracemalloc), per node and per line.
+
+Usage: python tools/bench_ast_memory.py [lines]
+"""
+
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from transpiler.logic_parser import LogicParser  # noqa: E402
+
+PAGE = """page page_{n} uses shop_layout
+    main
+        text "Section {n} heading"
+        set count_{n} to 0
+        set total to count_{n} + 1
+        if total > {n}
+            notify "Over {n}"
+        else
+            print total
+        row
+            button "Next" goes to page_{next}
+            button "Back" goes to home
+            icon "check-circle" size small color green
+        list items from cart
+            text item
+        add item to cart
+        input search
+"""
+
+
+def generate(lines: int) -> str:
+    header = 'app "Memory Bench"\n\nlayout shop_layout\n    sidebar\n        button "Home" goes to home\n    slot\n\n'
+    per_page = PAGE.count('\n') + 1
+    pages = max(lines // per_page, 1)
+    body = "\n".join(PAGE.format(n=n, next=(n + 1) % pages) for n in range(pages))
+    return header + "\n".join("    " + line if line else line for line in body.split("\n"))
+
+
+def count_nodes(program) -> int:
+    seen, stack = 0, list(program.statements)
+    while stack:
+        node = stack.pop()
+        seen += 1
+        for attr in ('body', 'else_body', 'children', 'pages', 'statements', 'on_click', 'sections'):
+            stack.extend(getattr(node, attr, None) or [])
+        condition = getattr(node, 'condition', None)
+        if condition is not None and not isinstance(condition, str):
+            stack.append(condition)
+    return seen
+
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    source = generate(lines)
+    fd, path = tempfile.mkstemp(suffix='.aura')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(source)
+
+    try:
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        program = LogicParser().parse_file(path)
+        elapsed = time.perf_counter() - start
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        os.remove(path)
+
+    total_lines = source.count('\n') + 1
+    nodes = count_nodes(program)
+    print("=" * 60)
+    print(f"AURA AST MEMORY: {total_lines:,} lines, {nodes:,} nodes")
+    print("=" * 60)
+    print(f"  Retained heap : {retained / 2**20:8.2f} MiB ({retained / nodes:6.1f} B/node, {retained / total_lines:6.1f} B/line)")
+    print(f"  Parse peak    : {peak / 2**20:8.2f} MiB")
+    print(f"  Parse time    : {elapsed:8.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Aura Brain Daemon Load Test - Concurrent clients against one daemon
+Runs the daemon in-process on a throwaway .aura_brain with a stub model, which
+answers like Qwen after a fixed delay per completion. Several clients (the CLI,
+the dev server, VS Code) then pipeline requests at it together. The test checks
+that every response reaches the request it answers, and reports throughput,
+latency, and how many model completions the queue coalesced the requests into.
+
+Usage: python tools/bench_brain_daemon.py [clients] [requests per client] [ms per completion]
+"""
+
+import asyncio
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from transpiler.brain_client import AuraBrainClient  # noqa: E402
+from transpiler.brain_daemon import AuraBrainDaemon  # noqa: E402
+
+
+class StubModel:
+    """Stands in for llama_cpp.Llama: sleeps, then answers every numbered line"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.completions = 0
+
+    def __call__(self, prompt, **kwargs):
+        self.completions += 1
+        time.sleep(self.delay)
+        user = prompt.split("<|im_start|>user\n", 1)[1].split("<|im_end|>", 1)[0]
+        rows = user.splitlines()
+        if len(rows) == 1 and not rows[0].split(".", 1)[0].isdigit():
+            text = "Scroll to the top"
+        else:
+            text = "\n".join(f"{row.split('.', 1)[0]}. Scroll to the top" for row in rows)
+        if kwargs.get('stream'):
+            return iter([{'choices': [{'text': text}]}])
+        return {'choices': [{'text': text}]}
+
+
+def serve(brain_dir: str, model) -> AuraBrainDaemon:
+    """Starts a daemon on a background event loop and waits until it accepts connections"""
+    daemon = AuraBrainDaemon(model=model, brain_dir=brain_dir)
+    daemon.start()
+    threading.Thread(target=lambda: asyncio.run(daemon.serve()), daemon=True).start()
+    probe = AuraBrainClient(brain_dir)
+    deadline = time.time() + 5
+    while not probe.connect():
+        if time.time() > deadline:
+            raise RuntimeError("daemon did not start")
+        time.sleep(0.01)
+    probe.close()
+    return daemon
+
+
+def client_run(brain_dir: str, name: int, count: int, latencies: list, mismatches: list):
+    client = AuraBrainClient(brain_dir)
+    client.connect()
+    sent = []
+    for i in range(count):
+        line = f"zzq client {name} request {i}"
+        sent.append((line, time.perf_counter(), client.submit("correct", {"line": line})))
+    for line, started, future in sent:
+        result = future.result(60)["result"]
+        latencies.append(time.perf_counter() - started)
+        if result["original"] != line:
+            mismatches.append((line, result["original"]))
+    client.close()
+
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    per_client = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    delay = (float(sys.argv[3]) if len(sys.argv) > 3 else 20.0) / 1000
+
+    with tempfile.TemporaryDirectory() as brain_dir:
+        model = StubModel(delay)
+        daemon = serve(brain_dir, model)
+        latencies, mismatches = [], []
+        threads = [threading.Thread(target=client_run, args=(brain_dir, n, per_client, latencies, mismatches))
+                   for n in range(clients)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        stopper = AuraBrainClient(brain_dir)
+        stopper.connect()
+        stopper.stop_daemon()
+        daemon.cache.close()
+
+    total = clients * per_client
+    latencies.sort()
+    print("=" * 60)
+    print(f"AURA BRAIN DAEMON LOAD: {clients} clients x {per_client} pipelined requests, "
+          f"{delay * 1000:.0f} ms per completion")
+    print("=" * 60)
+    print(f"  Answered        : {len(latencies)}/{total} ({len(mismatches)} mismatched ids)")
+    print(f"  Completions     : {model.completions} (one per request would be {total})")
+    print(f"  Throughput      : {total / elapsed:8.1f} requests/s")
+    print(f"  Latency p50/p99 : {latencies[len(latencies) // 2] * 1000:8.1f} / "
+          f"{latencies[int(len(latencies) * 0.99)] * 1000:.1f} ms")
+    return 1 if mismatches or len(latencies) != total else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
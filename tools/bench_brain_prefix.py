@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Aura Brain Prefix Benchmark - Per-request latency with and without prompt prefix reuse
+Every prompt starts with the same system prompt. The daemon evaluates it once,
+saves the model state and restores it per request, so only the user line is
+evaluated. This sends the same broken lines through the model both ways. It
+resets the model before each plain request, so llama.cpp's own prompt matching
+cannot reuse the prefix either.
+
+Usage: python tools/bench_brain_prefix.py [requests]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from transpiler.brain_prompts import PromptPrefix, complete  # noqa: E402
+from transpiler.setup import MODEL_PATH, ensure_aura_brain  # noqa: E402
+
+# Lines the syntax fixer leaves to the model
+LINES = [
+    "create card is title 'God' and description 'God is here'",
+    "put a big heading saying 'Welcome'",
+    "button that says 'Go' please",
+    "show me an input for the name",
+    "dark mode theme on",
+    "card with heading 'News' and text 'Today'",
+]
+
+
+def timed(model, lines, prefix):
+    costs = []
+    for line in lines:
+        if prefix is None:
+            model.reset()
+        start = time.perf_counter()
+        complete(model, [line], max_tokens=64, prefix=prefix, temperature=0.05, top_p=0.9)
+        costs.append(time.perf_counter() - start)
+    return sorted(costs)
+
+
+def report(name, costs):
+    print(f"  {name:<15}: mean {sum(costs) / len(costs) * 1000:8.1f} ms   "
+          f"p50 {costs[len(costs) // 2] * 1000:8.1f} ms   max {costs[-1] * 1000:8.1f} ms")
+
+
+def main():
+    try:
+        from llama_cpp import Llama
+    except ImportError:
+        print("[ERROR] llama-cpp-python not installed. Run: pip install llama-cpp-python")
+        return 1
+    if not ensure_aura_brain():
+        return 1
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 24
+    lines = [LINES[i % len(LINES)] for i in range(count)]
+    model = Llama(model_path=MODEL_PATH, n_ctx=1024, n_batch=128, n_threads=6, verbose=False)
+
+    start = time.perf_counter()
+    prefix = PromptPrefix(model)
+    prime_ms = (time.perf_counter() - start) * 1000
+    if not prefix.enabled:
+        print("[ERROR] This llama-cpp-python build cannot save model state")
+        return 1
+
+    complete(model, LINES[:1], max_tokens=8)  # warm up
+    plain = timed(model, lines, None)
+    reused = timed(model, lines, prefix)
+
+    print("=" * 60)
+    print(f"AURA BRAIN PREFIX REUSE: {count} requests, {prefix.tokens} prefix tokens")
+    print("=" * 60)
+    print(f"  Prefix prime   : {prime_ms:8.1f} ms (once, at daemon start)")
+    report("Full prompt", plain)
+    report("Reused prefix", reused)
+    print(f"  Speedup        : {sum(plain) / sum(reused):8.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Aura Brain Streaming Benchmark - Tokens per correction with early stop
+Corrects the same broken lines reading the whole completion, then streaming it
+and stopping at the first whole command. Reports tokens generated per
+correction, the time until a whole command has streamed (when the VS Code
+extension can show it) and the total latency.
+
+Without llama-cpp-python a stub model stands in: it writes each fix and then
+runs on explaining it, as small models do, at a fixed cost per token. With the
+model installed, Qwen answers instead, free-form and grammar-constrained.
+
+Usage: python tools/bench_brain_stream.py [ms per stub token]
+"""
+
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from transpiler.brain_prompts import complete, validated  # noqa: E402
+from transpiler.setup import MODEL_PATH, ensure_aura_brain  # noqa: E402
+
+# Lines the syntax fixer leaves to the model, and the stub's answer to each
+LINES = {
+    "create card is title 'God' and description 'God is here'":
+        "Create a card with the title 'God' and description 'God is here' (added 'a' and 'with the')",
+    "put a big heading saying 'Welcome'":
+        "Create a heading with the text 'Welcome' - headings are created with 'Create a heading'",
+    "button that says 'Go' please":
+        "Create a button with the text 'Go' which creates a button labelled Go",
+    "dark mode theme on": "Use the dark theme, as requested",
+    "scroll all the way up": "Scroll to the top of the page when this runs",
+    "hide that button now": "Hide the button right away",
+}
+
+
+class StubModel:
+    """Stands in for llama_cpp.Llama: generates its answer a word per token, streamed or whole"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def __call__(self, prompt, stream=False, **kwargs):
+        line = prompt.split("<|im_start|>user\n", 1)[1].split("<|im_end|>", 1)[0]
+        pieces = re.findall(r"\s*\S+", LINES[line])
+        if not stream:
+            time.sleep(self.delay * len(pieces))
+            return {'choices': [{'text': "".join(pieces)}], 'usage': {'completion_tokens': len(pieces)}}
+
+        def chunks():
+            for piece in pieces:
+                time.sleep(self.delay)
+                yield {'choices': [{'text': piece}]}
+        return chunks()
+
+
+def run(model, stream: bool, **options):
+    tokens, shown, costs, valid = 0, [], [], 0
+    for line in LINES:
+        usage, first = {}, []
+
+        def on_partial(index, text, whole):
+            if whole and not first:
+                first.append(time.perf_counter())
+
+        start = time.perf_counter()
+        answer = complete(model, [line], max_tokens=64, stream=stream, usage=usage,
+                          on_partial=on_partial, temperature=0.05, top_p=0.9, **options)[0]
+        end = time.perf_counter()
+        costs.append(end - start)
+        shown.append((first[0] if first else end) - start)
+        tokens += usage.get('completion_tokens', 0)
+        valid += validated(answer) is not None
+    return tokens / len(LINES), sum(shown) / len(shown), sum(costs) / len(costs), valid
+
+
+def report(name, result):
+    tokens, shown, cost, valid = result
+    print(f"  {name:<22}: {tokens:6.1f} tokens   shown {shown * 1000:7.1f} ms   "
+          f"done {cost * 1000:7.1f} ms   valid {valid}/{len(LINES)}")
+
+
+def main():
+    delay = (float(sys.argv[1]) if len(sys.argv) > 1 else 10.0) / 1000
+    try:
+        from llama_cpp import Llama
+    except ImportError:
+        Llama = None
+
+    print("=" * 60)
+    if Llama is None:
+        print(f"AURA BRAIN STREAMING: stub model, {delay * 1000:.0f} ms per token "
+              f"(llama-cpp-python not installed)")
+        print("=" * 60)
+        model = StubModel(delay)
+        report("Whole completion", run(model, False))
+        report("Streamed, early stop", run(model, True))
+        return 0
+
+    if not ensure_aura_brain():
+        return 1
+    print(f"AURA BRAIN STREAMING: {Path(MODEL_PATH).name}")
+    print("=" * 60)
+    model = Llama(model_path=MODEL_PATH, n_ctx=1024, n_threads=6, verbose=False)
+    complete(model, list(LINES)[:1], max_tokens=8)  # warm up
+    report("Whole completion", run(model, False))
+    report("Streamed, early stop", run(model, True))
+    report("Constrained, whole", run(model, False, constrain=True))
+    report("Constrained, streamed", run(model, True, constrain=True))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Aura Parser Benchmark - Per-line cost of AuraParser on a sample file
+Compares keyword-indexed dispatch against trying every pattern in order,
+and times parser construction and action-sequence parsing.
+
+Usage: python tools/bench_parser.py [file.aura] [rounds]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from transpiler.aura_parser import AuraCommand, AuraParser, parse_action_sequence  # noqa: E402
+
+
+def _full_scan(parser, line):
+    """The pre-index dispatch: every pattern in priority order"""
+    for cmd_type, pattern in parser.patterns.items():
+        match = pattern.match(line)
+        if match:
+            return AuraCommand(command_type=cmd_type, data=match.groupdict(), line_number=0, raw_line=line)
+    return None
+
+
+def _per_call(fn, items, rounds, repeat=5):
+    """Best-of-repeat seconds per call"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for item in items:
+                fn(item)
+        elapsed = (time.perf_counter() - start) / (rounds * max(len(items), 1))
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _median_line(fn, lines, rounds):
+    """Per-line cost of the median line (long data-URI lines skew the mean)"""
+    costs = sorted(_per_call(fn, [line], max(rounds // 10, 1), repeat=3) for line in lines)
+    return costs[len(costs) // 2]
+
+
+def main():
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(__file__).resolve().parent.parent / 'examples' / 'demo_full.aura'
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    lines = [line.strip() for line in path.read_text(encoding='utf-8').splitlines()]
+    lines = [line for line in lines if line and not line.startswith('#')]
+
+    parser = AuraParser()
+    matched = sum(1 for line in lines if parser._parse_line(line, 0))
+    actions = [cmd.data['actions'] for cmd in filter(None, (parser._parse_line(line, 0) for line in lines))
+               if cmd.command_type == 'action_sequence']
+
+    print("=" * 60)
+    print(f"AURA PARSER BENCHMARK: {path.name}")
+    print(f"  {len(lines)} command lines ({matched} recognized), {rounds} rounds")
+    print("=" * 60)
+
+    indexed = lambda line: parser._parse_line(line, 0)
+    scanned = lambda line: _full_scan(parser, line)
+    for label, fn in (("Keyword-indexed _parse_line", indexed), ("Full pattern scan", scanned)):
+        print(f"  {label:<28}: {_per_call(fn, lines, rounds) * 1e6:8.2f} µs/line mean, "
+              f"{_median_line(fn, lines, rounds) * 1e6:6.2f} µs median")
+    if actions:
+        print(f"  parse_action_sequence       : {_per_call(parse_action_sequence, actions, rounds) * 1e6:8.2f} µs/sequence")
+    print(f"  AuraParser()                : {_per_call(lambda _: AuraParser(), [None], rounds) * 1e6:8.2f} µs (shared grammar)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Aura Syntax Fixer Benchmark - Fast-path coverage and latency
+Breaks every valid command line of the examples the way people do (a typo
+in one word, a dropped article, or both), then reports how many the
+deterministic fixer repairs, how many it restores exactly, and its per-line cost.
+Lines it cannot repair are the ones that still need the LLM.
+
+Usage: python tools/bench_syntax_fixer.py [seed]
+"""
+
+import glob
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from transpiler.syntax_fixer import SyntaxFixer, fixer  # noqa: E402
+
+EXAMPLES = Path(__file__).resolve().parent.parent / 'examples'
+# Broken lines reported against the brain
+REPORTED = [
+    "crete a button with text 'Click'",
+    "create is card with title 'Hello'",
+    "create card is title 'God' and description 'God is here'",
+    "Use dark theme",
+    "make button red",
+    "when clicked show card",
+    "crteate a butn with the text 'Go'",
+]
+_BARE = re.compile(r"(?<!['\"\w])[A-Za-z]{4,}(?!['\"\w])")
+_ARTICLE = re.compile(r"\b(?:the|a|an)\s+", re.IGNORECASE)
+
+
+def typo(line: str, rng: random.Random) -> str:
+    words = [m for m in _BARE.finditer(line.split("'")[0])]
+    if not words:
+        return line
+    m = rng.choice(words)
+    word, i = m.group(), rng.randrange(1, len(m.group()) - 1)
+    kind = rng.choice(('delete', 'insert', 'replace', 'swap'))
+    if kind == 'delete':
+        broken = word[:i] + word[i + 1:]
+    elif kind == 'insert':
+        broken = word[:i] + rng.choice('aeiourst') + word[i:]
+    elif kind == 'replace':
+        broken = word[:i] + rng.choice('aeiourst') + word[i + 1:]
+    else:
+        broken = word[:i - 1] + word[i] + word[i - 1] + word[i + 1:]
+    return line[:m.start()] + broken + line[m.end():]
+
+
+def drop_article(line: str, rng: random.Random) -> str:
+    articles = list(_ARTICLE.finditer(line.split("'")[0]))
+    if not articles:
+        return line
+    m = rng.choice(articles)
+    return line[:m.start()] + line[m.end():]
+
+
+def corpus(rng: random.Random):
+    fix = fixer()
+    valid = set()
+    for path in glob.glob(str(EXAMPLES / '*.aura')):
+        for line in Path(path).read_text(encoding='utf-8').splitlines():
+            line = line.strip()
+            # Data-URI images are kilobytes long and not what people mistype
+            if line and not line.startswith('#') and len(line) < 200 and fix.accepts(line):
+                valid.add(line)
+    cases = []
+    for line in sorted(valid):
+        for corrupt in (lambda l: typo(l, rng), lambda l: drop_article(l, rng),
+                        lambda l: drop_article(typo(l, rng), rng)):
+            broken = corrupt(line)
+            if broken != line and not fix.accepts(broken):
+                cases.append((broken, line))
+    return cases + [(line, None) for line in REPORTED]
+
+
+def main():
+    rng = random.Random(int(sys.argv[1]) if len(sys.argv) > 1 else 7)
+    start = time.perf_counter()
+    fix = SyntaxFixer()
+    build_ms = (time.perf_counter() - start) * 1000
+    cases = corpus(rng)
+
+    costs, repaired, exact, misses = [], 0, 0, []
+    for broken, original in cases:
+        start = time.perf_counter()
+        fixed = fix.fix(broken)
+        costs.append(time.perf_counter() - start)
+        if fixed:
+            repaired += 1
+            exact += original is not None and fixed.lower() == original.lower()
+        else:
+            misses.append(broken)
+    with_original = sum(1 for _, original in cases if original is not None)
+    costs.sort()
+
+    print("=" * 60)
+    print(f"AURA SYNTAX FIXER: {len(cases)} broken lines ({len(fix.vocabulary)} grammar words)")
+    print("=" * 60)
+    print(f"  Index build     : {build_ms:8.2f} ms")
+    print(f"  Repaired        : {repaired / len(cases):8.1%} ({repaired}/{len(cases)}); the rest go to the LLM")
+    print(f"  Exact restores  : {exact / max(with_original, 1):8.1%} of corrupted example lines")
+    print(f"  Latency mean    : {sum(costs) / len(costs) * 1000:8.3f} ms")
+    print(f"  Latency p50/p99 : {costs[len(costs) // 2] * 1000:8.3f} / {costs[int(len(costs) * 0.99)] * 1000:.3f} ms")
+    for line in misses[:5]:
+        print(f"  ✗ {line}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Aura Build Analyzer - Size and composition report for generated components
+Measures every page/layout the transpiler writes and diffs the numbers
+against the previous build's report so regressions surface immediately.
+"""
+
+import json
+import os
+import re
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+REPORT_FILE = "aura-build-report.json"
+METRICS = ('jsx_bytes', 'elements', 'hooks', 'handlers', 'repeated_class_bytes')
+# Growth of a component's JSX beyond this fraction is flagged as a regression
+REGRESSION_THRESHOLD = 0.05
+
+
+def _count_elements(elements) -> int:
+    count = 0
+    stack = list(elements)
+    while stack:
+        el = stack.pop()
+        if isinstance(el, dict) and 'id' in el:
+            count += 1
+            stack.extend(el.get('children', []))
+    return count
+
+
+def analyze_component(code: str, generator) -> Dict:
+    """Composition metrics for one generated component"""
+    classes = Counter(re.findall(r'className="([^"]+)"', code))
+    return {
+        'kind': 'layout' if generator.component_name.lower().endswith('layout') else 'page',
+        'jsx_bytes': len(code.encode('utf-8')),
+        'elements': _count_elements(generator.elements),
+        'hooks': len(re.findall(r"\buse[A-Z]\w*\(", code)),
+        'handlers': sum(len(events) for events in generator.handlers.values()),
+        # Bytes spent re-emitting class strings that already appeared in this file
+        'repeated_class_bytes': sum((n - 1) * len(cls.encode('utf-8')) for cls, n in classes.items() if n > 1),
+        'imports': sorted(set(re.findall(r"^import .*?from ['\"]([^'\"]+)['\"]", code, re.MULTILINE))),
+    }
+
+
+def build_report(components: Dict[str, Dict]) -> Dict:
+    totals = {metric: sum(stats[metric] for stats in components.values()) for metric in METRICS}
+    return {'version': 1, 'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'components': components, 'totals': totals}
+
+
+def load_report(path: str) -> Optional[Dict]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_report(path: str, report: Dict):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+
+def diff_reports(previous: Optional[Dict], current: Dict) -> Dict:
+    """{'changed': {comp: {metric: delta}}, 'added': [...], 'removed': [...], 'regressions': [...]}"""
+    diff = {'changed': {}, 'added': [], 'removed': [], 'regressions': []}
+    if not previous:
+        return diff
+    before = previous.get('components', {})
+    after = current['components']
+    diff['added'] = sorted(set(after) - set(before))
+    diff['removed'] = sorted(set(before) - set(after))
+    for comp in sorted(set(after) & set(before)):
+        deltas = {metric: after[comp][metric] - before[comp].get(metric, 0) for metric in METRICS}
+        deltas = {metric: delta for metric, delta in deltas.items() if delta}
+        if deltas:
+            diff['changed'][comp] = deltas
+        old_bytes = before[comp].get('jsx_bytes', 0)
+        growth = deltas.get('jsx_bytes', 0)
+        if old_bytes and growth / old_bytes > REGRESSION_THRESHOLD:
+            diff['regressions'].append(
+                f"{comp}: JSX {old_bytes:,} B -> {after[comp]['jsx_bytes']:,} B ({growth / old_bytes:+.1%})")
+    return diff
+
+
+def format_summary(report: Dict, diff: Dict) -> str:
+    lines = ["[Analyze] Generated component composition:",
+             f"  {'Component':<22} {'Kind':<7} {'JSX B':>9} {'Δ':>7} {'Elems':>6} {'Hooks':>6} "
+             f"{'Handlers':>8} {'Dup class B':>11} {'Imports':>7}"]
+    components = report['components']
+    for comp, stats in sorted(components.items(), key=lambda item: -item[1]['jsx_bytes']):
+        delta = diff['changed'].get(comp, {}).get('jsx_bytes', 0)
+        delta_str = "new" if comp in diff['added'] else f"{delta:+,}" if delta else ""
+        lines.append(f"  {comp:<22} {stats['kind']:<7} {stats['jsx_bytes']:>9,} {delta_str:>7} {stats['elements']:>6} "
+                     f"{stats['hooks']:>6} {stats['handlers']:>8} {stats['repeated_class_bytes']:>11,} "
+                     f"{len(stats['imports']):>7}")
+    totals = report['totals']
+    lines.append(f"  {'Total':<22} {'':<7} {totals['jsx_bytes']:>9,} {'':>7} {totals['elements']:>6} "
+                 f"{totals['hooks']:>6} {totals['handlers']:>8} {totals['repeated_class_bytes']:>11,}")
+    for comp in diff['removed']:
+        lines.append(f"  - {comp} (removed)")
+    for regression in diff['regressions']:
+        lines.append(f"  ⚠️ Regression: {regression}")
+    return "\n".join(lines)
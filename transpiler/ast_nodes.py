@@ -3,39 +3,99 @@ Aura AST (Abstract Syntax Tree) Node Definitions
 Represents the semantic structure of Aura programs
 """
 
-from dataclasses import dataclass
+import sys
+from array import array
+from dataclasses import dataclass, fields
 from typing import List, Any, Optional
 
 
+def node(cls):
+    """@dataclass with __slots__ and no per-instance __dict__ (dataclass(slots=True) on 3.8+)"""
+    cls = dataclass(cls)
+    inherited = {name for base in cls.__mro__[1:-1] for name in vars(base)}
+    own = tuple(f.name for f in fields(cls) if f.name not in inherited)
+    # Field defaults live in the generated __init__; as class attributes they would clash with the slots
+    namespace = {key: value for key, value in vars(cls).items()
+                 if key not in own and key not in ('__dict__', '__weakref__')}
+    namespace['__slots__'] = own
+    slotted = type(cls)(cls.__name__, cls.__bases__, namespace)
+    slotted.__qualname__ = cls.__qualname__
+    return slotted
+
+
+class LineTable:
+    """A file's source text stored once, with the offset of each line"""
+    __slots__ = ('text', 'starts')
+
+    def __init__(self, lines: List[str]):
+        self.text = "".join(lines)
+        self.starts = array('L', [0])
+        position = 0
+        for line in lines:
+            position += len(line)
+            self.starts.append(position)
+
+    def __len__(self):
+        return len(self.starts) - 1
+
+    def line(self, number: int) -> str:
+        """Stripped text of 1-based line 'number'"""
+        return self.text[self.starts[number - 1]:self.starts[number]].strip()
+
+
 @dataclass
 class ASTNode:
     """Base class for all AST nodes"""
+    # raw_line is a property over _source: the line's own string, or the file's
+    # LineTable so parsed nodes share one copy of the source
+    __slots__ = ('line_number', '_source')
+    _interned = ()  # identifier/keyword fields kept as one shared string each
     line_number: int
     raw_line: str
 
+    def __post_init__(self):
+        for name in self._interned:
+            value = getattr(self, name)
+            if type(value) is str:
+                setattr(self, name, sys.intern(value))
 
-@dataclass
+
+def _get_raw_line(self) -> str:
+    source = self._source
+    return source if isinstance(source, str) else source.line(self.line_number)
+
+
+def _set_raw_line(self, value):
+    self._source = value
+
+
+ASTNode.raw_line = property(_get_raw_line, _set_raw_line)
+
+
+@node
 class VariableNode(ASTNode):
     """Variable assignment: set score to 10"""
+    _interned = ('name',)
     name: str
     value: Any  # Can be literal, expression, or another variable
 
 
-@dataclass
+@node
 class PrintNode(ASTNode):
     """Print statement: print "Hello" or print score"""
     content: Any  # String literal or variable name
 
 
-@dataclass
+@node
 class BinaryOpNode(ASTNode):
     """Binary operation: x + y, price * quantity"""
+    _interned = ('left', 'operator', 'right')
     left: Any
     operator: str  # +, -, *, /, >, <, ==, >=, <=, !=
     right: Any
 
 
-@dataclass
+@node
 class IfNode(ASTNode):
     """Conditional statement"""
     condition: BinaryOpNode
@@ -43,95 +103,103 @@ class IfNode(ASTNode):
     else_body: Optional[List[ASTNode]] = None
 
 
-@dataclass
+@node
 class LoopNode(ASTNode):
     """Loop statement: repeat 5 times"""
     count: int
     body: List[ASTNode]
 
 
-@dataclass
+@node
 class FunctionDefNode(ASTNode):
     """Function definition: define function greet"""
+    _interned = ('name',)
     name: str
     body: List[ASTNode]
 
 
-@dataclass
+@node
 class FunctionCallNode(ASTNode):
     """Function call: call function greet"""
+    _interned = ('name',)
     name: str
 
 
-@dataclass
+@node
 class NavigationNode(ASTNode):
     """Navigation target: goes to shop"""
+    _interned = ('target_page',)
     target_page: str
 
 
-@dataclass
+@node
 class PageNode(ASTNode):
     """Page definition: page home [uses layout_name]"""
+    _interned = ('name', 'layout')
     name: str
     layout: Optional[str]
     children: List[ASTNode]
     params: List[str] = None  # For page product(id)
 
 
-@dataclass
+@node
 class AppNode(ASTNode):
     """App container: app 'My Store'"""
     name: str
     pages: List[ASTNode]  # Can be PageNode or LayoutNode
 
 
-@dataclass
+@node
 class LayoutNode(ASTNode):
     """Layout definition: layout shop_layout"""
+    _interned = ('name',)
     name: str
     children: List[ASTNode]
 
 
-@dataclass
+@node
 class SlotNode(ASTNode):
     """Slot placeholder for layout content: slot"""
     pass
 
 
-@dataclass
+@node
 class UINode(ASTNode):
     """UI-related command (legacy support for Phase 1)"""
+    _interned = ('command_type',)
     command_type: str
     data: dict
 
 
-@dataclass
+@node
 class AddNode(ASTNode):
     """List mutation: add item to cart"""
+    _interned = ('item', 'target')
     item: str
     target: str
 
 
-@dataclass
+@node
 class RemoveNode(ASTNode):
     """List mutation: remove item from cart"""
+    _interned = ('item', 'target')
     item: str
     target: str
 
 
-@dataclass
+@node
 class FetchNode(ASTNode):
     """Data fetching: fetch from 'url'"""
     source: str
 
 
-@dataclass
+@node
 class NotifyNode(ASTNode):
     """UI notification: notify 'Success'"""
     message: Any
 
 
-@dataclass
+@node
 class Program:
     """Root node representing the entire program"""
     statements: List[ASTNode]
@@ -1,6 +1,7 @@
 
 import os
 import sys
+from typing import List, Optional
 
 try:
     from llama_cpp import Llama
@@ -8,12 +9,18 @@ except ImportError:
     Llama = None
 
 # Internal import for setup
-from .setup import ensure_aura_brain, MODEL_PATH
+from .setup import ensure_aura_brain, BRAIN_DIR, MODEL_PATH
+from .brain_cache import CorrectionCache, MISS, brain_key, normalize
+from .brain_prompts import BATCH_LINES, SYSTEM_PROMPT, complete, decoding, validated
+from .syntax_fixer import fixer
+from .brain_client import AuraBrainClient
 
 
 class AuraBrain:
     _instance = None
     _model = None
+    _cache = None
+    _client = None
 
     def __new__(cls):
         if cls._instance is None:
@@ -38,11 +45,12 @@ class AuraBrain:
 
         try:
             # Initialize Qwen-0.5B
-            # n_ctx=512 is tiny but enough for single-line correction, extremely fast
+            # n_ctx=1024 fits a batch of BATCH_LINES numbered lines and their answers
             self._model = Llama(
                 model_path=MODEL_PATH,
-                n_ctx=512,
+                n_ctx=1024,
                 n_threads=4,  # Adjust based on CPU
+                use_mmap=True,  # Weights stay in the page cache shared with the daemon
                 verbose=False
             )
             return True
@@ -50,51 +58,92 @@ class AuraBrain:
             print(f"[Aura Brain] Failed to load model: {e}")
             return False
 
+    @property
+    def cache(self) -> CorrectionCache:
+        if self._cache is None:
+            AuraBrain._cache = CorrectionCache(BRAIN_DIR)
+        return self._cache
+
+    @property
+    def client(self) -> AuraBrainClient:
+        if self._client is None:
+            AuraBrain._client = AuraBrainClient(BRAIN_DIR)
+        return self._client
+
     def fix_syntax(self, broken_line: str) -> str:
         """
         Uses Qwen-0.5B to autocorrect a broken Aura command.
+        Answers from the correction cache or the deterministic syntax fixer
+        first; the model is only loaded for lines neither can repair.
         """
-        if not self._model and not self.initialize():
-            return None
-
-        system_prompt = (
-            "Fix Aura syntax. Return ONLY corrected code.\n\n"
-            "RULES:\n"
-            "- Capitalize: Create, Use, When, Make, The\n"
-            "- Add missing: a, the, with\n"
-            "- Fix typos: crete→Create, butn→button, crteate→Create\n\n"
-            "PATTERNS:\n"
-            "Use the [dark/light] theme\n"
-            "Create a [button/heading/paragraph/input] with the text '[text]'\n"
-            "Create a card with the title '[title]' and description '[desc]'\n"
-            "Create a navbar with links [Home, About]\n"
-            "When clicked, [display/alert/show/hide] '[text]'\n"
-            "Make the [element] [color/bold/italic]\n\n"
-            "FIXES:\n"
-            "create→Create | crete→Create | butn→button\n"
-            "create is card→Create a card\n"
-            "with title→with the title\n"
-        )
-
-        prompt = f"<|im_start|>system\n{system_prompt}<|im_end|>\n<|im_start|>user\n{broken_line}<|im_end|>\n<|im_start|>assistant\n"
-
-        try:
-            output = self._model(
-                prompt,
-                max_tokens=128,  # Increased for longer lines
-                stop=["<|im_end|>", "\n"],
-                echo=False,
-                temperature=0.1  # Strict logic
-            )
-
-            corrected = output['choices'][0]['text'].strip()
+        return self.correct_batch([broken_line])[0]
 
-            # Basic validation: If it returns empty or garbage, ignore
-            if len(corrected) < 3:
-                return None
-
-            return corrected
-
-        except Exception as e:
-            print(f"[Aura Brain] Error thinking: {e}")
+    def correct_batch(self, broken_lines: List[str], use_model: bool = True) -> List[Optional[str]]:
+        """
+        Corrects many lines at once (None where no fix was found). The distinct
+        lines the cache and syntax fixer cannot answer share model completions,
+        BATCH_LINES per prompt, instead of one completion each. With
+        use_model=False only the cache and syntax fixer answer, in well under a
+        millisecond per line.
+        """
+        brain = brain_key(MODEL_PATH, SYSTEM_PROMPT, decoding(constrain=True, stream=True))
+        results = [None] * len(broken_lines)
+        pending = {}  # { normalized line: [indexes] } still needing the model
+        for i, line in enumerate(broken_lines):
+            corrected = self.cache.lookup(line, brain)
+            if corrected is MISS:
+                corrected = fixer().fix(line)
+                if not corrected:
+                    pending.setdefault(normalize(line), []).append(i)
+                    continue
+                self.cache.store(line, brain, corrected)
+            results[i] = corrected
+
+        if not pending or not use_model:
+            return results
+
+        distinct = [broken_lines[indexes[0]] for indexes in pending.values()]
+        if not self._model:
+            # A running daemon already holds the model; only load another without one
+            answers = self._ask_daemon(distinct)
+            if answers is not None:
+                for line, corrected in zip(distinct, answers):
+                    for i in pending[normalize(line)]:
+                        results[i] = corrected
+                return results
+            if not self.initialize():
+                return results
+
+        for start in range(0, len(distinct), BATCH_LINES):
+            chunk = distinct[start:start + BATCH_LINES]
+            try:
+                answers = complete(self._model, chunk, max_tokens=128, constrain=True, stream=True,
+                                   temperature=0.1)  # Strict logic; stops at the first whole command
+            except Exception as e:
+                print(f"[Aura Brain] Error thinking: {e}")
+                continue
+            for line, answer in zip(chunk, answers):
+                if answer is None:
+                    continue  # skipped in a batched reply: unknown, not unfixable
+                corrected = validated(answer)
+                self.cache.store(line, brain, corrected)
+                for i in pending[normalize(line)]:
+                    results[i] = corrected
+        return results
+
+    def _ask_daemon(self, lines: List[str]) -> Optional[List[Optional[str]]]:
+        """
+        Corrections from the project's daemon (it caches them too); None if none
+        is reachable or its model failed to load. A daemon that is still loading
+        or too busy answers nothing this time, rather than have a second copy of
+        the model loaded beside its own.
+        """
+        if not self.client.connect():
+            return None
+        if self.client.wait_ready():
+            replies = self.client.correct_batch(lines)
+            if not any("error" in reply for reply in replies):
+                return [reply["corrected"] if reply.get("changed") else None for reply in replies]
+        if self.client.status().get("state") in (None, "failed"):
             return None
+        return [None] * len(lines)
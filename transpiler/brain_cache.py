@@ -0,0 +1,137 @@
+"""
+Aura Brain Cache - Persistent store of Aura Brain corrections
+Keyed by the whitespace-normalized line plus a fingerprint of the model,
+system prompt and decoding mode, so the in-process brain, the daemon and the VS Code extension
+(which talks to the daemon) never pay for the same correction twice. Lines the
+brain could not fix are cached too, as a NULL correction.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional
+
+CACHE_FILE = "corrections.sqlite3"
+MAX_ENTRIES = 50000    # rows kept on disk; the oldest are evicted beyond this
+MEMORY_ENTRIES = 4096  # per-process front cache, answers repeat lookups without SQLite
+EVICT_EVERY = 64       # writes between size checks
+MISS = object()        # lookup() result for a line the brain has never seen
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize(line: str) -> str:
+    return _WHITESPACE.sub(" ", line).strip()
+
+
+def brain_key(model_path: str, prompt: str, decoding: str = "") -> str:
+    """
+    Fingerprint of the model file, system prompt and decoding mode
+    (brain_prompts.decoding); changing any of them starts a fresh keyspace
+    """
+    try:
+        model = f"{os.path.basename(model_path)}:{os.stat(model_path).st_size}"
+    except OSError:
+        model = os.path.basename(model_path)
+    return _fingerprint(model, prompt, decoding)
+
+
+@lru_cache(maxsize=16)
+def _fingerprint(model: str, prompt: str, decoding: str) -> str:
+    return hashlib.sha1(f"{model}\0{prompt}\0{decoding}".encode("utf-8")).hexdigest()[:16]
+
+
+class CorrectionCache:
+    """SQLite-backed (WAL, safe across processes) correction cache with an in-memory front"""
+
+    def __init__(self, directory: str, max_entries: int = MAX_ENTRIES):
+        self.path = os.path.join(directory, CACHE_FILE)
+        self.max_entries = max_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._disabled = False
+        self._writes = 0
+
+    def _connect(self):
+        if self._db is None and not self._disabled:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                db = sqlite3.connect(self.path, timeout=2.0, isolation_level=None, check_same_thread=False)
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute("PRAGMA synchronous=NORMAL")
+                db.execute("CREATE TABLE IF NOT EXISTS corrections ("
+                           "brain TEXT NOT NULL, line TEXT NOT NULL, corrected TEXT, created REAL NOT NULL, "
+                           "PRIMARY KEY (brain, line)) WITHOUT ROWID")
+                db.execute("CREATE INDEX IF NOT EXISTS corrections_created ON corrections (created)")
+                self._db = db
+            except (sqlite3.Error, OSError) as e:
+                print(f"[Aura Brain] ⚠️ Correction cache unavailable ({e}), keeping it in memory only")
+                self._disabled = True
+        return self._db
+
+    def _remember(self, key, corrected):
+        self._memory[key] = corrected
+        self._memory.move_to_end(key)
+        if len(self._memory) > MEMORY_ENTRIES:
+            self._memory.popitem(last=False)
+
+    def lookup(self, line: str, brain: str):
+        """The cached correction (None: known to be unfixable), or MISS"""
+        key = (brain, normalize(line))
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+            db = self._connect()
+            if db is None:
+                return MISS
+            try:
+                row = db.execute("SELECT corrected FROM corrections WHERE brain = ? AND line = ?", key).fetchone()
+            except sqlite3.Error:
+                return MISS
+            if row is None:
+                return MISS
+            self._remember(key, row[0])
+            return row[0]
+
+    def store(self, line: str, brain: str, corrected: Optional[str]):
+        """Records a validated correction, or None for a line the brain could not fix"""
+        key = (brain, normalize(line))
+        with self._lock:
+            self._remember(key, corrected)
+            db = self._connect()
+            if db is None:
+                return
+            try:
+                db.execute("INSERT OR REPLACE INTO corrections (brain, line, corrected, created) VALUES (?, ?, ?, ?)",
+                           key + (corrected, time.time()))
+                self._writes += 1
+                if self._writes % EVICT_EVERY == 1:
+                    self._evict(db)
+            except sqlite3.Error as e:
+                print(f"[Aura Brain] ⚠️ Could not cache correction: {e}")
+
+    def _evict(self, db):
+        excess = db.execute("SELECT COUNT(*) FROM corrections").fetchone()[0] - self.max_entries
+        if excess > 0:
+            db.execute("DELETE FROM corrections WHERE (brain, line) IN "
+                       "(SELECT brain, line FROM corrections ORDER BY created LIMIT ?)", (excess,))
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            db = self._connect()
+            if db is not None:
+                db.execute("DELETE FROM corrections")
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
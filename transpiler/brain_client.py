@@ -1,50 +1,145 @@
 """
 Aura Brain Client - Communicates with the daemon for instant corrections
+Every client of a project talks to the same daemon over its socket. Requests
+are matched to responses by id, so threads can share one client and pipeline.
+A running (or still loading) daemon is reused; otherwise one is started, and
+corrections start it again after it exits when idle. Corrections can stream:
+the model's answer so far is passed to on_partial as it is generated.
 """
 
 import json
+import os
 import subprocess
+import sys
+import threading
 import time
-from typing import Optional, Dict
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from pathlib import Path
+from typing import Callable, Optional, Dict, List
+
+try:
+    from .setup import BRAIN_DIR
+    from .brain_ipc import connect, encode, running_pid
+except ImportError:
+    from setup import BRAIN_DIR
+    from brain_ipc import connect, encode, running_pid
+
+STARTUP_TIMEOUT = 60.0   # seconds a loading daemon may go without progress
+SOCKET_TIMEOUT = 10.0    # seconds for a new daemon to start listening
+REQUEST_TIMEOUT = 30.0   # seconds per request, queueing behind other clients included
+PROGRESS_INTERVAL = 0.5  # seconds between status checks while the model loads
 
 
 class AuraBrainClient:
     """Client for communicating with the Aura Brain Daemon"""
 
-    def __init__(self):
+    def __init__(self, brain_dir: str = BRAIN_DIR):
+        self.brain_dir = brain_dir
         self.process: Optional[subprocess.Popen] = None
         self.request_id = 0
+        self._sock = None
+        self._pending: Dict[int, Future] = {}
+        self._listeners: Dict[int, Callable[[dict], None]] = {}  # request id -> on "partial" params
+        self._lock = threading.Lock()
 
-    def start_daemon(self) -> bool:
-        """Start the background daemon process"""
+    def connect(self) -> bool:
+        """Attach to the daemon already serving this project, if there is one"""
+        if self._sock:
+            return True
         try:
-            import sys
-            from pathlib import Path
+            sock = connect(self.brain_dir)
+        except (OSError, ValueError):
+            return False
+        sock.settimeout(None)
+        self._sock = sock
+        threading.Thread(target=self._read_responses, args=(sock,), daemon=True).start()
+        return True
 
-            daemon_path = Path(__file__).parent / "brain_daemon.py"
+    def start_daemon(self, timeout: float = STARTUP_TIMEOUT) -> bool:
+        """Use the project's daemon, starting one in the background if none runs, once it is ready"""
+        if not self.connect():
+            # A pidfile without a socket is a daemon still starting up: wait for it instead
+            if running_pid(self.brain_dir) is None and not self._spawn():
+                return False
+            deadline = time.time() + SOCKET_TIMEOUT
+            while not self.connect():
+                if self.process is not None and self.process.poll() is not None:
+                    # It exits at once when another client's daemon got there first
+                    self.process = None
+                    if self.connect():
+                        break
+                    print(f"[ERROR] Daemon exited during startup, see {os.path.join(self.brain_dir, 'daemon.log')}")
+                    return False
+                if time.time() > deadline:
+                    print("[ERROR] Daemon did not start listening")
+                    return False
+                time.sleep(0.05)
+        return self.wait_ready(timeout)
 
+    def _spawn(self) -> bool:
+        try:
+            os.makedirs(self.brain_dir, exist_ok=True)
+            log = open(os.path.join(self.brain_dir, "daemon.log"), 'a')
+            # Its own session, so it keeps serving other clients after this process exits
+            detach = ({'creationflags': getattr(subprocess, 'CREATE_NEW_PROCESS_GROUP', 0)} if os.name == 'nt'
+                      else {'start_new_session': True})
+            root = str(Path(__file__).resolve().parent.parent)
+            env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")])))
             self.process = subprocess.Popen(
-                [sys.executable, "-m", "transpiler.brain_daemon"],
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1
+                [sys.executable, "-m", "transpiler.brain_daemon", "--brain-dir", self.brain_dir],
+                env=env,
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                **detach
             )
-
-            # Wait for daemon to be ready (ping test)
-            time.sleep(2)  # Give it time to load model
-
-            if self.ping():
-                return True
-            else:
-                self.stop_daemon()
-                return False
-
+            log.close()
+            return True
         except Exception as e:
             print(f"[ERROR] Failed to start daemon: {e}")
             return False
 
+    def wait_ready(self, timeout: float = STARTUP_TIMEOUT) -> bool:
+        """
+        Blocks on the daemon's ready signal, reporting load progress. Gives up
+        after timeout seconds without progress, so a model download may take longer.
+        """
+        try:
+            ready = self.submit("wait_ready", {})
+        except (RuntimeError, OSError):
+            return False
+        deadline, seen = time.time() + timeout, None
+        while True:
+            try:
+                status = ready.result(max(0.0, min(PROGRESS_INTERVAL, deadline - time.time()))).get("result") or {}
+                break
+            except FutureTimeout:
+                pass
+            except Exception:
+                return False  # the daemon went away
+            status = self.status()
+            if status.get("state") == "failed":
+                break
+            progress = (status.get("stage"), status.get("progress"))
+            if progress != seen:
+                if not seen or progress[0] != seen[0]:
+                    print(f"[Aura Brain] {str(status.get('stage')).capitalize()}... ({status.get('progress', 0):.0%})")
+                seen, deadline = progress, time.time() + timeout
+            elif time.time() >= deadline:
+                print(f"[ERROR] Aura Brain daemon made no progress for {timeout:.0f}s")
+                return False
+        if status.get("state") != "ready":
+            print(f"[ERROR] Aura Brain daemon failed to load: {status.get('error', 'unknown error')}")
+            return False
+        return True
+
+    def status(self) -> Dict:
+        """{"state": "loading"|"ready"|"failed", "stage": str, "progress": 0..1, "pid": int}"""
+        try:
+            return self._send_request("status", {}, timeout=2).get("result") or {}
+        except Exception:
+            return {}
+
     def ping(self) -> bool:
         """Check if daemon is alive"""
         try:
@@ -53,18 +148,24 @@ class AuraBrainClient:
         except:
             return False
 
-    def correct(self, line: str) -> Dict:
+    def correct(self, line: str, on_partial: Optional[Callable[[str, bool], None]] = None) -> Dict:
         """
-        Request correction for a line of code.
+        Request correction for a line of code. on_partial(text, complete) hears
+        the model's answer as it streams, complete once it is a whole command.
         Returns: {"original": str, "corrected": str, "changed": bool, "time_ms": float}
         """
         try:
-            response = self._send_request("correct", {"line": line})
+            self._ensure_daemon()
+            if on_partial:
+                listener = lambda params: on_partial(params["text"], params["complete"])
+                response = self.submit("correct", {"line": line, "stream": True}, listener).result(REQUEST_TIMEOUT)
+            else:
+                response = self._send_request("correct", {"line": line})
             return response.get("result", {
                 "original": line,
                 "corrected": line,
                 "changed": False,
-                "error": "No response from daemon"
+                "error": response.get("error", {}).get("message", "No response from daemon")
             })
         except Exception as e:
             return {
@@ -74,34 +175,123 @@ class AuraBrainClient:
                 "error": str(e)
             }
 
-    def _send_request(self, method: str, params: dict) -> dict:
-        """Send JSON-RPC request to daemon"""
-        if not self.process:
+    def correct_batch(self, lines: List[str]) -> List[Dict]:
+        """
+        Request corrections for many lines in one round trip.
+        Returns one correct() result per line, in order.
+        """
+        try:
+            self._ensure_daemon()
+            response = self._send_request("correct_batch", {"lines": lines})
+            if "error" in response:
+                raise RuntimeError(response["error"].get("message"))
+            return response["result"]["results"]
+        except Exception as e:
+            return [{
+                "original": line,
+                "corrected": line,
+                "changed": False,
+                "error": str(e)
+            } for line in lines]
+
+    def _ensure_daemon(self):
+        """Reconnects, starting the daemon again if it exited while idle"""
+        if not self._sock and not self.start_daemon():
+            raise RuntimeError("Aura Brain daemon is not available")
+
+    def submit(self, method: str, params: dict, listener: Optional[Callable[[dict], None]] = None) -> Future:
+        """
+        Sends a request without waiting; the Future resolves to the daemon's
+        response. listener gets the params of each notification sent for it.
+        """
+        if not self._sock:
             raise RuntimeError("Daemon not started")
+        future = Future()
+        with self._lock:
+            self.request_id += 1
+            request = {
+                "jsonrpc": "2.0",
+                "id": self.request_id,
+                "method": method,
+                "params": params
+            }
+            self._pending[self.request_id] = future
+            if listener:
+                self._listeners[self.request_id] = listener
+            try:
+                # Under the lock, so concurrent requests never interleave on the socket
+                self._sock.sendall(encode(request))
+            except OSError:
+                del self._pending[self.request_id]
+                self._listeners.pop(self.request_id, None)
+                raise
+        return future
 
-        self.request_id += 1
-        request = {
-            "jsonrpc": "2.0",
-            "id": self.request_id,
-            "method": method,
-            "params": params
-        }
+    def _send_request(self, method: str, params: dict, timeout: float = REQUEST_TIMEOUT) -> dict:
+        """Send JSON-RPC request to daemon"""
+        return self.submit(method, params).result(timeout)
 
-        # Send request
-        self.process.stdin.write(json.dumps(request) + "\n")
-        self.process.stdin.flush()
+    def _read_responses(self, sock):
+        """Resolves each pending request as its response arrives, in whatever order"""
+        try:
+            with sock.makefile('r', encoding='utf-8') as stream:
+                for line in stream:
+                    try:
+                        response = json.loads(line)
+                    except ValueError:
+                        continue
+                    if "method" in response:
+                        # A notification about a pending request, such as a partial correction
+                        params = response.get("params") or {}
+                        with self._lock:
+                            listener = self._listeners.get(params.get("id"))
+                        if listener:
+                            listener(params)
+                        continue
+                    with self._lock:
+                        future = self._pending.pop(response.get("id"), None)
+                        self._listeners.pop(response.get("id"), None)
+                    if future:
+                        future.set_result(response)
+        except (OSError, ValueError):
+            pass
+        with self._lock:
+            if self._sock is sock:
+                self._sock = None
+                pending, self._pending = self._pending, {}
+                self._listeners.clear()
+            else:
+                pending = {}
+        for future in pending.values():
+            future.set_exception(ConnectionError("Daemon closed the connection"))
 
-        # Read response
-        response_line = self.process.stdout.readline()
-        return json.loads(response_line)
+    def close(self):
+        """Disconnect, leaving the daemon running for other clients"""
+        with self._lock:
+            sock, self._sock = self._sock, None
+            pending, self._pending = self._pending, {}
+            self._listeners.clear()
+        if sock:
+            try:
+                sock.shutdown(2)
+            except OSError:
+                pass
+            sock.close()
+        for future in pending.values():
+            future.set_exception(ConnectionError("Client closed"))
 
     def stop_daemon(self):
         """Gracefully stop the daemon"""
+        if self._sock:
+            try:
+                self._send_request("shutdown", {}, timeout=2)
+            except Exception:
+                pass
+        self.close()
         if self.process:
             try:
-                self._send_request("shutdown", {})
                 self.process.wait(timeout=2)
-            except:
+            except Exception:
                 self.process.terminate()
             finally:
                 self.process = None
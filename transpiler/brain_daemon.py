@@ -1,140 +1,435 @@
 """
 Aura Brain Daemon - Persistent Background Service
 Keeps the Qwen model loaded in memory for instant autocorrection.
+Serves every client of the project over one socket (see brain_ipc): requests
+are answered by id as they finish, and corrections from all connections queue
+for a single model worker, which batches whatever has queued up meanwhile.
+The socket is bound before the model loads: clients ask for `status` (loading
+stage and progress) or block on `wait_ready`. After IDLE_TIMEOUT seconds
+without corrections the daemon exits to free the model.
+A correction request with "stream": true also gets "partial" notifications
+({"id", "index", "text", "complete"}) while the model writes its answer.
 """
 
+import asyncio
+import os
 import sys
 import json
 import time
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
 
 try:
     from llama_cpp import Llama
 except ImportError:
-    print("[ERROR] llama-cpp-python not installed. Run: pip install llama-cpp-python")
-    sys.exit(1)
+    Llama = None
 
 try:
-    from .setup import ensure_aura_brain, MODEL_PATH
+    from .setup import ensure_aura_brain, BRAIN_DIR, MODEL_PATH
+    from .brain_cache import CorrectionCache, MISS, brain_key, normalize
+    from .brain_prompts import BATCH_LINES, SYSTEM_PROMPT, PromptPrefix, complete, decoding, validated
+    from .syntax_fixer import fixer
+    from .brain_ipc import MAX_MESSAGE, PID_FILE, PORT_FILE, UNIX_SOCKETS, encode, lock_daemon, socket_path, unlock_daemon
 except ImportError:
-    from setup import ensure_aura_brain, MODEL_PATH
+    from setup import ensure_aura_brain, BRAIN_DIR, MODEL_PATH
+    from brain_cache import CorrectionCache, MISS, brain_key, normalize
+    from brain_prompts import BATCH_LINES, SYSTEM_PROMPT, PromptPrefix, complete, decoding, validated
+    from syntax_fixer import fixer
+    from brain_ipc import MAX_MESSAGE, PID_FILE, PORT_FILE, UNIX_SOCKETS, encode, lock_daemon, socket_path, unlock_daemon
+
+MAX_COALESCED = 256  # lines the worker takes from the queue for one correct_batch
+# Seconds without corrections before the daemon exits and frees the ~400 MB model; 0 never exits
+IDLE_TIMEOUT = float(os.environ.get("AURA_BRAIN_IDLE_TIMEOUT", 30 * 60))
+
+
+class AlreadyRunning(RuntimeError):
+    """Another daemon already serves this project"""
 
 
 class AuraBrainDaemon:
     """Persistent Aura Brain service for real-time corrections"""
 
-    def __init__(self):
-        self.model = None
+    def __init__(self, model=None, brain_dir: str = BRAIN_DIR, idle_timeout: float = IDLE_TIMEOUT):
+        # A preloaded model (or a stub for load tests) skips loading Qwen
+        self.model = model
+        self.brain_dir = brain_dir
+        self.idle_timeout = idle_timeout
+        # loading -> ready, or failed with error; stage and progress while loading
+        self.state = "loading"
+        self.stage = "starting"
+        self.progress = 0.0
+        self.error = None
         self.system_prompt = self._build_system_prompt()
+        # Shared with the in-process AuraBrain through .aura_brain/
+        self.cache = CorrectionCache(brain_dir)
+        # Model state after the system prompt, restored per request
+        self.prefix = None
+        self.reuse_prefix = True
+        # Sample only lines the parser accepts (brain_grammar)
+        self.constrain = True
+        # Read answers as they are generated and stop at the first whole command
+        self.stream = True
+        self.tokens_generated = 0
+        self.model_lines = 0
 
     def _build_system_prompt(self) -> str:
         """Build the comprehensive Aura syntax guide"""
-        return (
-            "Fix Aura syntax. Return ONLY corrected code.\n\n"
-            "RULES:\n"
-            "- Capitalize: Create, Use, When, Make, The\n"
-            "- Add missing: a, the, with\n"
-            "- Fix typos: crete→Create, butn→button, crteate→Create\n\n"
-            "PATTERNS:\n"
-            "Use the [dark/light] theme\n"
-            "Create a [button/heading/paragraph/input] with the text '[text]'\n"
-            "Create a card with the title '[title]' and description '[desc]'\n"
-            "Create a navbar with links [Home, About]\n"
-            "When clicked, [display/alert/show/hide] '[text]'\n"
-            "Make the [element] [color/bold/italic]\n\n"
-            "FIXES:\n"
-            "create→Create | crete→Create | butn→button\n"
-            "create is card→Create a card\n"
-            "with title→with the title\n"
-        )
+        return SYSTEM_PROMPT
 
     def start(self):
         """Initialize and keep the model warm"""
-        if not ensure_aura_brain():
-            print("[ERROR] Failed to ensure Aura Brain model")
-            return False
+        self._progress("indexing grammar", 0.05)
+        fixer()  # index the grammar now rather than on the first request
+        if self.model is None:
+            if Llama is None:
+                return self._failed("llama-cpp-python not installed. Run: pip install llama-cpp-python")
+            self._progress("checking model", 0.1)
+            if not ensure_aura_brain(progress=lambda done: self._progress("downloading model", 0.1 + 0.5 * done)):
+                return self._failed("Failed to ensure Aura Brain model")
 
-        print("[Aura Brain Daemon] Starting...")
-        print("[Aura Brain Daemon] Loading Qwen2.5-0.5B model...")
+            print("[Aura Brain Daemon] Starting...")
+            self._progress("loading model", 0.6)
+            try:
+                # Optimized for speed: smaller context, more threads
+                self.model = Llama(
+                    model_path=MODEL_PATH,
+                    n_ctx=1024,  # Room for a batch of BATCH_LINES numbered lines
+                    n_batch=128,  # Batch processing
+                    n_threads=6,  # More CPU threads
+                    use_mmap=True,  # Weights stay in the page cache shared with in-process AuraBrain
+                    verbose=False
+                )
+            except Exception as e:
+                return self._failed(f"Failed to load model: {e}")
 
-        try:
-            # Optimized for speed: smaller context, more threads
-            self.model = Llama(
-                model_path=MODEL_PATH,
-                n_ctx=256,  # Reduced for faster inference
-                n_batch=128,  # Batch processing
-                n_threads=6,  # More CPU threads
-                verbose=False
-            )
-            print("[Aura Brain Daemon] ✓ Model loaded and ready")
-            print("[Aura Brain Daemon] Listening on stdin for correction requests...")
-            return True
-        except Exception as e:
-            print(f"[ERROR] Failed to load model: {e}")
-            return False
+        self._progress("caching system prompt", 0.9)
+        self.prefix = PromptPrefix(self.model)
+        if self.prefix.enabled:
+            print(f"[Aura Brain Daemon] ✓ System prompt cached ({self.prefix.tokens} tokens)")
+        self.state, self.stage, self.progress = "ready", "ready", 1.0
+        print("[Aura Brain Daemon] ✓ Model loaded and ready", flush=True)
+        return True
+
+    def _progress(self, stage: str, progress: float):
+        if stage != self.stage:
+            print(f"[Aura Brain Daemon] {stage.capitalize()}...", flush=True)
+        self.stage, self.progress = stage, progress
+
+    def _failed(self, message: str) -> bool:
+        print(f"[ERROR] {message}", flush=True)
+        self.state, self.error = "failed", message
+        return False
+
+    def status(self) -> dict:
+        status = {"state": self.state, "stage": self.stage, "progress": round(self.progress, 3), "pid": os.getpid()}
+        if self.error:
+            status["error"] = self.error
+        if self.model_lines:
+            status["tokens_per_correction"] = round(self.tokens_generated / self.model_lines, 1)
+        return status
 
     def correct_line(self, line: str) -> dict:
         """
         Correct a single line of Aura code.
         Returns: {"original": str, "corrected": str, "changed": bool, "time_ms": float}
         """
+        return self.correct_batch([line])[0]
+
+    def correct_batch(self, lines: List[str],
+                      on_partial: Optional[Callable[[int, str, bool], None]] = None) -> List[dict]:
+        """
+        Correct many lines in one request: cache and syntax fixer per line, then
+        the distinct remainder through the model, BATCH_LINES per completion.
+        Returns one correct_line result per input line; on_partial(index, text,
+        complete) hears the model's answers for them as they stream.
+        """
         start_time = time.time()
+        brain = brain_key(MODEL_PATH, self.system_prompt, decoding(self.constrain, self.stream))
+        results = [None] * len(lines)
+        pending = {}  # { normalized line: [indexes] } still needing the model
 
-        if not self.model:
-            return {
-                "original": line,
-                "corrected": line,
-                "changed": False,
-                "error": "Model not loaded",
-                "time_ms": 0
-            }
+        for i, line in enumerate(lines):
+            cached = self.cache.lookup(line, brain)
+            if cached is not MISS:
+                results[i] = self._result(line, cached, start_time, cached=True)
+                continue
+            # Typos and missing filler words are fixed without the model
+            fixed = fixer().fix(line)
+            if fixed:
+                self.cache.store(line, brain, fixed)
+                results[i] = self._result(line, fixed, start_time, fast_path=True)
+                continue
+            pending.setdefault(normalize(line), []).append(i)
 
-        # Build prompt with cached system context
-        prompt = f"<|im_start|>system\n{self.system_prompt}<|im_end|>\n<|im_start|>user\n{line}<|im_end|>\n<|im_start|>assistant\n"
+        distinct = [lines[indexes[0]] for indexes in pending.values()]
+        for start in range(0, len(distinct), BATCH_LINES):
+            chunk = distinct[start:start + BATCH_LINES]
+            prefix = self.prefix if self.reuse_prefix else None
+            usage = {}
 
+            def partial(index, text, whole, chunk=chunk):
+                for i in pending[normalize(chunk[index])]:
+                    on_partial(i, text, whole)
+
+            try:
+                if not self.model:
+                    raise RuntimeError("Model not loaded")
+                answers = complete(self.model, chunk, max_tokens=64, prefix=prefix, constrain=self.constrain,
+                                   stream=self.stream, on_partial=partial if on_partial else None, usage=usage,
+                                   temperature=0.05,  # Very strict for consistency
+                                   top_p=0.9)
+            except Exception as e:
+                answers, error = [None] * len(chunk), str(e)
+            else:
+                error = None
+            tokens = usage.get('completion_tokens', 0)
+            self.tokens_generated += tokens
+            self.model_lines += len(chunk)
+            for line, answer in zip(chunk, answers):
+                # Validate correction; only parseable fixes are cached as fixes
+                corrected = validated(answer)
+                if answer is not None:
+                    self.cache.store(line, brain, corrected)
+                extra = {"error": error} if error else {"prefix_reused": bool(prefix and prefix.enabled),
+                                                        "tokens": round(tokens / len(chunk), 1)}
+                for i in pending[normalize(line)]:
+                    results[i] = self._result(lines[i], corrected, start_time, **extra)
+        return results
+
+    def _result(self, line: str, corrected, start_time: float, **extra) -> dict:
+        result = {
+            "original": line,
+            "corrected": corrected or line,
+            "changed": bool(corrected) and corrected != line,
+            "time_ms": (time.time() - start_time) * 1000
+        }
+        result.update(extra)
+        return result
+
+    async def serve(self):
+        """
+        Answers every connection on the project socket until a shutdown request
+        or IDLE_TIMEOUT. Listens from the start; the model loads meanwhile unless
+        start() already ran.
+        """
+        self._queue = asyncio.Queue()
+        self._stopped = asyncio.Event()
+        self._ready = asyncio.Event()
+        self._writers = set()
+        self._handlers = set()
+        self._active = 0
+        self._last_request = time.monotonic()
+        os.makedirs(self.brain_dir, exist_ok=True)
+        # Only the lock holder touches the socket and pidfile, so a second daemon
+        # can't unlink a live socket, and whatever is left there is from a dead one
+        lock = lock_daemon(self.brain_dir)
+        if lock is None:
+            raise AlreadyRunning(f"Another Aura Brain daemon is already serving {self.brain_dir}")
+        created = []
         try:
-            output = self.model(
-                prompt,
-                max_tokens=64,
-                stop=["<|im_end|>", "\n"],
-                echo=False,
-                temperature=0.05,  # Very strict for consistency
-                top_p=0.9
-            )
-
-            corrected = output['choices'][0]['text'].strip()
-            elapsed_ms = (time.time() - start_time) * 1000
-
-            # Validate correction
-            if len(corrected) < 3 or corrected == line:
-                return {
-                    "original": line,
-                    "corrected": line,
-                    "changed": False,
-                    "time_ms": elapsed_ms
-                }
+            await self._serve_locked(created)
+        finally:
+            for path in created:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            unlock_daemon(lock)
+
+    async def _serve_locked(self, created):
+        """serve() once the daemon lock is held; created collects the files to remove on exit"""
+        if UNIX_SOCKETS:
+            path = socket_path(self.brain_dir)
+            if os.path.exists(path):
+                os.unlink(path)  # left behind by a daemon that crashed
+            server = await asyncio.start_unix_server(self._serve_client, path=path, limit=MAX_MESSAGE)
+            created.append(path)
+            address = path
+        else:
+            server = await asyncio.start_server(self._serve_client, '127.0.0.1', 0, limit=MAX_MESSAGE)
+            port = server.sockets[0].getsockname()[1]
+            port_file = os.path.join(self.brain_dir, PORT_FILE)
+            created.append(port_file)
+            with open(port_file, 'w') as f:
+                f.write(str(port))
+            address = f"127.0.0.1:{port}"
+        pid_file = os.path.join(self.brain_dir, PID_FILE)
+        created.append(pid_file)
+        with open(pid_file, 'w') as f:
+            f.write(str(os.getpid()))
+        print(f"[Aura Brain Daemon] Listening on {address}", flush=True)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            worker = asyncio.ensure_future(self._model_worker(executor))
+            watchdog = asyncio.ensure_future(self._idle_watch()) if self.idle_timeout > 0 else None
+            try:
+                async with server:
+                    if self.state != "ready":
+                        # The model loads on the worker's thread, the one that will use it
+                        await asyncio.get_running_loop().run_in_executor(executor, self.start)
+                    self._last_request = time.monotonic()
+                    self._ready.set()
+                    if self.state == "failed":
+                        await asyncio.sleep(0.5)  # let waiting clients read the error
+                        self._stopped.set()
+                    await self._stopped.wait()
+            finally:
+                worker.cancel()
+                if watchdog:
+                    watchdog.cancel()
+                while not self._queue.empty():
+                    _, future, _ = self._queue.get_nowait()
+                    future.set_exception(RuntimeError("Daemon shutting down"))
+                # Closing each connection ends its handler at the next read
+                for writer in list(self._writers):
+                    writer.close()
+                if self._handlers:
+                    await asyncio.wait(self._handlers, timeout=1.0)
+
+    async def _idle_watch(self):
+        """Stops the daemon once no correction has been asked for in idle_timeout seconds"""
+        while True:
+            await asyncio.sleep(min(60.0, self.idle_timeout / 4))
+            idle = time.monotonic() - self._last_request
+            if self._ready.is_set() and not self._active and idle >= self.idle_timeout:
+                print(f"[Aura Brain Daemon] Idle for {idle:.0f}s, shutting down to free the model", flush=True)
+                self._stopped.set()
+                return
 
-            return {
-                "original": line,
-                "corrected": corrected,
-                "changed": True,
-                "time_ms": elapsed_ms
-            }
+    async def _serve_client(self, reader, writer):
+        """Reads requests from one connection; each is answered as soon as it is done"""
+        self._writers.add(writer)
+        self._handlers.add(asyncio.current_task())
+        tasks = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ConnectionError, ValueError):
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                task = asyncio.ensure_future(self._answer(line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.wait(tasks)
+        finally:
+            self._writers.discard(writer)
+            self._handlers.discard(asyncio.current_task())
+            writer.close()
 
+    async def _answer(self, line: bytes, writer):
+        request = {}
+        try:
+            request = json.loads(line)
+            response = {"jsonrpc": "2.0", "id": request.get("id"), "result": await self._dispatch(request, writer)}
         except Exception as e:
-            return {
-                "original": line,
-                "corrected": line,
-                "changed": False,
-                "error": str(e),
-                "time_ms": (time.time() - start_time) * 1000
-            }
-
-    def run(self):
-        """Main daemon loop - reads from stdin, writes to stdout"""
-        if not self.start():
+            response = {"jsonrpc": "2.0", "id": request.get("id"), "error": {"message": str(e)}}
+        try:
+            writer.write(encode(response))
+            await writer.drain()
+        except ConnectionError:
+            pass  # the client went away; the correction is cached for next time
+        if request.get("method") == "shutdown":
+            self._stopped.set()
+
+    async def _dispatch(self, request: dict, writer=None):
+        method, params = request.get("method"), request.get("params") or {}
+        listener = None
+        if params.get("stream") and writer is not None:
+            def listener(index, text, whole, request_id=request.get("id")):
+                self._notify(writer, "partial", {"id": request_id, "index": index, "text": text, "complete": whole})
+        if method == "correct":
+            return (await self._submit([params.get("line", "")], listener))[0]
+        if method == "correct_batch":
+            return {"results": await self._submit(params.get("lines", []), listener)}
+        if method == "ping":
+            return {"status": "alive", "state": self.state}
+        if method == "status":
+            return self.status()
+        if method == "wait_ready":
+            await self._ready.wait()
+            return self.status()
+        if method == "shutdown":
+            return {"status": "shutting down"}
+        raise ValueError(f"Unknown method: {method}")
+
+    def _notify(self, writer, method: str, params: dict):
+        """A JSON-RPC notification (no id) on one connection, if it is still open"""
+        if not writer.is_closing():
+            writer.write(encode({"jsonrpc": "2.0", "method": method, "params": params}))
+
+    async def _submit(self, lines: List[str], on_partial=None) -> List[dict]:
+        """Queues lines for the model worker; they wait there while the model loads"""
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((lines, future, on_partial))
+        self._active += 1
+        try:
+            return await future
+        finally:
+            self._active -= 1
+            self._last_request = time.monotonic()
+
+    async def _model_worker(self, executor):
+        """The only caller of correct_batch, so the model runs one completion at a time"""
+        loop = asyncio.get_running_loop()
+        await self._ready.wait()
+        while True:
+            jobs = [await self._queue.get()]
+            if self.state != "ready":
+                if not jobs[0][1].done():
+                    jobs[0][1].set_exception(RuntimeError(self.error or "Model not loaded"))
+                continue
+            # Requests queued meanwhile share one correct_batch, and so its completions
+            while not self._queue.empty() and sum(len(job[0]) for job in jobs) < MAX_COALESCED:
+                jobs.append(self._queue.get_nowait())
+            lines = [line for job_lines, _, _ in jobs for line in job_lines]
+            # Which request, and which of its lines, each line of the batch is
+            owners = [(listener, i) for job_lines, _, listener in jobs for i in range(len(job_lines))]
+
+            def on_partial(index, text, whole):
+                listener, local = owners[index]
+                if listener:
+                    loop.call_soon_threadsafe(listener, local, text, whole)
+
+            streaming = any(listener for _, _, listener in jobs)
+            try:
+                results = await loop.run_in_executor(executor, self.correct_batch, lines,
+                                                     on_partial if streaming else None)
+            except Exception as e:
+                for _, future, _ in jobs:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            offset = 0
+            for job_lines, future, _ in jobs:
+                if not future.done():
+                    future.set_result(results[offset:offset + len(job_lines)])
+                offset += len(job_lines)
+
+    def run(self, stdio: bool = False):
+        """Serves the project socket while the model loads (or, with stdio=True, stdin/stdout once loaded)"""
+        if stdio:
+            if not self.start():
+                sys.exit(1)
+            self.run_stdio()
+            return
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            pass
+        except AlreadyRunning as e:
+            print(f"[Aura Brain Daemon] {e}")  # another client started it first
+        finally:
+            self.cache.close()
+        if self.state == "failed":
             sys.exit(1)
 
+    def run_stdio(self):
+        """Single-client loop over stdin/stdout, one request at a time"""
         # JSON-RPC style communication
         while True:
             try:
@@ -154,6 +449,15 @@ class AuraBrainDaemon:
                     }
                     print(json.dumps(response), flush=True)
 
+                elif request.get("method") == "correct_batch":
+                    code_lines = request.get("params", {}).get("lines", [])
+                    response = {
+                        "jsonrpc": "2.0",
+                        "id": request.get("id"),
+                        "result": {"results": self.correct_batch(code_lines)}
+                    }
+                    print(json.dumps(response), flush=True)
+
                 elif request.get("method") == "ping":
                     response = {
                         "jsonrpc": "2.0",
@@ -177,5 +481,12 @@ class AuraBrainDaemon:
 
 
 if __name__ == "__main__":
-    daemon = AuraBrainDaemon()
-    daemon.run()
+    import argparse
+    parser = argparse.ArgumentParser(description="Aura Brain correction daemon")
+    parser.add_argument("--stdio", action="store_true", help="serve one client on stdin/stdout instead of the socket")
+    parser.add_argument("--brain-dir", default=BRAIN_DIR, help="project .aura_brain directory (cache and socket)")
+    parser.add_argument("--idle-timeout", type=float, default=IDLE_TIMEOUT,
+                        help="seconds without corrections before exiting, 0 to stay up (default: %(default)s)")
+    args = parser.parse_args()
+    daemon = AuraBrainDaemon(brain_dir=args.brain_dir, idle_timeout=args.idle_timeout)
+    daemon.run(stdio=args.stdio)
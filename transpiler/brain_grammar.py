@@ -0,0 +1,325 @@
+"""
+Aura Brain Grammar - Constrained decoding for the correction model
+Compiles the AuraParser command table (COMMAND_RULES, with the actions of a
+'When ...,' line from ACTION_RULES) into a llama.cpp GBNF grammar. With it the
+model can only produce lines the parser accepts, and generation stops where a
+command ends instead of running on to max_tokens.
+
+Whitespace is canonical: each \\s+ becomes one space, so the grammar derives
+a subset of what the regexes accept. The same rule tree also samples and
+recognizes lines in pure Python, so the grammar can be tested without a model.
+"""
+
+import random
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+try:
+    from .aura_parser import ACTION_RULES, COMMAND_RULES
+except ImportError:
+    from aura_parser import ACTION_RULES, COMMAND_RULES
+
+# Named groups compiled as a reference to another rule instead of their regex
+GROUP_RULES = {'actions': 'actions'}
+NO_FIX = "NONE"  # the answer for input that is no command at all, rather than forcing one
+MAX_EXPANDED = 8  # a{m,n} with a larger n - m becomes a{m,} (the grammar stays a superset)
+_PRINTABLE = [chr(c) for c in range(32, 127)]
+_CATEGORIES = {
+    'CATEGORY_DIGIT': [('0', '9')],
+    'CATEGORY_WORD': [('a', 'z'), ('A', 'Z'), ('0', '9'), ('_', '_')],
+    'CATEGORY_SPACE': [(' ', ' '), ('\t', '\t')],  # never a newline inside one line
+}
+
+# Rule tree nodes are tuples:
+#   ('lit', text)  ('cls', negated, [(lo, hi), ...])  ('seq', [nodes])  ('alt', [nodes])
+#   ('rep', node, min, max or None)  ('ref', rule name)
+
+
+def _node(items, names: Dict[int, str]):
+    """The rule tree for a parsed regex"""
+    seq = []
+    for op, value in items:
+        name = str(op)
+        if name == 'LITERAL':
+            seq.append(('lit', chr(value)))
+        elif name == 'NOT_LITERAL':
+            seq.append(('cls', True, [(chr(value), chr(value)), ('\n', '\n')]))
+        elif name == 'ANY':
+            seq.append(('cls', True, [('\n', '\n')]))
+        elif name == 'IN':
+            seq.append(_class(value))
+        elif name == 'BRANCH':
+            seq.append(('alt', [_node(branch, names) for branch in value[1]]))
+        elif name == 'SUBPATTERN':
+            group = names.get(value[0])
+            seq.append(('ref', GROUP_RULES[group]) if group in GROUP_RULES else _node(value[-1], names))
+        elif name in ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT'):
+            low, high, body = value
+            seq.append(_repeat(_node(body, names), low, None if high == sre_parse.MAXREPEAT else high))
+        elif name == 'AT':
+            continue  # anchors: a derived line is always the whole line
+        else:
+            raise ValueError(f"Regex construct {name} has no grammar equivalent")
+    merged = []
+    for node in seq:
+        if merged and node[0] == 'lit' and merged[-1][0] == 'lit':
+            merged[-1] = ('lit', merged[-1][1] + node[1])
+        else:
+            merged.append(node)
+    return merged[0] if len(merged) == 1 else ('seq', merged)
+
+
+def _class(items):
+    negated, ranges = False, []
+    for op, value in items:
+        name = str(op)
+        if name == 'NEGATE':
+            negated = True
+        elif name == 'LITERAL':
+            ranges.append((chr(value), chr(value)))
+        elif name == 'RANGE':
+            ranges.append((chr(value[0]), chr(value[1])))
+        elif name == 'CATEGORY' and str(value) in _CATEGORIES:
+            ranges.extend(_CATEGORIES[str(value)])
+        else:
+            raise ValueError(f"Character class item {name} {value} has no grammar equivalent")
+    if negated:
+        ranges.append(('\n', '\n'))
+    elif all(lo == hi and lo in ' \t' for lo, hi in ranges):
+        return ('lit', ' ')  # \s: one canonical space
+    return ('cls', negated, ranges)
+
+
+def _repeat(body, low: int, high: Optional[int]):
+    if body == ('lit', ' '):
+        return body if low else ('rep', body, 0, 1)  # \s+ and \s*
+    if high is not None and high - low > MAX_EXPANDED:
+        high = None
+    return ('rep', body, low, high)
+
+
+def _rule_tree(source: str):
+    parsed = sre_parse.parse(source)
+    state = getattr(parsed, 'state', None) or parsed.pattern
+    names = {index: name for name, index in state.groupdict.items()}
+    return _node(parsed, names)
+
+
+@lru_cache(maxsize=None)
+def rules() -> Dict[str, tuple]:
+    """
+    {rule name: rule tree} for one command line ('line'), the rules it uses,
+    and one answer of the model ('answer': a line or NO_FIX)
+    """
+    table = {}
+    commands = []
+    for cmd_type, _, source in COMMAND_RULES:
+        name = "cmd-" + cmd_type.replace('_', '-')
+        table[name] = _rule_tree(source)
+        commands.append(('ref', name))
+    actions = []
+    for i, rule in enumerate(ACTION_RULES):
+        table[f"act-{i}"] = _rule_tree(rule[1])
+        actions.append(('ref', f"act-{i}"))
+    table['action'] = ('alt', actions)
+    # Grammar.action_split: ',\s*then\s+'
+    table['actions'] = ('seq', [('ref', 'action'),
+                                ('rep', ('seq', [('lit', ', then '), ('ref', 'action')]), 0, None)])
+    table['line'] = ('alt', commands)
+    table['answer'] = ('alt', [('ref', 'line'), ('lit', NO_FIX)])
+    return table
+
+
+# --- GBNF ---------------------------------------------------------------------
+
+def _escape(char: str, in_class: bool) -> str:
+    specials = {'\n': '\\n', '\t': '\\t', '\\': '\\\\', '"': '\\"'}
+    if in_class:
+        specials.update({']': '\\]', '-': '\\-', '^': '\\^', '[': '\\['})
+    return specials.get(char, char)
+
+
+def _gbnf(node, nested: bool = False) -> str:
+    kind = node[0]
+    if kind == 'lit':
+        return '"' + "".join(_escape(c, False) for c in node[1]) + '"'
+    if kind == 'cls':
+        ranges = "".join(_escape(lo, True) if lo == hi else f"{_escape(lo, True)}-{_escape(hi, True)}"
+                         for lo, hi in node[2])
+        return f"[{'^' if node[1] else ''}{ranges}]"
+    if kind == 'ref':
+        return node[1]
+    if kind == 'seq':
+        text = " ".join(_gbnf(item, True) for item in node[1])
+        return f"({text})" if nested and len(node[1]) > 1 else text
+    if kind == 'alt':
+        text = " | ".join(_gbnf(item) for item in node[1])
+        return f"({text})" if nested and len(node[1]) > 1 else text
+    body, low, high = _gbnf(node[1], True), node[2], node[3]
+    if (low, high) == (0, 1):
+        return body + "?"
+    if high is None:
+        return " ".join([body] * (low - 1) + [body + ("*" if low == 0 else "+")]) if low > 1 else body + ("*" if low == 0 else "+")
+    optional = ""
+    for _ in range(high - low):
+        optional = f"({body} {optional})?" if optional else f"{body}?"
+    return " ".join([body] * low + ([optional] if optional else []))
+
+
+def _line_rules() -> str:
+    return "\n".join(f"{name} ::= {_gbnf(tree)}" for name, tree in rules().items())
+
+
+@lru_cache(maxsize=None)
+def command_gbnf(count: int = 1) -> str:
+    """
+    GBNF for the model's answer: one command line or NO_FIX, or for count > 1
+    the numbered reply brain_prompts.batch_prompt asks for ('1. answer' per line).
+    """
+    if count == 1:
+        root = "root ::= answer"
+    else:
+        root = "root ::= " + ' "\\n" '.join(f'"{n}. " answer' for n in range(1, count + 1))
+    return root + "\n" + _line_rules() + "\n"
+
+
+@lru_cache(maxsize=None)
+def llama_grammar(count: int = 1):
+    """command_gbnf as a llama_cpp.LlamaGrammar, or None when llama-cpp-python can't take one"""
+    try:
+        from llama_cpp import LlamaGrammar
+        return LlamaGrammar.from_string(command_gbnf(count), verbose=False)
+    except Exception:
+        return None
+
+
+# --- Offline derivation -------------------------------------------------------
+
+def _in_class(char: str, node) -> bool:
+    inside = any(lo <= char <= hi for lo, hi in node[2])
+    return inside != node[1]
+
+
+OPEN = -1  # _ends: the text ran out partway through a derivation
+
+
+def _ends(node, text: str, start: int, table, fold: bool = False) -> Set[int]:
+    """
+    Every position where a derivation of node starting at start can end, and
+    OPEN if one could continue past the end of text. With fold, literals match
+    case-insensitively, as the parser's IGNORECASE regexes do.
+    """
+    kind = node[0]
+    if kind == 'lit':
+        word, part = node[1], text[start:start + len(node[1])]
+        if fold:
+            word, part = word.lower(), part.lower()
+        if part == word:
+            return {start + len(word)}
+        return {OPEN} if start + len(part) == len(text) and word.startswith(part) else set()
+    if kind == 'cls':
+        if start == len(text):
+            return {OPEN}
+        return {start + 1} if _in_class(text[start], node) else set()
+    if kind == 'ref':
+        return _ends(table[node[1]], text, start, table, fold)
+    if kind == 'alt':
+        return set().union(*(_ends(item, text, start, table, fold) for item in node[1]))
+    if kind == 'seq':
+        positions = {start}
+        for item in node[1]:
+            positions = set().union(*(_ends(item, text, p, table, fold) if p != OPEN else {OPEN}
+                                      for p in positions)) if positions else set()
+        return positions
+    body, low, high = node[1], node[2], node[3]
+    found, frontier, count = {start} if low == 0 else set(), {start}, 0
+    while frontier and (high is None or count < high):
+        frontier = set().union(*(_ends(body, text, p, table, fold) for p in frontier)) - frontier
+        if OPEN in frontier:
+            found.add(OPEN)
+            frontier.discard(OPEN)
+        count += 1
+        if count >= low:
+            found |= frontier
+    return found
+
+
+def derives(line: str, rule: str = 'line') -> bool:
+    """The grammar can produce exactly this line"""
+    table = rules()
+    return len(line) in _ends(table[rule], line, 0, table)
+
+
+def prefix_state(text: str, rule: str = 'line') -> Tuple[bool, bool]:
+    """(text is a whole command, a longer command could start with it), reading case like the parser"""
+    table = rules()
+    ends = _ends(table[rule], text, 0, table, fold=True)
+    return len(text) in ends, OPEN in ends
+
+
+class CommandStream:
+    """
+    Follows a line as the model streams it and says where it can stop: once
+    the text is a command the grammar can't extend, or once it can't become one
+    any more, at the longest command it starts with. Text that never starts
+    like a command is left to run to the model's own stop.
+    """
+
+    def __init__(self):
+        self.complete = False    # the text so far is a whole command
+        self.complete_at = None  # length of the last whole command seen
+        self.given_up = False
+
+    def feed(self, text: str) -> Optional[int]:
+        """The length to cut the text at and stop generating, or None to go on"""
+        if self.given_up:
+            return None
+        self.complete, extendable = prefix_state(text)
+        if self.complete:
+            if not extendable:
+                return len(text)
+            self.complete_at = len(text)
+            return None
+        if extendable:
+            return None
+        if self.complete_at is None:
+            self.given_up = True
+            return None
+        # Went past a command: cut at the longest one within the last chunk
+        for end in range(len(text) - 1, self.complete_at, -1):
+            if prefix_state(text[:end])[0]:
+                return end
+        return self.complete_at
+
+
+def sample(rng: random.Random, rule: str = 'line') -> str:
+    """A random line the grammar derives; every one must parse"""
+    table = rules()
+    out: List[str] = []
+
+    def emit(node):
+        kind = node[0]
+        if kind == 'lit':
+            out.append(node[1])
+        elif kind == 'cls':
+            allowed = [c for c in _PRINTABLE if _in_class(c, node) and c not in '\'"']
+            out.append(rng.choice(allowed or [c for c in _PRINTABLE if _in_class(c, node)]))
+        elif kind == 'ref':
+            emit(table[node[1]])
+        elif kind == 'alt':
+            emit(rng.choice(node[1]))
+        elif kind == 'seq':
+            for item in node[1]:
+                emit(item)
+        else:
+            low, high = node[2], node[3]
+            for _ in range(rng.randint(low, max(low, 1) + 2 if high is None else high)):
+                emit(node[1])
+
+    emit(table[rule])
+    return "".join(out)
@@ -0,0 +1,110 @@
+"""
+Aura Brain IPC - Where the daemon listens and how requests travel
+One daemon per project (.aura_brain/) serves the CLI, the dev server and the
+VS Code extension. Requests and responses are JSON-RPC objects, one per line,
+matched by id, so a client can pipeline several before reading any answer.
+"""
+
+import hashlib
+import json
+import os
+import socket
+import tempfile
+from typing import Optional
+
+try:
+    from .setup import BRAIN_DIR
+except ImportError:
+    from setup import BRAIN_DIR
+
+SOCKET_NAME = "daemon.sock"
+PORT_FILE = "daemon.port"  # loopback TCP port where Unix sockets are unavailable (Windows)
+PID_FILE = "daemon.pid"    # written before the model loads, so a starting daemon is found too
+LOCK_FILE = "daemon.lock"  # held by the daemon while it serves; the OS releases it if the process dies
+UNIX_SOCKETS = hasattr(socket, 'AF_UNIX')
+MAX_SOCKET_PATH = 100  # sun_path holds 104-108 bytes depending on the platform
+MAX_MESSAGE = 16 * 1024 * 1024  # a correct_batch of a whole file is one line
+
+
+def socket_path(brain_dir: str = BRAIN_DIR) -> str:
+    """The project's socket; deep project paths fall back to one named after it in the temp dir"""
+    path = os.path.join(brain_dir, SOCKET_NAME)
+    if len(path.encode('utf-8')) <= MAX_SOCKET_PATH:
+        return path
+    digest = hashlib.sha1(os.path.abspath(brain_dir).encode('utf-8')).hexdigest()[:12]
+    return os.path.join(tempfile.gettempdir(), f"aura-brain-{digest}.sock")
+
+
+def connect(brain_dir: str = BRAIN_DIR, timeout: float = 1.0) -> socket.socket:
+    """A socket connected to the project's daemon; OSError when none is listening"""
+    if not UNIX_SOCKETS:
+        with open(os.path.join(brain_dir, PORT_FILE)) as f:
+            port = int(f.read().strip())
+        return socket.create_connection(('127.0.0.1', port), timeout=timeout)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(socket_path(brain_dir))
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def pid_alive(pid: int) -> bool:
+    if os.name == 'nt':
+        import ctypes
+        handle = ctypes.windll.kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        ctypes.windll.kernel32.CloseHandle(handle)
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def running_pid(brain_dir: str = BRAIN_DIR) -> Optional[int]:
+    """The pid of the project's daemon, if its pidfile names a live process"""
+    try:
+        with open(os.path.join(brain_dir, PID_FILE)) as f:
+            pid = int(f.read().strip())
+    except (OSError, ValueError):
+        return None
+    return pid if pid_alive(pid) else None
+
+
+def lock_daemon(brain_dir: str = BRAIN_DIR) -> Optional[int]:
+    """
+    Takes the project's daemon lock before anything is bound or written.
+    Returns the descriptor to keep open while serving, or None when another
+    daemon holds the lock.
+    """
+    fd = os.open(os.path.join(brain_dir, LOCK_FILE), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if os.name == 'nt':
+            import msvcrt
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def unlock_daemon(fd: int):
+    if os.name == 'nt':
+        import msvcrt
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    os.close(fd)
+
+
+def encode(message: dict) -> bytes:
+    return (json.dumps(message) + "\n").encode('utf-8')
@@ -0,0 +1,192 @@
+"""
+Aura Brain Prompts - Chat prompts for the correction model and reading its replies
+Shared by AuraBrain and the daemon, so both send the same system prompt (part
+of the correction cache key) and read batched replies the same way.
+"""
+
+import hashlib
+import re
+from functools import lru_cache
+from typing import Callable, List, Optional, Tuple
+
+try:
+    from .aura_parser import grammar
+    from .brain_grammar import NO_FIX, CommandStream, command_gbnf, llama_grammar
+except ImportError:
+    from aura_parser import grammar
+    from brain_grammar import NO_FIX, CommandStream, command_gbnf, llama_grammar
+
+SYSTEM_PROMPT = (
+    "Fix Aura syntax. Return ONLY corrected code.\n\n"
+    "RULES:\n"
+    "- Capitalize: Create, Use, When, Make, The\n"
+    "- Add missing: a, the, with\n"
+    "- Fix typos: crete→Create, butn→button, crteate→Create\n"
+    f"- Not Aura code at all: answer {NO_FIX}\n\n"
+    "PATTERNS:\n"
+    "Use the [dark/light] theme\n"
+    "Create a [button/heading/paragraph/input] with the text '[text]'\n"
+    "Create a card with the title '[title]' and description '[desc]'\n"
+    "Create a navbar with links [Home, About]\n"
+    "When clicked, [display/alert/show/hide] '[text]'\n"
+    "Make the [element] [color/bold/italic]\n\n"
+    "FIXES:\n"
+    "create→Create | crete→Create | butn→button\n"
+    "create is card→Create a card\n"
+    "with title→with the title\n"
+)
+BATCH_INSTRUCTIONS = "\nFix every numbered line. Answer with the same numbers, one corrected line each: 'N. line'\n"
+BATCH_LINES = 8  # lines per completion; keeps prompt and answers inside the model context
+
+_NUMBERED = re.compile(r"\s*(\d+)[.):]\s*(.*)")
+# The static start of every prompt, single-line and batched alike
+PREFIX = f"<|im_start|>system\n{SYSTEM_PROMPT}"
+
+
+class PromptPrefix:
+    """Model state after evaluating PREFIX once, restored before each completion"""
+
+    def __init__(self, model):
+        self.model = model
+        self.state = None
+        self.tokens = 0
+        try:
+            tokens = model.tokenize(PREFIX.encode('utf-8'), add_bos=True, special=True)
+            model.reset()
+            model.eval(tokens)
+            self.state = model.save_state()
+            self.tokens = len(tokens)
+        except Exception as e:  # backend without tokenize/eval/save_state
+            print(f"[Aura Brain] Prompt prefix caching unavailable ({e}), evaluating full prompts")
+
+    @property
+    def enabled(self) -> bool:
+        return self.state is not None
+
+    def restore(self) -> bool:
+        """Rewinds the model to just after PREFIX; the next prompt only evaluates its own tokens"""
+        if self.state is None:
+            return False
+        try:
+            self.model.load_state(self.state)
+            return True
+        except Exception as e:
+            print(f"[Aura Brain] Could not restore the cached prompt prefix ({e}), evaluating full prompts")
+            self.state = None
+            return False
+
+
+def line_prompt(line: str) -> str:
+    return f"{PREFIX}<|im_end|>\n<|im_start|>user\n{line}<|im_end|>\n<|im_start|>assistant\n"
+
+
+def batch_prompt(lines: List[str]) -> str:
+    numbered = "\n".join(f"{i}. {line}" for i, line in enumerate(lines, 1))
+    return (f"{PREFIX}{BATCH_INSTRUCTIONS}<|im_end|>\n"
+            f"<|im_start|>user\n{numbered}<|im_end|>\n<|im_start|>assistant\n")
+
+
+def parse_batch_reply(text: str, count: int) -> List[Optional[str]]:
+    """The answer for each numbered line; None where the model skipped a number"""
+    answers = [None] * count
+    for row in text.splitlines():
+        match = _NUMBERED.match(row)
+        if match and 1 <= int(match.group(1)) <= count and answers[int(match.group(1)) - 1] is None:
+            answers[int(match.group(1)) - 1] = match.group(2).strip()
+    return answers
+
+
+@lru_cache(maxsize=None)
+def decoding(constrain: bool, stream: bool) -> str:
+    """
+    The decoding mode for the correction cache key: free-form or the version
+    of the command grammar, and whether streaming cut the answers short
+    """
+    mode = "free"
+    if constrain:
+        mode = "grammar-" + hashlib.sha1(command_gbnf(1).encode('utf-8')).hexdigest()[:12]
+    return mode + ("+stream" if stream else "")
+
+
+# on_partial(index of the line, its answer so far, whether that is a whole command)
+PartialCallback = Callable[[int, str, bool], None]
+
+
+def complete(model, lines: List[str], max_tokens: int, prefix: Optional[PromptPrefix] = None,
+             constrain: bool = False, stream: bool = False, on_partial: Optional[PartialCallback] = None,
+             usage: Optional[dict] = None, **sampling) -> List[Optional[str]]:
+    """
+    One completion for up to BATCH_LINES lines: the plain prompt for one, numbered
+    for more. With a prefix, the model resumes from the cached PREFIX state and the
+    backend's prompt-prefix matching skips re-evaluating it. With constrain, the
+    command grammar (brain_grammar) limits sampling to lines the parser accepts.
+    With stream, answers are read as they are generated, reported to on_partial,
+    and generation stops once the last line is a whole command. usage collects
+    completion_tokens.
+    """
+    if prefix is not None:
+        prefix.restore()
+    if constrain:
+        constraint = llama_grammar(len(lines))
+        if constraint is not None:
+            sampling['grammar'] = constraint
+    if len(lines) == 1:
+        prompt, budget, stop = line_prompt(lines[0]), max_tokens, ["<|im_end|>", "\n"]
+    else:
+        prompt, budget, stop = batch_prompt(lines), max_tokens * len(lines), ["<|im_end|>"]
+    if stream:
+        chunks = model(prompt, max_tokens=budget, stop=stop, echo=False, stream=True, **sampling)
+        text, tokens = read_stream(chunks, len(lines), on_partial)
+    else:
+        output = model(prompt, max_tokens=budget, stop=stop, echo=False, **sampling)
+        text, tokens = output['choices'][0]['text'], (output.get('usage') or {}).get('completion_tokens', 0)
+    if usage is not None:
+        usage['completion_tokens'] = usage.get('completion_tokens', 0) + tokens
+    if len(lines) == 1:
+        return [text.strip()]
+    return parse_batch_reply(text, len(lines))
+
+
+def read_stream(chunks, count: int, on_partial: Optional[PartialCallback] = None) -> Tuple[str, int]:
+    """
+    The text of a streamed completion of count lines and the tokens read (one
+    per chunk). Stops generating as soon as the last line is a command nothing
+    more could be added to, or has run past one; the text ends with that command.
+    """
+    text, tokens = "", 0
+    watch, row, shown = CommandStream(), 0, None
+    try:
+        for chunk in chunks:
+            tokens += 1
+            text += chunk['choices'][0]['text']
+            if count == 1:
+                index, answer = 0, text.lstrip()
+            else:
+                match = _NUMBERED.match(text.rsplit("\n", 1)[-1])
+                if not match or not 1 <= int(match.group(1)) <= count:
+                    continue
+                index, answer = int(match.group(1)) - 1, match.group(2)
+                if index != row:
+                    watch, row = CommandStream(), index
+            end = watch.feed(answer)
+            done = end is not None and index == count - 1
+            if done:
+                text = text[:len(text) - len(answer) + end]
+                answer = answer[:end]
+            if on_partial is not None and (index, answer.strip()) != shown:
+                shown = (index, answer.strip())
+                on_partial(index, answer.strip(), done or watch.complete)
+            if done:
+                break
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close:
+            close()  # stops llama.cpp generating the rest
+    return text, tokens
+
+
+def validated(corrected: Optional[str]) -> Optional[str]:
+    """The model's answer if the grammar accepts it; NO_FIX, empty, garbage or unparseable output is no fix"""
+    if corrected is None or corrected == NO_FIX or len(corrected) < 3 or not grammar().match_line(corrected):
+        return None
+    return corrected
@@ -3,6 +3,7 @@ Aura CLI - Command Line Interface
 The global entry point for all Aura commands
 """
 
+import math
 import sys
 from pathlib import Path
 
@@ -41,7 +42,17 @@ COMMANDS:
   🌐 UI Development:
     init              Initialize a new Aura UI project
     dev               Start hot-reload development server
+      --in-memory         Serve generated modules to Vite from memory (virtual:aura/*)
     build <file>      Build project for production
+      --group-chunks      Bundle pages sharing a layout into one chunk
+      --prerender         Render each page's initial state to static HTML
+      --prefetch=<mode>   Route prefetching: hover (default), idle, none
+      --report-dce        Show bytes removed by dead-code elimination
+      --analyze           Report JSX size/composition per page, diffed vs last build
+      --no-memo           Skip static hoisting and useMemo/useCallback wrapping
+      --fetch-ttl=<sec>   Serve 'fetch from' data this long before revalidating (60)
+      --css=<mode>        Utility CSS: manifest (default), precompute, scan
+      --no-image-opt      Keep local images as-is (no AVIF/WebP variants)
   
   🧠 Core Logic (NEW):
     run <file>        Execute Aura logic file
@@ -100,10 +111,12 @@ def main():
 
     # Handle dev command
     if command == 'dev':
+        dev_args = [arg for arg in sys.argv[2:] if not arg.startswith('--')]
+        in_memory = '--in-memory' in sys.argv[2:]
         # Check if argument is a .aura logic file
-        if len(sys.argv) >= 3 and sys.argv[2].endswith('.aura'):
+        if dev_args and dev_args[0].endswith('.aura') and not in_memory:
             # Logic Watch Mode
-            filepath = sys.argv[2]
+            filepath = dev_args[0]
             if not Path(filepath).exists():
                 print(f"❌ Error: File not found: {filepath}")
                 sys.exit(1)
@@ -160,7 +173,7 @@ def main():
         # UI Dev Server (existing behavior)
         from transpiler.dev_server import AuraDevServer
 
-        target = sys.argv[2] if len(sys.argv) > 2 else "."
+        target = dev_args[0] if dev_args else "."
         target_path = Path(target).resolve()
 
         watch_dir = target_path
@@ -174,7 +187,7 @@ def main():
         if pages_dir.exists() and not initial_file:
             watch_dir = pages_dir
 
-        dev_server = AuraDevServer(watch_dir, initial_file=initial_file)
+        dev_server = AuraDevServer(watch_dir, initial_file=initial_file, in_memory=in_memory)
 
         dev_server.start()
         sys.exit(0)
@@ -380,11 +393,19 @@ def main():
 
     # Handle build command
     if command == 'build':
+        build_args = [arg for arg in sys.argv[2:] if not arg.startswith('--')]
+        try:
+            build_options = _build_options(sys.argv[2:])
+        except ValueError as e:
+            print(f"❌ Error: {e}")
+            print("Usage: aura build [file.aura] [options] (see 'aura --help')")
+            sys.exit(1)
+
         # Case 1: Build specific file
-        if len(sys.argv) >= 3:
+        if build_args:
             from transpiler.transpiler import AuraTranspiler
-            transpiler = AuraTranspiler()
-            transpiler.build(sys.argv[2])
+            transpiler = AuraTranspiler(**build_options)
+            transpiler.build(build_args[0])
             sys.exit(0)
 
         # Case 2: Build project (auto-detect)
@@ -418,7 +439,7 @@ def main():
             initializer._init_engine()
 
         from transpiler.transpiler import AuraTranspiler
-        transpiler = AuraTranspiler()
+        transpiler = AuraTranspiler(**build_options)
 
         # Building any file triggers the project scanner
         # But let's be explicit and ensure the first file triggers the process
@@ -458,6 +479,52 @@ def main():
     sys.exit(1)
 
 
+PREFETCH_MODES = ('hover', 'idle', 'none')
+CSS_MODES = ('manifest', 'precompute', 'scan')
+
+
+def _build_options(args) -> dict:
+    """Translate 'aura build' flags into AuraTranspiler options; ValueError for a bad value"""
+    options = {}
+    for arg in args:
+        if arg == '--report-dce':
+            options['report_dce'] = True
+        elif arg == '--analyze':
+            options['analyze'] = True
+        elif arg == '--group-chunks':
+            options['group_layout_chunks'] = True
+        elif arg == '--no-code-split':
+            options['code_split'] = False
+        elif arg == '--no-memo':
+            options['memoize'] = False
+        elif arg == '--prerender':
+            options['prerender'] = True
+        elif arg == '--no-image-opt':
+            options['optimize_images'] = False
+        elif arg.startswith('--css='):
+            mode = arg.split('=', 1)[1].lower()
+            if mode not in CSS_MODES:
+                raise ValueError(f"--css must be one of {', '.join(CSS_MODES)} (got '{mode}')")
+            options['css_mode'] = mode
+        elif arg.startswith('--fetch-ttl='):
+            value = arg.split('=', 1)[1]
+            try:
+                ttl = float(value)
+            except ValueError:
+                ttl = -1
+            if not math.isfinite(ttl) or ttl < 0:
+                raise ValueError(f"--fetch-ttl needs a number of seconds, 0 or more (got '{value}')")
+            options['fetch_ttl'] = ttl
+        elif arg.startswith('--prefetch='):
+            mode = arg.split('=', 1)[1].lower()
+            if mode not in PREFETCH_MODES:
+                raise ValueError(f"--prefetch must be one of {', '.join(PREFETCH_MODES)} (got '{mode}')")
+            options['prefetch'] = None if mode == 'none' else mode
+        elif arg.startswith('--'):
+            raise ValueError(f"Unknown build option: {arg}")
+    return options
+
+
 def _is_logic_file(filepath: str) -> bool:
     """Detect if a .aura file contains logic or UI commands"""
     logic_keywords = ['set ', 'if ', 'print ',
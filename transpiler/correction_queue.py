@@ -0,0 +1,107 @@
+"""
+Aura Correction Queue - Aura Brain corrections off the dev server's build path
+Builds skip lines only the model could fix and hand them here. A background
+thread asks the brain, writes each validated fix into the source file if that
+line is still as it was, and reports the file so the dev server can rebuild.
+Save-to-preview latency no longer waits on the model.
+"""
+
+import os
+import queue
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class CorrectionQueue:
+    """Background Aura Brain corrections that patch source files as they arrive"""
+
+    def __init__(self, on_patched: Callable[[str], None], brain=None):
+        self.on_patched = on_patched
+        self.brain = brain  # AuraBrain on first use
+        self._jobs = queue.Queue()
+        self._queued = set()  # (filepath, line) waiting or being corrected
+        self._written = {}    # { filepath: mtime_ns of our last patch }
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="aura-brain-corrections", daemon=True)
+        self._thread.start()
+
+    def submit(self, filepath: str, broken: Dict[int, str]):
+        """Queues a build's unrecognized lines (AuraParser.correct_later); lines already queued are skipped"""
+        filepath = os.path.abspath(filepath)
+        with self._lock:
+            fresh = {line_num: line for line_num, line in broken.items() if (filepath, line) not in self._queued}
+            self._queued.update((filepath, line) for line in fresh.values())
+        if fresh:
+            self._jobs.put((filepath, fresh))
+
+    def wrote(self, filepath: str) -> bool:
+        """The file is exactly as our last patch left it, so its change event is ours"""
+        filepath = os.path.abspath(filepath)
+        try:
+            return self._written.get(filepath) == os.stat(filepath).st_mtime_ns
+        except OSError:
+            return False
+
+    def stop(self):
+        self._jobs.put(None)
+        self._thread.join(timeout=5)
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            filepath, broken = job
+            try:
+                fixes = self._brain().correct_batch(list(broken.values()))
+            except Exception as e:
+                print(f"  [Aura Brain] Background correction failed: {e}")
+                fixes = [None] * len(broken)
+            patches = [(line_num, line, fix) for (line_num, line), fix in zip(broken.items(), fixes)
+                       if fix and fix != line]
+            try:
+                patched = self._patch(filepath, patches) if patches else 0
+            except OSError as e:
+                print(f"  [Error] Could not update source file: {e}")
+                patched = 0
+            with self._lock:
+                self._queued.difference_update((filepath, line) for line in broken.values())
+            if patched:
+                self.on_patched(filepath)
+
+    def _brain(self):
+        if self.brain is None:
+            try:
+                from .brain import AuraBrain
+            except ImportError:
+                from brain import AuraBrain
+            self.brain = AuraBrain()
+        return self.brain
+
+    def _patch(self, filepath: str, patches: List[Tuple[int, str, str]]) -> int:
+        """Writes each fix over its line if the line is unchanged (or moved, but unique); returns how many"""
+        with open(filepath, 'r', encoding='utf-8', newline='') as f:
+            lines = f.readlines()
+        patched = 0
+        for line_num, original, fix in patches:
+            index = self._find(lines, line_num - 1, original)
+            if index is None:
+                continue  # edited since the build; the next build will queue it again
+            text = lines[index]
+            indent = text[:len(text) - len(text.lstrip())]
+            ending = text[len(text.rstrip('\r\n')):]
+            lines[index] = indent + fix + ending
+            print(f"  [Aura Brain] Auto-corrected: '{original}' -> '{fix}'")
+            patched += 1
+        if patched:
+            with open(filepath, 'w', encoding='utf-8', newline='') as f:
+                f.writelines(lines)
+            self._written[filepath] = os.stat(filepath).st_mtime_ns
+        return patched
+
+    @staticmethod
+    def _find(lines: List[str], index: int, original: str) -> Optional[int]:
+        if 0 <= index < len(lines) and lines[index].strip() == original:
+            return index
+        matches = [i for i, text in enumerate(lines) if text.strip() == original]
+        return matches[0] if len(matches) == 1 else None
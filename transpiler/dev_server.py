@@ -6,6 +6,7 @@ Watches all .aura files and automatically transpiles on changes
 import os
 import sys
 import time
+import threading
 import subprocess
 from pathlib import Path
 from watchdog.observers import Observer
@@ -13,21 +14,32 @@ from watchdog.events import FileSystemEventHandler
 
 try:
     from .transpiler import AuraTranspiler
+    from .module_server import ModuleServer
+    from .correction_queue import CorrectionQueue
 except ImportError:
     from transpiler import AuraTranspiler
+    from module_server import ModuleServer
+    from correction_queue import CorrectionQueue
 
 
 class AuraDevServer(FileSystemEventHandler):
     """Watches .aura files and triggers hot reload"""
 
-    def __init__(self, watch_dir: Path, initial_file: str = None):
+    def __init__(self, watch_dir: Path, initial_file: str = None, in_memory: bool = False):
         self.watch_dir = watch_dir
         self.root_dir = Path.cwd()
         self.initial_file = initial_file
-        self.transpiler = AuraTranspiler()
+        # Serve generated modules to Vite from memory instead of .aura_engine/src
+        self.module_server = ModuleServer().start() if in_memory else None
+        self.transpiler = AuraTranspiler(
+            module_server_url=self.module_server.url if self.module_server else None)
         self.vite_process = None
         self.last_build_time = 0
         self.debounce_delay = 0.5  # 500ms debounce
+        self._build_lock = threading.Lock()  # watcher and corrections both rebuild
+        # Lines only the model can fix are corrected in the background, never during a build
+        self.corrections = CorrectionQueue(self._on_corrected)
+        self.transpiler.parser.correct_later = self.corrections.submit
 
         print("\n" + "="*60)
         print("  🚀 AURA DEV SERVER")
@@ -35,6 +47,8 @@ class AuraDevServer(FileSystemEventHandler):
         print(f"  Watching: {watch_dir}")
         if initial_file:
             print(f"  Target: {Path(initial_file).name}")
+        if self.module_server:
+            print(f"  Modules: in memory ({self.module_server.url})")
         print("  Press Ctrl+C to stop")
         print("="*60 + "\n")
 
@@ -60,7 +74,10 @@ class AuraDevServer(FileSystemEventHandler):
         except KeyboardInterrupt:
             print("\n\n[Aura Dev] Shutting down...")
             observer.stop()
+            self.corrections.stop()
             self._stop_vite()
+            if self.module_server:
+                self.module_server.stop()
 
         observer.join()
 
@@ -86,6 +103,10 @@ class AuraDevServer(FileSystemEventHandler):
         if self.initial_file and Path(event.src_path).resolve() != Path(self.initial_file).resolve():
             return
 
+        # Our own correction patch; _on_corrected already rebuilt
+        if self.corrections.wrote(event.src_path):
+            return
+
         # Debounce rapid saves
         current_time = time.time()
         if current_time - self.last_build_time < self.debounce_delay:
@@ -101,11 +122,16 @@ class AuraDevServer(FileSystemEventHandler):
         if self.initial_file:
             print(
                 f"[BUILD] Transpiling target: {Path(self.initial_file).name}")
-            try:
-                self.transpiler.build(self.initial_file)
-                print("✓ Build complete")
-            except Exception as e:
-                print(f"✗ Build failed: {e}")
+            # Corrections queued by this build rebuild once it has published
+            with self._build_lock:
+                try:
+                    if self.transpiler.build(self.initial_file):
+                        self._publish()
+                        print("✓ Build complete")
+                    else:
+                        print("✗ Build failed")
+                except Exception as e:
+                    print(f"✗ Build failed: {e}")
             return
 
         print("[BUILD] Scanning for .aura files...")
@@ -122,14 +148,33 @@ class AuraDevServer(FileSystemEventHandler):
 
     def _rebuild_project(self):
         """Rebuild the targeted project"""
-        print("  [REBUILD] Transpiling...")
-        try:
-            target = self.initial_file if self.initial_file else str(
-                list(self.watch_dir.glob('*.aura'))[0])
-            self.transpiler.build(target)
-            print("  ✓ Hot reload triggered")
-        except Exception as e:
-            print(f"  ✗ Error: {e}")
+        with self._build_lock:
+            print("  [REBUILD] Transpiling...")
+            try:
+                target = self.initial_file if self.initial_file else str(
+                    list(self.watch_dir.glob('*.aura'))[0])
+                if not self.transpiler.build(target):
+                    # The previous modules keep serving until a build succeeds
+                    print("  ✗ Build failed, keeping the last good build")
+                    return
+                changed = self._publish()
+                if changed is not None:
+                    print(f"  ✓ Pushed {len(changed)} changed module(s) to Vite")
+                else:
+                    print("  ✓ Hot reload triggered")
+            except Exception as e:
+                print(f"  ✗ Error: {e}")
+
+    def _on_corrected(self, filepath: str):
+        """A background correction patched a source file"""
+        print(f"\n[AURA BRAIN] Patched {Path(filepath).name}")
+        self._rebuild_project()
+
+    def _publish(self):
+        """Hands the build's modules to the module server; returns the changed paths"""
+        if not self.module_server:
+            return None
+        return self.module_server.publish(self.transpiler.modules)
 
     def _start_vite(self):
         """Start the Vite dev server"""
@@ -14,6 +14,14 @@ except ImportError:
     )
 
 import json
+from typing import Any, List
+
+try:
+    from .source_map import JSXWriter, build_source_map
+    from .aura_parser import parse_action_sequence
+except ImportError:
+    from source_map import JSXWriter, build_source_map
+    from aura_parser import parse_action_sequence
 
 
 class HTMLGenerator:
@@ -22,17 +30,43 @@ class HTMLGenerator:
     Now supports Multi-Page components, Rich Text, and Links.
     """
 
-    def __init__(self, component_name="App", params=None, shared_states=None):
+    # Repeaters with more items than this are windowed at runtime (None disables)
+    VIRTUALIZE_THRESHOLD = 200
+
+    REACT_IMPORT = "import React, { useState, useEffect, useRef } from 'react';"
+    MOTION_IMPORT = "import { motion } from 'framer-motion';"
+    ROUTER_IMPORT = "import { useNavigate, Link, useParams } from 'react-router-dom';"
+
+    def __init__(self, component_name="App", params=None, shared_states=None, prefetch=None,
+                 virtualize_threshold=VIRTUALIZE_THRESHOLD, eliminate_dead_code=True, memoize=True,
+                 image_pipeline=None, source_dir=None):
         self.component_name = component_name
         self.params = params or []
         self.shared_states = shared_states or {}
+        self.prefetch = prefetch  # 'hover', 'idle' or None (see routes.js)
+        self.virtualize_threshold = virtualize_threshold
+        # Drop unused refs, states, helpers and imports from the output
+        self.eliminate_dead_code = eliminate_dead_code
+        self._live_refs = None  # None: every ref is emitted
+        # Hoist static subtrees, useMemo derived bindings, useCallback handlers
+        self.memoize = memoize
+        self._static_sizes = {}  # { 'elementId': subtree size } for binding-free subtrees
+        self._hoisted = None     # JSXWriter collecting module-level constants
+        self._memos = {}         # { 'expression': 'derivedN' }
+        self._callbacks = {}     # { 'handleEventElN': 'code' }
+        self._scope = set()      # component-level names bindings may depend on
+        self._static_blocks = 0
+        self._repeater_depth = 0
+        self._hoisting = False
+        # Local images get resized variants and dimensions (see image_pipeline.py)
+        self.image_pipeline = image_pipeline
+        self.source_dir = source_dir
         # React State
         self.imports = set([
-            "import React, { useState, useEffect, useRef } from 'react';",
-            "import { motion } from 'framer-motion';",
+            self.REACT_IMPORT,
+            self.MOTION_IMPORT,
             # Added for routing and links
-            "import { useNavigate, Link, useParams } from 'react-router-dom';",
-            "import { useGlobalState } from '../context/GlobalContext';",
+            self.ROUTER_IMPORT,
         ])
 
         # Internal tracking
@@ -41,9 +75,12 @@ class HTMLGenerator:
         self.handlers = {}   # { 'elementId': { 'event': 'code' } }
         self.refs = {}       # { 'elementId': 'refName' }
         self.effects = []    # List of useEffect code blocks
+        self.cleanups = []   # Statements run when the mount effect is torn down
 
         self.element_counter = 0
         self.last_element_id = None
+        self.source_mappings = []  # (jsx_line, jsx_column, aura_line), 0-based
+        self.wrapper_classes = []  # classes of the wrapper divs around the body, outermost first
         self.theme = 'dark'  # Default theme
         self.layout_name = None  # For page uses layout
 
@@ -57,6 +94,7 @@ class HTMLGenerator:
         else:
             for cmd in commands:
                 self._process_command(cmd)
+        self._add_loading_props(self.elements)
         return self._build_jsx()
 
     def _process_command(self, cmd):
@@ -87,9 +125,12 @@ class HTMLGenerator:
 
             if isinstance(val, FetchNode):
                 self.states[state_name] = "[]"
-                # Add fetch effect
+                # Add fetch effect (deduped and cached across pages, see fetchCache.js)
+                self.imports.add("import { subscribeFetch } from '../fetchCache';")
+                stop = f"stop{node.name.capitalize()}"
                 self.effects.append(
-                    f"fetch('{val.source}').then(r => r.json()).then(data => set{node.name.capitalize()}(data));")
+                    f"const {stop} = subscribeFetch('{val.source}', set{node.name.capitalize()});")
+                self.cleanups.append(f"{stop}();")
             elif isinstance(val, list):
                 # Array literal
                 self.states[state_name] = json.dumps(val)
@@ -114,14 +155,14 @@ class HTMLGenerator:
 
         elif isinstance(node, (ColumnNode, RowNode)):
             # Create a container element for Column/Row
-            container = self._create_base_element('div')
+            container = self._create_base_element('div', node.line_number)
             container['props']['className'] = "flex flex-col gap-4" if isinstance(
                 node, ColumnNode) else "flex flex-row gap-4"
             parent_list.append(container)
             for child in node.children:
                 self._handle_ast_node(child, container['children'], in_sidebar)
 
-    def _create_base_element(self, tag_type):
+    def _create_base_element(self, tag_type, source_line=None):
         self.element_counter += 1
         el_id = f"el_{self.element_counter}"
         self.last_element_id = el_id
@@ -136,7 +177,8 @@ class HTMLGenerator:
                 'ref': ref_name
             },
             'children': [],
-            'text_content': None
+            'text_content': None,
+            'line': source_line
         }
 
     def _handle_ui_node(self, node, parent_list, in_sidebar=False):
@@ -154,7 +196,7 @@ class HTMLGenerator:
         elif isinstance(node, SlotNode):
             tag = 'SLOT'
 
-        element = self._create_base_element(tag)
+        element = self._create_base_element(tag, node.line_number)
         parent_list.append(element)
 
         if isinstance(node, ButtonNode):
@@ -169,6 +211,8 @@ class HTMLGenerator:
             if node.on_click:
                 self.handlers[element['id']] = {
                     'onClick': self._generate_handler_code(node.on_click)}
+                self._add_prefetch(element['id'], [
+                    f"/{stmt.target_page.lower()}" for stmt in node.on_click if isinstance(stmt, NavigationNode)])
 
         elif isinstance(node, TextNode):
             if node.is_binding:
@@ -197,9 +241,9 @@ class HTMLGenerator:
             element['text_content'] = "📊 Data Table Placeholder"
 
         elif isinstance(node, GridNode):
-            element['props']['className'] = "grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-8 w-full py-6"
-            element['repeater'] = {
-                'data': node.items_expr, 'item_name': 'item'}
+            columns = node.columns or 3
+            element['props']['className'] = f"grid grid-cols-1 md:grid-cols-2 lg:grid-cols-{columns} gap-8 w-full py-6"
+            element['repeater'] = self._repeater(node, columns, 'gap-8')
             for child in node.children:
                 self._handle_ast_node(child, element['children'], in_sidebar)
 
@@ -207,7 +251,7 @@ class HTMLGenerator:
             if node.block_type == 'sidebar':
                 element['props']['className'] = "w-72 h-screen sticky top-0 bg-gray-50 dark:bg-gray-900 border-r border-gray-200 dark:border-gray-800 p-8 hidden md:flex flex-col gap-2"
                 # Add a logo placeholder to the sidebar
-                logo = self._create_base_element('div')
+                logo = self._create_base_element('div', node.line_number)
                 logo['props']['className'] = "text-2xl font-black mb-10 bg-gradient-to-r from-blue-600 to-indigo-600 bg-clip-text text-transparent uppercase tracking-tighter"
                 logo['text_content'] = "AURA CORE"
                 element['children'].append(logo)
@@ -249,17 +293,17 @@ class HTMLGenerator:
                 element['props']['src'] = f"{{{src}}}"
             element['props']['className'] = "w-full h-48 object-cover rounded-xl mb-4"
             element['props']['alt'] = "Shop Item"
+            self._optimize_image(element)
 
         elif isinstance(node, ListNode):
             element['props']['className'] = "flex flex-col gap-4 w-full"
-            element['repeater'] = {
-                'data': node.items_expr, 'item_name': 'item'}
+            element['repeater'] = self._repeater(node, 1, 'gap-4')
             for child in node.children:
                 self._handle_ast_node(child, element['children'], in_sidebar)
 
         elif isinstance(node, PanelNode):
             element['props']['className'] = "p-8 rounded-2xl bg-gray-50 dark:bg-gray-900/50 border border-gray-200 dark:border-gray-800"
-            title = self._create_base_element('h3')
+            title = self._create_base_element('h3', node.line_number)
             title['props']['className'] = "text-xl font-bold mb-4"
             title['text_content'] = node.title
             element['children'].append(title)
@@ -281,6 +325,68 @@ class HTMLGenerator:
             if node.color:
                 element['props']['style'] = f"{{{{ color: '{node.color}' }}}}"
 
+    def _repeater(self, node, columns, gap):
+        """Repeater settings for a list/grid: 'products from inventory' iterates inventory"""
+        import re
+        data = re.split(r"\s+from\s+", node.items_expr,
+                        flags=re.IGNORECASE)[-1].strip()
+        return {
+            'data': data,
+            'item_name': 'item',
+            'columns': columns,
+            'gap': gap,
+            'virtual': node.virtual,
+            'row_height': node.row_height,
+        }
+
+    # Images after this many (in document order, outside repeaters) load lazily
+    ABOVE_FOLD_IMAGES = 1
+
+    def _optimize_image(self, element):
+        """Swaps a local image src for processed variants with intrinsic dimensions"""
+        src = element['props'].get('src', '')
+        if not self.image_pipeline or src.startswith('{'):
+            return
+        image = self.image_pipeline.process(src, self.source_dir or '.')
+        if not image:
+            return
+        element['image'] = image
+        element['props']['src'] = image['src']
+        if image.get('width'):
+            element['props']['width'] = str(image['width'])
+            element['props']['height'] = str(image['height'])
+
+    def _add_loading_props(self, elements, in_repeater=False, seen=0):
+        """
+        loading/decoding hints on every <img>, in document order. They live in the
+        element tree, so the JSX and the prerendered HTML carry the same attributes.
+        Returns the number of images seen so far.
+        """
+        for el in elements:
+            if not isinstance(el, dict) or 'id' not in el:
+                continue
+            if el['type'] == 'img':
+                seen += 1
+                el['props']['decoding'] = 'async'
+                if in_repeater or seen > self.ABOVE_FOLD_IMAGES:
+                    el['props']['loading'] = 'lazy'
+            seen = self._add_loading_props(el.get('children', []), in_repeater or bool(el.get('repeater')), seen)
+        return seen
+
+    def _add_prefetch(self, el_id, paths):
+        """Warms the lazy route chunks of navigation targets (hover or idle)"""
+        if not self.prefetch or not paths:
+            return
+        self.imports.add("import { prefetchRoute } from '../routes';")
+        if self.prefetch == 'idle':
+            for path in paths:
+                self.effects.append(
+                    f"(window.requestIdleCallback || setTimeout)(() => prefetchRoute('{path}'));")
+        else:
+            calls = " ".join(f"prefetchRoute('{path}');" for path in paths)
+            self.handlers.setdefault(el_id, {})[
+                'onMouseEnter'] = f"() => {{ {calls} }}"
+
     def _generate_handler_code(self, statements: List[ASTNode]) -> str:
         body_lines = []
         is_async = False
@@ -334,7 +440,8 @@ class HTMLGenerator:
                 'ref': ref_name
             },
             'children': [],
-            'text_content': None
+            'text_content': None,
+            'line': cmd.line_number
         }
 
         # Tailwind Types
@@ -375,6 +482,7 @@ class HTMLGenerator:
             element['props']['src'] = cmd.data['url']
             element['props']['alt'] = cmd.data.get('alt', 'Image')
             element['props']['className'] = "rounded-xl shadow-lg max-w-full h-auto hover:scale-[1.02] transition-transform duration-300"
+            self._optimize_image(element)
 
         # NEW: Links
         elif cmd.command_type == 'ui_link_page':
@@ -385,6 +493,7 @@ class HTMLGenerator:
                 ' ', '').replace('_', '').replace('-', '')
             element['props']['to'] = f"/{page.lower()}"
             element['props']['className'] = "text-blue-600 dark:text-blue-400 font-medium hover:underline transition-colors cursor-pointer inline-flex items-center gap-1"
+            self._add_prefetch(el_id, [f"/{page.lower()}"])
 
         elif cmd.command_type == 'ui_link_url':
             element['type'] = 'a'
@@ -403,17 +512,7 @@ class HTMLGenerator:
         event = cmd.data['event'].lower()
         react_event = 'onClick' if 'click' in event else 'onChange' if 'change' in event else 'onMouseEnter'
 
-        try:
-            from .aura_parser import AuraParser
-        except ImportError:
-            try:
-                from aura_parser import AuraParser
-            except ImportError:
-                # Fallback for when running as script vs module
-                from transpiler.aura_parser import AuraParser
-
-        parser = AuraParser()
-        parsed = parser.parse_action_sequence(cmd.data['actions'])
+        parsed = parse_action_sequence(cmd.data['actions'])
 
         body_lines = []
         is_async = False
@@ -524,54 +623,151 @@ class HTMLGenerator:
         if cmd.command_type == 'visibility_hide':
             self.effects.append(f"{ref}.current.style.display = 'none';")
 
+    def _dynamic_code(self):
+        """Collects every JS expression the component evaluates: bindings, handlers, effects"""
+        fragments = list(self.effects)
+        for events in self.handlers.values():
+            fragments.extend(events.values())
+        stack = list(self.elements)
+        while stack:
+            el = stack.pop()
+            if not isinstance(el, dict):
+                continue
+            text = el.get('text_content')
+            if isinstance(text, str) and text.startswith('{'):
+                fragments.append(text)
+            for value in el.get('props', {}).values():
+                if isinstance(value, str) and value.startswith('{'):
+                    fragments.append(value)
+            if el.get('repeater'):
+                fragments.append(el['repeater']['data'])
+            stack.extend(el.get('children', []))
+        return "\n".join(fragments)
+
+    def _build_shared_state_hooks(self, code):
+        """Subscribes to the global keys this component reads and pulls only the setters it calls"""
+        import re
+        reads = []
+        writes = []
+        for name in self.shared_states:
+            if name.lower() in self.states:
+                continue  # shadowed by a page-level state
+            setter = f"set{name.capitalize()}"
+            if re.search(rf"(?<![\w.]){re.escape(name)}\b", code):
+                reads.append(name)
+            if re.search(rf"\b{setter}\(", code):
+                writes.append(setter)
+        if not reads and not writes:
+            return ""
+
+        names = (["useGlobalValue"] if reads else []) + \
+            (["globalSetters"] if writes else [])
+        self.imports.add(
+            f"import {{ {', '.join(names)} }} from '../context/GlobalContext';")
+        lines = [f"    const {name} = useGlobalValue('{name}');" for name in reads]
+        if writes:
+            lines.append(f"    const {{ {', '.join(writes)} }} = globalSetters;")
+        return "\n".join(lines)
+
+    # Component-level helpers, emitted only when referenced (see _build_jsx)
+    NAVIGATE_HELPER = "    const navigate = useNavigate();"
+    SUM_HELPER = "    const sum = (arr) => arr ? arr.reduce((acc, curr) => acc + (parseFloat(curr.price) || parseFloat(curr) || 0), 0) : 0;"
+
     def _build_jsx(self):
-        imports_str = "\n".join(sorted(list(self.imports)))
+        import re
+        prune = self.eliminate_dead_code
+        code = self._dynamic_code()
+
+        # 🧹 Usage analysis: only refs touched by handlers/effects stay attached
+        used_refs = set(re.findall(r"\bel_\d+_ref\b", code))
+        self._live_refs = used_refs if prune else None
+
+        # 🧊 Memoization analysis: static subtrees, derived bindings, handlers
+        self._memos = {}
+        self._callbacks = {}
+        self._static_sizes = {}
+        self._static_blocks = 0
+        self._repeater_depth = 0
+        self._hoisted = JSXWriter() if self.memoize else None
+        if self.memoize:
+            self._scope = set(self.states) | set(self.shared_states) | set(self.params)
+            # The same subtrees with or without pruning, so dead_code_savings measures pruning alone
+            self._collect_static(self.elements, used_refs)
+
+        body_writer = JSXWriter()
+        self._emit_elements(body_writer, self.elements, indent=2)
+        render_str = body_writer.getvalue()
+        hoisted_str = self._hoisted.getvalue() if self._hoisted else ""
+        shared_state_str = self._build_shared_state_hooks(code)
         states_str = ""
         for name, initial in self.states.items():
             setter = f"set{name.replace('_', ' ').title().replace(' ', '')}"
+            if prune and not re.search(rf"(?<![\w.])({re.escape(name)}|{setter})\b", code):
+                continue
             states_str += f"    const [{name}, {setter}] = useState({initial});\n"
+        memos_str = ""
+        for expr, name in self._memos.items():
+            deps = ", ".join(sorted(self._free_names(expr) & self._scope))
+            memos_str += f"    const {name} = useMemo(() => {expr}, [{deps}]);\n"
         refs_str = ""
         for ref in self.refs.values():
+            if prune and ref not in self._live_refs:
+                continue
             refs_str += f"    const {ref} = useRef(null);\n"
+        callbacks_str = ""
+        for name, handler in self._callbacks.items():
+            deps = ", ".join(sorted(self._free_names(handler) & (self._scope | {'navigate'})))
+            callbacks_str += f"    const {name} = useCallback({handler}, [{deps}]);\n"
+        effects = list(dict.fromkeys(self.effects)) if prune else self.effects
         effects_str = ""
-        if self.effects:
+        if effects:
             effects_str = "    useEffect(() => {\n"
-            for ef in self.effects:
+            for ef in effects:
                 effects_str += f"        {ef}\n"
+            if self.cleanups:
+                effects_str += f"        return () => {{ {' '.join(self.cleanups)} }};\n"
             effects_str += "    }, []);\n"
         params_str = f"    const {{ {', '.join(self.params)} }} = useParams();" if self.params else ""
-        shared_state_str = "    const { " + ", ".join(
-            [f"{name}, set{name.capitalize()}" for name in self.shared_states]) + " } = useGlobalState();" if self.shared_states else ""
-        render_str = self._render_elements(self.elements, indent=2)
 
-        # 🧠 Layout Engine Transformation
         is_layout = self.component_name.lower().endswith('layout')
+        body = hoisted_str + render_str + memos_str + callbacks_str + effects_str
+        helpers = []
+        uses_navigate = not prune or bool(re.search(r"\bnavigate\(", body))
+        if uses_navigate:
+            helpers.append(self.NAVIGATE_HELPER +
+                           (" // For layout-level nav" if is_layout else ""))
+        if not prune or re.search(r"\bsum\(", body):
+            helpers.append(self.SUM_HELPER)
+        helpers_str = "\n".join(helpers)
+
+        imports = self.imports
+        if prune:
+            imports = self._pruned_imports(
+                body, bool(states_str), bool(effects_str), bool(refs_str), uses_navigate,
+                bool(memos_str), bool(callbacks_str))
+        elif memos_str or callbacks_str:
+            imports = (imports - {self.REACT_IMPORT}) | {self.REACT_IMPORT.replace(
+                "useRef }", "useRef, useMemo, useCallback }")}
+        imports_str = "\n".join(sorted(list(imports)))
+
+        # 🧠 Layout Engine Transformation
+        # If the page contains sidebar/main blocks, use a dashboard-style layout
+        has_sidebar = any(el.get('type') == 'section' and 'w-72' in el.get(
+            'props', {}).get('className', '') for el in self.elements)
+        signature = ""
+        hook_lines = [helpers_str, params_str, shared_state_str,
+                      states_str, memos_str, refs_str, callbacks_str, effects_str]
 
         if is_layout:
-            # Check if layout itself has dashboard blocks
-            has_sidebar = any(el.get('type') == 'section' and 'w-72' in el.get(
-                'props', {}).get('className', '') for el in self.elements)
+            signature = "{ children }"
+            hook_lines.remove(params_str)
             container_class = "min-h-screen bg-white dark:bg-gray-950 text-gray-900 dark:text-gray-100 font-sans flex" if has_sidebar else "min-h-screen bg-white dark:bg-gray-950 text-gray-900 dark:text-gray-100 font-sans"
-
-            return f"""{imports_str}
-
-export default function {self.component_name}({{ children }}) {{
-    const navigate = useNavigate(); // For layout-level nav
-    const sum = (arr) => arr ? arr.reduce((acc, curr) => acc + (parseFloat(curr.price) || parseFloat(curr) || 0), 0) : 0;
-{shared_state_str}
-{states_str}
-{refs_str}
-{effects_str}
-    return (
-        <div className="{container_class}">
-{render_str}
-        </div>
-    );
-}}
-"""
+            open_wrapper = f'        <div className="{container_class}">'
+            close_wrapper = "        </div>"
+            self.wrapper_classes = [container_class]
 
         # If page uses a layout
-        if self.layout_name:
+        elif self.layout_name:
             clean_name = self.layout_name.replace(
                 ' ', '').replace('_', '').replace('-', '')
             layout_comp = clean_name[0].upper(
@@ -581,114 +777,285 @@ export default function {self.component_name}({{ children }}) {{
 
             # Add import for layout
             imports_str += f"\nimport {layout_comp} from '../layouts/{layout_comp}';"
-
-            return f"""{imports_str}
-
-export default function {self.component_name}() {{
-    const navigate = useNavigate();
-    const sum = (arr) => arr ? arr.reduce((acc, curr) => acc + (parseFloat(curr.price) || parseFloat(curr) || 0), 0) : 0;
-{params_str}
-{shared_state_str}
-{states_str}
-{refs_str}
-{effects_str}
-    return (
-        <{layout_comp}>
-{render_str}
-        </{layout_comp}>
-    );
-}}
-"""
+            open_wrapper = f"        <{layout_comp}>"
+            close_wrapper = f"        </{layout_comp}>"
+            self.wrapper_classes = []  # the layout component supplies the markup
 
         # 🧠 Structural Layout Detection
-        # If the page contains sidebar/main blocks, use a dashboard-style layout
-        has_sidebar = any(el.get('type') == 'section' and 'w-72' in el.get(
-            'props', {}).get('className', '') for el in self.elements)
+        elif has_sidebar:
+            open_wrapper = '        <div className="min-h-screen bg-white dark:bg-gray-950 text-gray-900 dark:text-gray-100 font-sans flex">'
+            close_wrapper = "        </div>"
+            self.wrapper_classes = [
+                "min-h-screen bg-white dark:bg-gray-950 text-gray-900 dark:text-gray-100 font-sans flex"]
 
-        if has_sidebar:
-            return f"""{imports_str}
-
-export default function {self.component_name}() {{
-    const navigate = useNavigate();
-    const sum = (arr) => arr ? arr.reduce((acc, curr) => acc + (parseFloat(curr.price) || parseFloat(curr) || 0), 0) : 0;
-{params_str}
-{shared_state_str}
-{states_str}
-{refs_str}
-{effects_str}
+        else:
+            open_wrapper = ('        <div className="min-h-screen bg-gray-50 dark:bg-gray-900 text-gray-900 dark:text-white font-sans flex flex-col items-center justify-center p-4">\n'
+                            '            <div className="w-full max-w-4xl flex flex-col items-center gap-6">')
+            close_wrapper = "            </div>\n        </div>"
+            self.wrapper_classes = [
+                "min-h-screen bg-gray-50 dark:bg-gray-900 text-gray-900 dark:text-white font-sans flex flex-col items-center justify-center p-4",
+                "w-full max-w-4xl flex flex-col items-center gap-6"]
+
+        preamble = f"{imports_str}\n\n"
+        head = f"""{preamble}{hoisted_str}export default function {self.component_name}({signature}) {{
+{chr(10).join(hook_lines)}
     return (
-        <div className="min-h-screen bg-white dark:bg-gray-950 text-gray-900 dark:text-gray-100 font-sans flex">
-{render_str}
-        </div>
-    );
-}}
+{open_wrapper}
 """
-
-        return f"""{imports_str}
-
-export default function {self.component_name}() {{
-    const navigate = useNavigate();
-    const sum = (arr) => arr ? arr.reduce((acc, curr) => acc + (parseFloat(curr.price) || parseFloat(curr) || 0), 0) : 0;
-{params_str}
-{shared_state_str}
-{states_str}
-{refs_str}
-{effects_str}
-    return (
-        <div className="min-h-screen bg-gray-50 dark:bg-gray-900 text-gray-900 dark:text-white font-sans flex flex-col items-center justify-center p-4">
-            <div className="w-full max-w-4xl flex flex-col items-center gap-6">
-{render_str}
-            </div>
-        </div>
+        tail = f"""
+{close_wrapper}
     );
 }}
 """
+        # Hoisted and body mappings were recorded relative to their own buffers
+        self.source_mappings = []
+        for writer, text in ((self._hoisted, preamble), (body_writer, head)):
+            if writer is None:
+                continue
+            line_offset = text.count('\n')
+            self.source_mappings.extend((line + line_offset, column, source)
+                                        for line, column, source in writer.mappings)
+        return head + render_str + tail
+
+    def prerender_tree(self):
+        """Element tree, wrapper classes and initial state for prerender.render_page()"""
+        return {'elements': self.elements, 'wrappers': self.wrapper_classes, 'states': dict(self.states)}
+
+    def source_map(self, generated_file, source_file, source_content=None):
+        """Source Map v3 for the last generated component, pointing back at .aura lines"""
+        return build_source_map(self.source_mappings, generated_file, source_file, source_content)
+
+    def _pruned_imports(self, body, has_states, has_effects, has_refs, has_navigate,
+                        has_memos=False, has_callbacks=False):
+        """Rebuilds the default React/router imports from what the component actually uses"""
+        imports = {imp for imp in self.imports if imp not in (
+            self.REACT_IMPORT, self.MOTION_IMPORT, self.ROUTER_IMPORT)}
+
+        hooks = [hook for hook, used in (('useState', has_states), ('useEffect', has_effects),
+                                         ('useRef', has_refs), ('useMemo', has_memos),
+                                         ('useCallback', has_callbacks)) if used]
+        imports.add(f"import React, {{ {', '.join(hooks)} }} from 'react';" if hooks else "import React from 'react';")
+        if '<motion.' in body:
+            imports.add(self.MOTION_IMPORT)
+        router = [name for name, used in (('useNavigate', has_navigate), ('Link', '<Link' in body),
+                                          ('useParams', bool(self.params))) if used]
+        if router:
+            imports.add(
+                f"import {{ {', '.join(router)} }} from 'react-router-dom';")
+        return imports
+
+    def dead_code_savings(self, pruned_code):
+        """
+        Bytes the usage-analysis pass removed compared to the unpruned component,
+        which hoists and memoizes the same code, so only pruning is measured.
+        The unpruned rebuild runs on a snapshot of the generator's state, so source
+        mappings, wrapper classes and imports still describe pruned_code afterwards.
+        """
+        state = {key: value.copy() if isinstance(value, (list, dict, set)) else value
+                 for key, value in self.__dict__.items()}
+        self.eliminate_dead_code = False
+        try:
+            full_code = self._build_jsx()
+        finally:
+            self.__dict__.clear()
+            self.__dict__.update(state)
+        return len(full_code.encode('utf-8')) - len(pruned_code.encode('utf-8'))
 
     def _render_elements(self, elements, indent=0):
-        lines = []
+        out = JSXWriter()
+        self._emit_elements(out, elements, indent)
+        return out.getvalue()
+
+    def _emit_elements(self, out, elements, indent=0):
+        """Streams elements into one JSXWriter, mapping each opening tag to its .aura line"""
         base_indent = "    " * indent
-        for el in elements:
-            if not isinstance(el, dict) or 'id' not in el:
+        elements = [el for el in elements if isinstance(el, dict) and 'id' in el]
+        index = 0
+        while index < len(elements):
+            el = elements[index]
+            if index:
+                out.write("\n")
+
+            run = self._static_run(elements, index)
+            if run:
+                out.write(base_indent)
+                out.mark(el.get('line'))
+                out.write(f"{{{self._hoist(run)}}}")
+                index += len(run)
                 continue
+            index += 1
+
             tag = el['type']
-            props = el['props']
+            props = dict(el['props'])
             el_id = el['id']
-            if el_id in self.handlers:
-                for event, code in self.handlers[el_id].items():
-                    props[event] = code
-            props_str = ""
+            for event, handler in self.handlers.get(el_id, {}).items():
+                if self._hoisted is not None and not self._repeater_depth:
+                    handler = self._stable_handler(el_id, event, handler)
+                props[event] = handler
+            props_parts = {}
             for k, v in props.items():
+                # Hoisted elements live at module level, outside the component's refs
+                if k == 'ref' and (self._hoisting or self._live_refs is not None and v not in self._live_refs):
+                    continue
                 if k.startswith('on') or k == 'ref':
-                    props_str += f" {k}={{{v}}}"
+                    props_parts[k] = f" {k}={{{v}}}"
+                elif v.startswith('{') and v.endswith('}'):
+                    props_parts[k] = f" {k}={v}"  # bound expression, e.g. src={item.image}
                 else:
-                    props_str += f' {k}="{v}"'
+                    props_parts[k] = f' {k}="{v}"'
+            props_str = "".join(props_parts.values())
+
+            out.write(base_indent)
+            out.mark(el.get('line'))
 
             if tag == 'SLOT':
-                lines.append(f"{base_indent}{{children}}")
+                out.write("{children}")
+                continue
+
+            if el.get('repeater') and (el['repeater'].get('virtual') or self.virtualize_threshold is not None):
+                # Its ref and handlers go on VirtualRepeater's outer element
+                self._emit_virtual_repeater(
+                    out, el, indent, "".join(part for k, part in props_parts.items() if k != 'className'))
                 continue
 
             if el.get('repeater'):
                 data = el['repeater']['data']
                 item_name = el['repeater'].get('item_name', 'item')
-                children_str = self._render_elements(
-                    el['children'], indent=indent + 2)
-
-                content = f"{base_indent}<{tag}{props_str}>\n"
-                content += f"{base_indent}  {{{data} && {data}.map(({item_name}, index) => (\n"
-                content += f"{children_str}\n"
-                content += f"{base_indent}  ))}}\n"
-                content += f"{base_indent}</{tag}>"
-                lines.append(content)
+                out.write(f"<{tag}{props_str}>\n")
+                out.write(
+                    f"{base_indent}  {{{data} && {data}.map(({item_name}, index) => (\n")
+                self._repeater_depth += 1
+                self._emit_elements(out, el['children'], indent=indent + 2)
+                self._repeater_depth -= 1
+                out.write(f"\n{base_indent}  ))}}\n")
+                out.write(f"{base_indent}</{tag}>")
+                continue
+
+            if el.get('image', {}).get('sources'):
+                self._emit_picture(out, el['image'], props_str, indent)
                 continue
 
             if el.get('children'):
-                children_str = self._render_elements(
-                    el['children'], indent=indent + 1)
-                lines.append(
-                    f"{base_indent}<{tag}{props_str}>\n{children_str}\n{base_indent}</{tag}>")
+                out.write(f"<{tag}{props_str}>\n")
+                self._emit_elements(out, el['children'], indent=indent + 1)
+                out.write(f"\n{base_indent}</{tag}>")
             elif el.get('text_content'):
-                lines.append(
-                    f"{base_indent}<{tag}{props_str}>{el['text_content']}</{tag}>")
+                out.write(f"<{tag}{props_str}>{self._memoized_binding(el['text_content'])}</{tag}>")
             else:
-                lines.append(f"{base_indent}<{tag}{props_str} />")
-        return "\n".join(lines)
+                out.write(f"<{tag}{props_str} />")
+
+    def _emit_picture(self, out, image, img_props, indent):
+        """<picture> with one <source> per encoded format and the original as fallback"""
+        base_indent = "    " * indent
+        out.write("<picture>\n")
+        for mime, srcset in image['sources'].items():
+            out.write(f'{base_indent}    <source type="{mime}" srcSet="{srcset}" sizes="{image["sizes"]}" />\n')
+        out.write(f"{base_indent}    <img{img_props} />\n")
+        out.write(f"{base_indent}</picture>")
+
+    def _emit_virtual_repeater(self, out, el, indent, props_str=""):
+        """Renders a list/grid through the generated VirtualRepeater (components/VirtualRepeater.jsx)"""
+        self.imports.add(
+            "import VirtualRepeater from '../components/VirtualRepeater';")
+        base_indent = "    " * indent
+        repeater = el['repeater']
+        item_name = repeater.get('item_name', 'item')
+        # 'virtual' repeaters always window; others only past the threshold
+        threshold = 0 if repeater.get('virtual') else self.virtualize_threshold
+
+        attrs = [
+            f"items={{{repeater['data']}}}",
+            f"columns={{{repeater.get('columns', 1)}}}",
+            f"threshold={{{threshold}}}",
+            f'className="{el["props"].get("className", "")}"',
+            f'rowClassName="{repeater.get("gap", "gap-4")}"',
+        ]
+        if repeater.get('row_height'):
+            attrs.append(f"rowHeight={{{repeater['row_height']}}}")
+
+        out.write(f"<VirtualRepeater {' '.join(attrs)}{props_str}\n")
+        out.write(f"{base_indent}  renderItem={{({item_name}, index) => (\n")
+        out.write(f"{base_indent}    <>\n")
+        self._repeater_depth += 1
+        self._emit_elements(out, el['children'], indent=indent + 2)
+        self._repeater_depth -= 1
+        out.write(f"\n{base_indent}    </>\n")
+        out.write(f"{base_indent}  )}} />")
+
+    # Hoisted only when the binding-free run covers at least this many elements
+    HOIST_MIN_ELEMENTS = 2
+    # Names a memoized expression may use besides component state
+    MEMO_SAFE_NAMES = {'sum', 'Math', 'JSON', 'Number', 'String', 'Array', 'Object', 'Date',
+                       'parseInt', 'parseFloat', 'true', 'false', 'null', 'undefined'}
+
+    def _collect_static(self, elements, used_refs):
+        """Records the size of every subtree without bindings, handlers, used refs or slots"""
+        all_static = True
+        for el in elements:
+            if not isinstance(el, dict) or 'id' not in el:
+                continue
+            children = [c for c in el.get('children', []) if isinstance(c, dict) and 'id' in c]
+            static = self._collect_static(children, used_refs)
+            text = el.get('text_content')
+            static = static and el['type'] != 'SLOT' and not el.get('repeater') and \
+                el['id'] not in self.handlers and el['props'].get('ref') not in used_refs and \
+                not (isinstance(text, str) and '{' in text) and \
+                not any(isinstance(v, str) and '{' in v for k, v in el['props'].items() if k != 'ref')
+            if static:
+                self._static_sizes[el['id']] = 1 + sum(self._static_sizes[c['id']] for c in children)
+            all_static = all_static and static
+        return all_static
+
+    def _static_run(self, elements, start):
+        """Consecutive binding-free siblings from 'start', if large enough to hoist"""
+        if self._hoisted is None or self._repeater_depth or self._hoisting:
+            return None
+        run = []
+        for el in elements[start:]:
+            if el['id'] not in self._static_sizes:
+                break
+            run.append(el)
+        if sum(self._static_sizes[el['id']] for el in run) < self.HOIST_MIN_ELEMENTS:
+            return None
+        return run
+
+    def _hoist(self, run):
+        """Emits a static run once at module level so React reuses the same elements every render"""
+        self._static_blocks += 1
+        name = f"staticBlock{self._static_blocks}"
+        out = self._hoisted
+        out.write(f"const {name} = (\n")
+        if len(run) > 1:
+            out.write("    <>\n")
+        self._hoisting = True
+        try:
+            self._emit_elements(out, run, indent=2 if len(run) > 1 else 1)
+        finally:
+            self._hoisting = False
+        if len(run) > 1:
+            out.write("\n    </>")
+        out.write("\n);\n\n")
+        return name
+
+    def _free_names(self, expr):
+        """Root identifiers an expression reads (string literals and member names skipped)"""
+        import re
+        expr = re.sub(r"'[^']*'|\"[^\"]*\"|`[^`]*`", "''", expr)
+        return set(re.findall(r"(?<![\w$.])[A-Za-z_$][\w$]*", expr))
+
+    def _memoized_binding(self, text):
+        """'{sum(cart)}' -> '{derived1}' when the call only reads component state"""
+        if self._hoisted is None or not text.startswith('{') or text.count('{') != 1:
+            return text
+        expr = text[1:-1].strip()
+        names = self._free_names(expr)
+        if '(' not in expr or not names & self._scope or not names <= self._scope | self.MEMO_SAFE_NAMES:
+            return text
+        name = self._memos.setdefault(expr, f"derived{len(self._memos) + 1}")
+        return f"{{{name}}}"
+
+    def _stable_handler(self, el_id, event, handler):
+        """Moves a handler into a useCallback so memoized children see a stable prop"""
+        name = f"handle{event[2:]}{el_id.replace('_', ' ').title().replace(' ', '')}"
+        self._callbacks[name] = handler
+        return name
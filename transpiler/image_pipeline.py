@@ -0,0 +1,124 @@
+"""
+Aura Image Pipeline - Build-time processing for local images
+Resolves image paths from .aura files, writes resized AVIF/WebP variants into
+the engine's public folder and records intrinsic dimensions for the <img>.
+Outputs are keyed by content hash so unchanged images are never re-encoded.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from typing import Dict, Optional
+
+try:
+    from PIL import Image, features
+except ImportError:
+    Image = None
+    features = None
+
+
+class ImagePipeline:
+    PUBLIC_PATH = "aura-images"
+    WIDTHS = (320, 640, 960, 1280, 1920)
+    FORMATS = ('avif', 'webp')
+    QUALITY = {'avif': 50, 'webp': 75}
+    EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.gif', '.bmp', '.tiff', '.avif')
+
+    def __init__(self, engine_dir, widths=WIDTHS, formats=FORMATS):
+        self.output_dir = os.path.join(engine_dir, 'public', self.PUBLIC_PATH)
+        self.manifest_path = os.path.join(self.output_dir, 'manifest.json')
+        self.widths = tuple(sorted(widths))
+        self.formats = tuple(fmt for fmt in formats if self._can_encode(fmt))
+        self.manifest = self._load_manifest()
+        self.processed = 0  # images encoded during this build (cache misses)
+        self._warned = False
+
+    @staticmethod
+    def _can_encode(fmt) -> bool:
+        if Image is None:
+            return False
+        try:
+            return bool(features.check(fmt))
+        except (ValueError, AttributeError):
+            return False
+
+    def _load_manifest(self) -> Dict:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        with open(self.manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+
+    def resolve(self, src: str, source_dir: str) -> Optional[str]:
+        """Local file behind an image src, or None for URLs, data URIs and missing files"""
+        if not src or src.startswith(('http://', 'https://', '//', 'data:', '{')):
+            return None
+        if not src.lower().endswith(self.EXTENSIONS):
+            return None
+        relative = src.lstrip('/\\')
+        for base in (source_dir, os.getcwd(), os.path.join(os.getcwd(), 'public')):
+            path = os.path.join(base, relative)
+            if os.path.isfile(path):
+                return path
+        return None
+
+    def process(self, src: str, source_dir: str) -> Optional[Dict]:
+        """
+        Returns {'src', 'width', 'height', 'sources': {mime: srcset}} for a local image.
+        Returns None when the src is not a local file.
+        """
+        path = self.resolve(src, source_dir)
+        if not path:
+            return None
+
+        with open(path, 'rb') as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()[:16]
+        stem = os.path.splitext(os.path.basename(path))[0].replace(' ', '-')
+        key = f"{stem}-{digest}"
+
+        cached = self.manifest.get(key)
+        if cached and all(os.path.exists(os.path.join(self.output_dir, name)) for name in cached['files']):
+            return cached['image']
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        extension = os.path.splitext(path)[1].lower()
+        original = f"{key}{extension}"
+        shutil.copyfile(path, os.path.join(self.output_dir, original))
+        files = [original]
+        image = {'src': f"/{self.PUBLIC_PATH}/{original}", 'sources': {}}
+
+        if Image is None:
+            if not self._warned:
+                print("[Images] ⚠️ Pillow not installed: images are copied without resizing.")
+                print("Run: pip install Pillow")
+                self._warned = True
+        else:
+            with Image.open(path) as img:
+                width, height = img.size
+                image['width'], image['height'] = width, height
+                # Never upscale: the intrinsic width is the largest variant
+                widths = [w for w in self.widths if w < width] + [width]
+                frame = img.convert('RGBA' if 'A' in img.getbands() else 'RGB')
+                for fmt in self.formats:
+                    entries = []
+                    for w in widths:
+                        name = f"{key}-{w}.{fmt}"
+                        resized = frame if w == width else frame.resize(
+                            (w, max(1, round(height * w / width))), Image.LANCZOS)
+                        resized.save(os.path.join(self.output_dir, name), fmt.upper(),
+                                     quality=self.QUALITY[fmt])
+                        files.append(name)
+                        entries.append(f"/{self.PUBLIC_PATH}/{name} {w}w")
+                    image['sources'][f"image/{fmt}"] = ", ".join(entries)
+            image['sizes'] = f"(max-width: {width}px) 100vw, {width}px"
+
+        self.processed += 1
+        self.manifest[key] = {'files': files, 'image': image}
+        return image
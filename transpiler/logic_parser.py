@@ -6,7 +6,7 @@ Handles: Variables, Conditions, Loops, Functions, Math
 import re
 from typing import List, Optional, Tuple
 from .ast_nodes import (
-    ASTNode, VariableNode, PrintNode, BinaryOpNode,
+    ASTNode, LineTable, VariableNode, PrintNode, BinaryOpNode,
     IfNode, LoopNode, FunctionDefNode, FunctionCallNode, Program,
     AppNode, PageNode, NavigationNode, LayoutNode, SlotNode,
     AddNode, RemoveNode, FetchNode, NotifyNode
@@ -23,18 +23,76 @@ from .semantic_nodes import (
 )
 
 
+# Line rules in the order _parse_line tries them
+LINE_RULES = {
+    'app': r"app\s+[\"']?([^\"']+)[\"']?",
+    'page': r"page\s+(\w+)(?:\(([^)]+)\))?(?:\s+uses\s+(\w+))?",
+    'layout': r"layout\s+(\w+)",
+    'set': r"set\s+(\w+)\s+to\s+(.+)",
+    'fetch': r"fetch\s+from\s+[\"']?([^\"']+)[\"']?",
+    'print': r"print\s+(.+)",
+    'if': r"if\s+(.+)",
+    'repeat': r"repeat\s+(\d+)\s+times?",
+    'define_function': r"define\s+function\s+(\w+)",
+    'call_function': r"call\s+function\s+(\w+)",
+    'intent': r"(?:landing page|website|official website|booking website|product website|application|app)\s+(?:for\s+)?(.+)",
+    'hero': r"(?:hero|hero section)\s+\"([^\"]+)\"(?:\s+subtitle\s+\"([^\"]+)\")?(?:\s+button\s+\"([^\"]+)\")?",
+    'feature': r"(?:feature|feature section)\s+\"([^\"]+)\"(?:\s+description\s+\"([^\"]+)\")?",
+    'pricing': r"pricing\s+\"([^\"]+)\"\s+(?:at\s+)?\"([^\"]+)\"(?:\s+features\s+\"([^\"]+)\")?",
+    'cta': r"cta\s+\"([^\"]+)\"(?:\s+button\s+\"([^\"]+)\")?",
+    'booking': r"booking\s+\"([^\"]+)\"(?:\s+price\s+\"([^\"]+)\")?",
+    'contact': r"(?:contact|contact us)(?:\s+at\s+)?\"([^\"]+)\"?",
+    'column': r"(?:column|col)",
+    'row': r"(?:row|columns\s+(\d+))",
+    'text': r"text\s+(.+)",
+    'button': r"button\s+[\"']?([^\"']+)[\"']?(?:\s+goes\s+to\s+(\w+))?",
+    'table': r"table\s+(\w+)",
+    'grid': r"grid\s+(.+)",
+    'card': r"card(?:\s+(.+))?",
+    'list': r"list\s+(.+)",
+    # 'add X to Y' / 'remove X from Y' split on the keyword with _split_on_word: a
+    # single '(.+)\s+to\s+(.+)' regex backtracks cubically over runs of spaces
+    'add': r"add\s+(.+)",
+    'remove': r"remove\s+(.+)",
+    'notify': r"notify\s+(.+)",
+    'panel': r"panel\s+[\"']?([^\"']+)[\"']?",
+    'icon': r"icon\s+[\"8]?([^\"']+)[\"']?(?:\s+size\s+[\"']?(\w+)[\"']?)?(?:\s+color\s+[\"']?(\w+)[\"']?)?",
+    'image': r"image\s+(.+)",
+    'layout_block': r"(sidebar|main|header|footer)",
+    'input': r"input\s+(\w+)",
+}
+PATTERNS = {name: re.compile(source, re.IGNORECASE) for name, source in LINE_RULES.items()}
+
+# Natural-language comparison words _parse_condition rewrites to operators. The
+# (?<!\s) guard starts each attempt at the beginning of a whitespace run, so a long
+# run is scanned once instead of once per character.
+CONDITION_REWRITES = [(re.compile(source, re.IGNORECASE), operator) for source, operator in (
+    (r'(?<!\s)\s+is\s+', ' == '),
+    (r'(?<!\s)\s+equals\s+', ' == '),
+    (r'(?<!\s)\s+greater\s+than\s+', ' > '),
+    (r'(?<!\s)\s+less\s+than\s+', ' < '),
+)]
+_TOKEN = re.compile(r"\S+")
+
+
 class LogicParser:
     """Parser for Aura Core logic commands"""
 
     def __init__(self):
         self.current_line = 0
+        self.line_table = None
 
     def parse_file(self, filepath: str) -> Program:
         """Parse .aura file into AST"""
         with open(filepath, 'r', encoding='utf-8') as f:
             lines = f.readlines()
 
-        statements = self._parse_lines(lines)
+        # Nodes read their raw_line from one shared table instead of holding a copy
+        self.line_table = LineTable(lines)
+        try:
+            statements = self._parse_lines(lines)
+        finally:
+            self.line_table = None
         return Program(statements=statements)
 
     def _get_indent(self, line: str) -> int:
@@ -49,15 +107,15 @@ class LogicParser:
                 return indent
         return current_indent + 2
 
-    def _parse_lines(self, lines: List[str], parent_indent: int = 0) -> List[ASTNode]:
-        """Parse lines with indentation awareness"""
+    def _parse_lines(self, lines: List[str], parent_indent: int = 0, line_offset: int = 0) -> List[ASTNode]:
+        """Parse lines with indentation awareness (line_offset: file line before lines[0])"""
         statements = []
         i = 0
 
         while i < len(lines):
             raw_line = lines[i]
             line = raw_line.strip()
-            self.current_line = i + 1
+            self.current_line = line_offset + i + 1
 
             # Skip empty lines and comments
             if not line or line.startswith('#'):
@@ -77,7 +135,7 @@ class LogicParser:
                 continue
 
             # Try to parse the line
-            node = self._parse_line(line, i + 1, lines, i)
+            node = self._parse_line(line, line_offset + i + 1, lines, i)
             if node:
                 statements.append(node)
                 # If it's a block statement (if, loop, function, or any with children), skip the parsed lines
@@ -108,20 +166,22 @@ class LogicParser:
 
     def _parse_line(self, line: str, line_num: int, all_lines: List[str], current_idx: int) -> Optional[ASTNode]:
         """Parse a single line into an AST node"""
+        source = self.line_table if self.line_table is not None else line
 
         # === PHASE 6.0: APPLICATION LAYER (High Priority) ===
 
         # App definition: app "Kingenious Store"
-        if match := re.match(r"app\s+[\"']?([^\"']+)[\"']?", line, re.IGNORECASE):
+        if match := PATTERNS['app'].match(line):
             app_name = match.group(1)
             indent = self._get_indent(all_lines[current_idx])
             next_lines = all_lines[current_idx + 1:]
             child_indent = self._get_next_indent(next_lines, indent)
-            pages = self._parse_lines(next_lines, parent_indent=child_indent)
-            return AppNode(line_number=line_num, raw_line=line, name=app_name, pages=pages)
+            pages = self._parse_lines(
+                next_lines, parent_indent=child_indent, line_offset=line_num)
+            return AppNode(line_number=line_num, raw_line=source, name=app_name, pages=pages)
 
         # Page definition: page home [uses layout_name] or page product(id)
-        if match := re.match(r"page\s+(\w+)(?:\(([^)]+)\))?(?:\s+uses\s+(\w+))?", line, re.IGNORECASE):
+        if match := PATTERNS['page'].match(line):
             page_name = match.group(1)
             params_raw = match.group(2)
             layout = match.group(3)
@@ -131,49 +191,49 @@ class LogicParser:
             next_lines = all_lines[current_idx + 1:]
             child_indent = self._get_next_indent(next_lines, indent)
             children = self._parse_lines(
-                next_lines, parent_indent=child_indent)
-            return PageNode(line_number=line_num, raw_line=line, name=page_name, layout=layout, children=children, params=params)
+                next_lines, parent_indent=child_indent, line_offset=line_num)
+            return PageNode(line_number=line_num, raw_line=source, name=page_name, layout=layout, children=children, params=params)
 
         # Layout definition: layout shop_layout
-        if match := re.match(r"layout\s+(\w+)", line, re.IGNORECASE):
+        if match := PATTERNS['layout'].match(line):
             layout_name = match.group(1)
             indent = self._get_indent(all_lines[current_idx])
             next_lines = all_lines[current_idx + 1:]
             child_indent = self._get_next_indent(next_lines, indent)
             children = self._parse_lines(
-                next_lines, parent_indent=child_indent)
-            return LayoutNode(line_number=line_num, raw_line=line, name=layout_name, children=children)
+                next_lines, parent_indent=child_indent, line_offset=line_num)
+            return LayoutNode(line_number=line_num, raw_line=source, name=layout_name, children=children)
 
         # Variable: set score to 10
-        if match := re.match(r"set\s+(\w+)\s+to\s+(.+)", line, re.IGNORECASE):
+        if match := PATTERNS['set'].match(line):
             var_name = match.group(1)
             value_expr = match.group(2).strip()
 
             # Special case for fetch: set products to fetch from "inventory.json"
-            if fetch_match := re.match(r"fetch\s+from\s+[\"']?([^\"']+)[\"']?", value_expr, re.IGNORECASE):
+            if fetch_match := PATTERNS['fetch'].match(value_expr):
                 value = FetchNode(line_number=line_num,
-                                  raw_line=line, source=fetch_match.group(1))
+                                  raw_line=source, source=fetch_match.group(1))
             elif value_expr == '[]':
                 value = []
             else:
                 value = self._parse_value(value_expr)
-            return VariableNode(line_number=line_num, raw_line=line, name=var_name, value=value)
+            return VariableNode(line_number=line_num, raw_line=source, name=var_name, value=value)
 
         # Print: print "Hello" or print score
-        if match := re.match(r"print\s+(.+)", line, re.IGNORECASE):
+        if match := PATTERNS['print'].match(line):
             content_expr = match.group(1).strip()
             content = self._parse_value(content_expr)
-            return PrintNode(line_number=line_num, raw_line=line, content=content)
+            return PrintNode(line_number=line_num, raw_line=source, content=content)
 
         # If statement: if cart is empty
-        if match := re.match(r"if\s+(.+)", line, re.IGNORECASE):
+        if match := PATTERNS['if'].match(line):
             condition_expr = match.group(1).strip()
 
             # Handle "is empty" semantic
             if "is empty" in condition_expr.lower():
                 var_name = condition_expr.lower().replace("is empty", "").strip()
                 condition = BinaryOpNode(
-                    line_number=line_num, raw_line=line, left=f"{var_name}.length", operator="==", right="0")
+                    line_number=line_num, raw_line=source, left=f"{var_name}.length", operator="==", right="0")
             else:
                 condition = self._parse_condition(condition_expr)
 
@@ -181,89 +241,89 @@ class LogicParser:
             indent = len(all_lines[current_idx]) - \
                 len(all_lines[current_idx].lstrip())
             body, else_body = self._parse_if_block(
-                all_lines[current_idx + 1:], indent)
+                all_lines[current_idx + 1:], indent, line_offset=line_num)
 
             return IfNode(
                 line_number=line_num,
-                raw_line=line,
+                raw_line=source,
                 condition=condition,
                 body=body,
                 else_body=else_body
             )
 
         # Loop: repeat 5 times
-        if match := re.match(r"repeat\s+(\d+)\s+times?", line, re.IGNORECASE):
+        if match := PATTERNS['repeat'].match(line):
             count = int(match.group(1))
 
             # Parse the loop body
             indent = len(all_lines[current_idx]) - \
                 len(all_lines[current_idx].lstrip())
             body = self._parse_lines(
-                all_lines[current_idx + 1:], parent_indent=indent + 4)
+                all_lines[current_idx + 1:], parent_indent=indent + 4, line_offset=line_num)
 
-            return LoopNode(line_number=line_num, raw_line=line, count=count, body=body)
+            return LoopNode(line_number=line_num, raw_line=source, count=count, body=body)
 
         # Function definition: define function greet
-        if match := re.match(r"define\s+function\s+(\w+)", line, re.IGNORECASE):
+        if match := PATTERNS['define_function'].match(line):
             func_name = match.group(1)
 
             # Parse the function body
             indent = len(all_lines[current_idx]) - \
                 len(all_lines[current_idx].lstrip())
             body = self._parse_lines(
-                all_lines[current_idx + 1:], parent_indent=indent + 4)
+                all_lines[current_idx + 1:], parent_indent=indent + 4, line_offset=line_num)
 
-            return FunctionDefNode(line_number=line_num, raw_line=line, name=func_name, body=body)
+            return FunctionDefNode(line_number=line_num, raw_line=source, name=func_name, body=body)
 
         # Function call: call function greet
-        if match := re.match(r"call\s+function\s+(\w+)", line, re.IGNORECASE):
+        if match := PATTERNS['call_function'].match(line):
             func_name = match.group(1)
-            return FunctionCallNode(line_number=line_num, raw_line=line, name=func_name)
+            return FunctionCallNode(line_number=line_num, raw_line=source, name=func_name)
 
         # === PHASE 4.0/5.0: SEMANTIC INTENT ===
 
         # Landing Page/Website Intent: booking website for a barber shop
-        if match := re.match(r"(?:landing page|website|official website|booking website|product website|application|app)\s+(?:for\s+)?(.+)", line, re.IGNORECASE):
+        if match := PATTERNS['intent'].match(line):
             intent_text = line.strip()  # Aura 5.0: Pass the full intent to the DIE
             indent = len(all_lines[current_idx]) - \
                 len(all_lines[current_idx].lstrip())
             sections = self._parse_lines(
-                all_lines[current_idx + 1:], parent_indent=indent + 4)
-            return IntentPageNode(line_number=line_num, raw_line=line, intent_text=intent_text, sections=sections)
+                all_lines[current_idx + 1:], parent_indent=indent + 4, line_offset=line_num)
+            return IntentPageNode(line_number=line_num, raw_line=source, intent_text=intent_text, sections=sections)
 
         # Hero Section: hero "Build with Aura" subtitle "English to Web Apps"
-        if match := re.match(r"(?:hero|hero section)\s+\"([^\"]+)\"(?:\s+subtitle\s+\"([^\"]+)\")?(?:\s+button\s+\"([^\"]+)\")?", line, re.IGNORECASE):
+        if match := PATTERNS['hero'].match(line):
             title = match.group(1)
             subtitle = match.group(2)
             cta = match.group(3)
-            return HeroNode(line_number=line_num, raw_line=line, title=title, subtitle=subtitle, cta_text=cta)
+            return HeroNode(line_number=line_num, raw_line=source, title=title, subtitle=subtitle, cta_text=cta)
 
         # Feature: feature "AI Parsing" description "Smart code generation"
-        if match := re.match(r"(?:feature|feature section)\s+\"([^\"]+)\"(?:\s+description\s+\"([^\"]+)\")?", line, re.IGNORECASE):
+        if match := PATTERNS['feature'].match(line):
             title = match.group(1)
             desc = match.group(2)
-            return FeatureNode(line_number=line_num, raw_line=line, title=title, description=desc)
+            return FeatureNode(line_number=line_num, raw_line=source, title=title, description=desc)
 
         # Pricing: pricing "Pro Plan" at "$20/mo" features "AI, Priority, Custom"
-        if match := re.match(r"pricing\s+\"([^\"]+)\"\s+(?:at\s+)?\"([^\"]+)\"(?:\s+features\s+\"([^\"]+)\")?", line, re.IGNORECASE):
+        if match := PATTERNS['pricing'].match(line):
             plan = match.group(1)
             price = match.group(2)
             features_raw = match.group(3)
             features = [f.strip() for f in features_raw.split(',')
                         ] if features_raw else []
-            return PricingNode(line_number=line_num, raw_line=line, plan_name=plan, price=price, features=features)
+            return PricingNode(line_number=line_num, raw_line=source, plan_name=plan, price=price, features=features)
 
         # Call to Action: cta "Ready to build?" button "Get Started"
-        if match := re.match(r"cta\s+\"([^\"]+)\"(?:\s+button\s+\"([^\"]+)\")?", line, re.IGNORECASE):
-            return CtaNode(line_number=line_num, raw_line=line, title=match.group(1), button_text=match.group(2) or "Join")
+        if match := PATTERNS['cta'].match(line):
+            return CtaNode(line_number=line_num, raw_line=source, title=match.group(1), button_text=match.group(2) or "Join")
 
         # Booking: booking "Haircut" price "$30"
-        if match := re.match(r"booking\s+\"([^\"]+)\"(?:\s+price\s+\"([^\"]+)\")?", line, re.IGNORECASE):
-            return BookingNode(line_number=line_num, raw_line=line, service_name=match.group(1), price_prefix=match.group(2))
+        if match := PATTERNS['booking'].match(line):
+            return BookingNode(line_number=line_num, raw_line=source, service_name=match.group(1), price_prefix=match.group(2))
 
         # Contact: contact us at "hello@aura.lang"
-        if match := re.match(r"(?:contact|contact us)(?:\s+at\s+)?\"([^\"]+)\"?", line, re.IGNORECASE):
-            return ContactNode(line_number=line_num, raw_line=line, email=match.group(1) if match.groups() else None)
+        if match := PATTERNS['contact'].match(line):
+            return ContactNode(line_number=line_num, raw_line=source, email=match.group(1) if match.groups() else None)
 
         # === PHASE 3.1: VISUAL DSL ===
 
@@ -275,26 +335,26 @@ class LogicParser:
             next_lines = all_lines[current_idx + 1:]
             child_indent = self._get_next_indent(next_lines, indent)
             children = self._parse_lines(
-                next_lines, parent_indent=child_indent)
-            return ScreenNode(line_number=line_num, raw_line=line, children=children)
+                next_lines, parent_indent=child_indent, line_offset=line_num)
+            return ScreenNode(line_number=line_num, raw_line=source, children=children)
 
         # Column layout
-        if match := re.match(r"(?:column|col)", line, re.IGNORECASE):
+        if match := PATTERNS['column'].match(line):
             indent = self._get_indent(all_lines[current_idx])
             next_lines = all_lines[current_idx + 1:]
             child_indent = self._get_next_indent(next_lines, indent)
             children = self._parse_lines(
-                next_lines, parent_indent=child_indent)
-            return ColumnNode(line_number=line_num, raw_line=line, children=children)
+                next_lines, parent_indent=child_indent, line_offset=line_num)
+            return ColumnNode(line_number=line_num, raw_line=source, children=children)
 
         # Row layout or Columns
-        if match := re.match(r"(?:row|columns\s+(\d+))", line, re.IGNORECASE):
+        if match := PATTERNS['row'].match(line):
             indent = self._get_indent(all_lines[current_idx])
             next_lines = all_lines[current_idx + 1:]
             child_indent = self._get_next_indent(next_lines, indent)
             children = self._parse_lines(
-                next_lines, parent_indent=child_indent)
-            return RowNode(line_number=line_num, raw_line=line, children=children)
+                next_lines, parent_indent=child_indent, line_offset=line_num)
+            return RowNode(line_number=line_num, raw_line=source, children=children)
 
         # Stack layout
         if line.lower() == 'stack':
@@ -302,11 +362,11 @@ class LogicParser:
             next_lines = all_lines[current_idx + 1:]
             child_indent = self._get_next_indent(next_lines, indent)
             children = self._parse_lines(
-                next_lines, parent_indent=child_indent)
-            return StackNode(line_number=line_num, raw_line=line, children=children)
+                next_lines, parent_indent=child_indent, line_offset=line_num)
+            return StackNode(line_number=line_num, raw_line=source, children=children)
 
         # Text: text "Hello" or text score
-        if match := re.match(r"text\s+(.+)", line, re.IGNORECASE):
+        if match := PATTERNS['text'].match(line):
             value_expr = match.group(1).strip()
 
             # Check if it's a literal string or variable
@@ -314,18 +374,18 @@ class LogicParser:
                (value_expr.startswith("'") and value_expr.endswith("'")):
                 # Literal text
                 text_value = value_expr[1:-1]  # Remove quotes
-                return TextNode(line_number=line_num, raw_line=line, value=text_value, is_binding=False)
+                return TextNode(line_number=line_num, raw_line=source, value=text_value, is_binding=False)
             else:
                 # Variable binding
-                return TextNode(line_number=line_num, raw_line=line, value=value_expr, is_binding=True)
+                return TextNode(line_number=line_num, raw_line=source, value=value_expr, is_binding=True)
 
         # Slot placeholder: slot
         # Slot placeholder: slot
         if line.lower().strip() == 'slot' or line.lower().startswith('slot '):
-            return SlotNode(line_number=line_num, raw_line=line)
+            return SlotNode(line_number=line_num, raw_line=source)
 
         # Button: button "Click Me" [goes to shop]
-        if match := re.match(r"button\s+[\"']?([^\"']+)[\"']?(?:\s+goes\s+to\s+(\w+))?", line, re.IGNORECASE):
+        if match := PATTERNS['button'].match(line):
             label = match.group(1)
             target = match.group(2)
 
@@ -336,7 +396,7 @@ class LogicParser:
 
             if target:
                 on_click.append(NavigationNode(
-                    line_number=line_num, raw_line=line, target_page=target))
+                    line_number=line_num, raw_line=source, target_page=target))
 
             # Look for 'when clicked' in next line
             if current_idx + 1 < len(all_lines):
@@ -346,100 +406,135 @@ class LogicParser:
                 if next_line.lower() == 'when clicked' and next_indent >= indent:
                     handler_indent = next_indent
                     on_click.extend(self._parse_lines(
-                        all_lines[current_idx + 2:], parent_indent=handler_indent + 4))
+                        all_lines[current_idx + 2:], parent_indent=handler_indent + 4, line_offset=line_num + 1))
 
-            return ButtonNode(line_number=line_num, raw_line=line, label=label, on_click=on_click)
+            return ButtonNode(line_number=line_num, raw_line=source, label=label, on_click=on_click)
 
         # Table: table orders
-        if match := re.match(r"table\s+(\w+)", line, re.IGNORECASE):
+        if match := PATTERNS['table'].match(line):
             # Very simple for now, can expand later
-            return TableNode(line_number=line_num, raw_line=line, columns=[])
+            return TableNode(line_number=line_num, raw_line=source, columns=[])
 
-        # Grid: grid products from inventory [columns 3]
-        if match := re.match(r"grid\s+(.+?)(?:\s+columns\s+(\d+))?$", line, re.IGNORECASE):
-            items_expr = match.group(1)
-            # col_count = match.group(2) # can store in node later if needed
+        # Grid: grid products from inventory [columns 3] [virtual [120]]
+        if match := PATTERNS['grid'].match(line):
+            items_expr, columns, virtual, row_height = self._split_repeater_expr(
+                match.group(1))
             indent = self._get_indent(all_lines[current_idx])
             next_lines = all_lines[current_idx + 1:]
             child_indent = self._get_next_indent(next_lines, indent)
             children = self._parse_lines(
-                next_lines, parent_indent=child_indent)
-            return GridNode(line_number=line_num, raw_line=line, items_expr=items_expr, children=children)
+                next_lines, parent_indent=child_indent, line_offset=line_num)
+            return GridNode(line_number=line_num, raw_line=source, items_expr=items_expr, children=children,
+                            columns=columns, virtual=virtual, row_height=row_height)
 
         # Card: card hover lift
-        if match := re.match(r"card(?:\s+(.+))?", line, re.IGNORECASE):
+        if match := PATTERNS['card'].match(line):
             effects_str = match.group(1) or ""
             effects = effects_str.split()
             indent = self._get_indent(all_lines[current_idx])
             next_lines = all_lines[current_idx + 1:]
             child_indent = self._get_next_indent(next_lines, indent)
             children = self._parse_lines(
-                next_lines, parent_indent=child_indent)
-            return CardNode(line_number=line_num, raw_line=line, children=children, effects=effects)
+                next_lines, parent_indent=child_indent, line_offset=line_num)
+            return CardNode(line_number=line_num, raw_line=source, children=children, effects=effects)
 
-        # List Repeater: list cart
-        if match := re.match(r"list\s+(.+)", line, re.IGNORECASE):
-            items_expr = match.group(1)
+        # List Repeater: list cart [virtual [72]]
+        if match := PATTERNS['list'].match(line):
+            items_expr, _, virtual, row_height = self._split_repeater_expr(
+                match.group(1))
             indent = self._get_indent(all_lines[current_idx])
             next_lines = all_lines[current_idx + 1:]
             child_indent = self._get_next_indent(next_lines, indent)
             children = self._parse_lines(
-                next_lines, parent_indent=child_indent)
-            return ListNode(line_number=line_num, raw_line=line, items_expr=items_expr, children=children)
+                next_lines, parent_indent=child_indent, line_offset=line_num)
+            return ListNode(line_number=line_num, raw_line=source, items_expr=items_expr, children=children,
+                            virtual=virtual, row_height=row_height)
 
         # Add: add item to cart
-        if match := re.match(r"add\s+(.+)\s+to\s+(.+)", line, re.IGNORECASE):
-            return AddNode(line_number=line_num, raw_line=line, item=match.group(1), target=match.group(2))
+        if (match := PATTERNS['add'].match(line)) and (parts := self._split_on_word(match.group(1), 'to')):
+            return AddNode(line_number=line_num, raw_line=source, item=parts[0], target=parts[1])
 
         # Remove: remove item from cart
-        if match := re.match(r"remove\s+(.+)\s+from\s+(.+)", line, re.IGNORECASE):
-            return RemoveNode(line_number=line_num, raw_line=line, item=match.group(1), target=match.group(2))
+        if (match := PATTERNS['remove'].match(line)) and (parts := self._split_on_word(match.group(1), 'from')):
+            return RemoveNode(line_number=line_num, raw_line=source, item=parts[0], target=parts[1])
 
         # Notify: notify "Added to cart"
-        if match := re.match(r"notify\s+(.+)", line, re.IGNORECASE):
+        if match := PATTERNS['notify'].match(line):
             msg = self._parse_value(match.group(1))
-            return NotifyNode(line_number=line_num, raw_line=line, message=msg)
+            return NotifyNode(line_number=line_num, raw_line=source, message=msg)
 
         # Panel: panel "Summary"
-        if match := re.match(r"panel\s+[\"']?([^\"']+)[\"']?", line, re.IGNORECASE):
+        if match := PATTERNS['panel'].match(line):
             title = match.group(1)
             indent = self._get_indent(all_lines[current_idx])
             next_lines = all_lines[current_idx + 1:]
             child_indent = self._get_next_indent(next_lines, indent)
             children = self._parse_lines(
-                next_lines, parent_indent=child_indent)
-            return PanelNode(line_number=line_num, raw_line=line, title=title, children=children)
+                next_lines, parent_indent=child_indent, line_offset=line_num)
+            return PanelNode(line_number=line_num, raw_line=source, title=title, children=children)
 
         # Divider: divider
         if line.lower().strip() == 'divider':
-            return DividerNode(line_number=line_num, raw_line=line)
+            return DividerNode(line_number=line_num, raw_line=source)
 
         # Icon: icon "check-circle" [size "huge"] [color "green"]
-        if match := re.match(r"icon\s+[\"8]?([^\"']+)[\"']?(?:\s+size\s+[\"']?(\w+)[\"']?)?(?:\s+color\s+[\"']?(\w+)[\"']?)?", line, re.IGNORECASE):
-            return IconNode(line_number=line_num, raw_line=line, icon_name=match.group(1), size=match.group(2) or "medium", color=match.group(3) or "currentColor")
+        if match := PATTERNS['icon'].match(line):
+            return IconNode(line_number=line_num, raw_line=source, icon_name=match.group(1), size=match.group(2) or "medium", color=match.group(3) or "currentColor")
 
         # Image: image "url" or image item.image
-        if match := re.match(r"image\s+(.+)", line, re.IGNORECASE):
-            return ImageNode(line_number=line_num, raw_line=line, src=match.group(1).strip())
+        if match := PATTERNS['image'].match(line):
+            return ImageNode(line_number=line_num, raw_line=source, src=match.group(1).strip())
 
         # Layout Blocks: sidebar, main, header, footer
-        if match := re.match(r"(sidebar|main|header|footer)", line, re.IGNORECASE):
+        if match := PATTERNS['layout_block'].match(line):
             block_type = match.group(1).lower()
             indent = self._get_indent(all_lines[current_idx])
             next_lines = all_lines[current_idx + 1:]
             child_indent = self._get_next_indent(next_lines, indent)
             children = self._parse_lines(
-                next_lines, parent_indent=child_indent)
-            return LayoutBlockNode(line_number=line_num, raw_line=line, block_type=block_type, children=children)
+                next_lines, parent_indent=child_indent, line_offset=line_num)
+            return LayoutBlockNode(line_number=line_num, raw_line=source, block_type=block_type, children=children)
 
         # Input: input username
-        if match := re.match(r"input\s+(\w+)", line, re.IGNORECASE):
+        if match := PATTERNS['input'].match(line):
             var_name = match.group(1)
-            return InputNode(line_number=line_num, raw_line=line, binding=var_name)
+            return InputNode(line_number=line_num, raw_line=source, binding=var_name)
 
         return None
 
-    def _parse_if_block(self, lines: List[str], base_indent: int) -> Tuple[List[ASTNode], Optional[List[ASTNode]]]:
+    def _split_repeater_expr(self, expr: str) -> Tuple[str, Optional[int], bool, Optional[int]]:
+        """Split 'products columns 3 virtual 120' into (items_expr, columns, virtual, row_height)"""
+        tokens = expr.split()
+        columns = None
+        virtual = False
+        row_height = None
+
+        if len(tokens) > 2 and tokens[-2].lower() == 'virtual' and tokens[-1].isdigit():
+            virtual, row_height = True, int(tokens[-1])
+            tokens = tokens[:-2]
+        elif len(tokens) > 1 and tokens[-1].lower() == 'virtual':
+            virtual = True
+            tokens = tokens[:-1]
+
+        if len(tokens) > 2 and tokens[-2].lower() == 'columns' and tokens[-1].isdigit():
+            columns = int(tokens[-1])
+            tokens = tokens[:-2]
+
+        return " ".join(tokens), columns, virtual, row_height
+
+    def _split_on_word(self, text: str, word: str) -> Optional[Tuple[str, str]]:
+        """'item to cart' -> ('item', 'cart'), splitting on the last standalone 'word'
+        with text on both sides; None when there is no such word"""
+        tokens = list(_TOKEN.finditer(text))
+        split = None
+        for token in tokens[1:-1]:
+            if token.group().lower() == word:
+                split = token
+        if split is None:
+            return None
+        return text[:split.start()].rstrip(), text[split.end():].lstrip()
+
+    def _parse_if_block(self, lines: List[str], base_indent: int, line_offset: int = 0) -> Tuple[List[ASTNode], Optional[List[ASTNode]]]:
         """Parse if body and optional else body"""
         if_body = []
         else_body = None
@@ -459,13 +554,14 @@ class LogicParser:
 
         # Parse if body
         if_lines = lines[:else_start] if else_start else lines
-        if_body = self._parse_lines(if_lines, parent_indent=base_indent + 4)
+        if_body = self._parse_lines(
+            if_lines, parent_indent=base_indent + 4, line_offset=line_offset)
 
         # Parse else body
         if else_start is not None:
             else_lines = lines[else_start + 1:]
             else_body = self._parse_lines(
-                else_lines, parent_indent=base_indent + 4)
+                else_lines, parent_indent=base_indent + 4, line_offset=line_offset + else_start + 1)
 
         return if_body, else_body
 
@@ -515,10 +611,7 @@ class LogicParser:
         # Handle "score > 5", "x == y", "name is 'John'"
 
         # Natural language operators
-        expr = re.sub(r'\s+is\s+', ' == ', expr, flags=re.IGNORECASE)
-        expr = re.sub(r'\s+equals\s+', ' == ', expr, flags=re.IGNORECASE)
-        expr = re.sub(r'\s+greater\s+than\s+', ' > ',
-                      expr, flags=re.IGNORECASE)
-        expr = re.sub(r'\s+less\s+than\s+', ' < ', expr, flags=re.IGNORECASE)
+        for pattern, operator in CONDITION_REWRITES:
+            expr = pattern.sub(operator, expr)
 
         return self._parse_expression(expr)
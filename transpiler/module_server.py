@@ -0,0 +1,128 @@
+"""
+Aura Module Server - In-memory generated modules for the Vite dev server
+The dev server publishes each build's src modules here instead of writing them
+to .aura_engine/src; the aura-modules Vite plugin loads them as virtual:aura/*
+imports and reloads the ones a build changed as soon as they are pushed.
+
+Endpoints:
+    GET /modules          {"version": N, "modules": [path, ...]}
+    GET /modules/<path>   module source
+    GET /events           server-sent events: {"version", "modules", "changed"}
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import unquote
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "AuraModules/1.0"
+
+    def do_GET(self):
+        store = self.server.store
+        path = unquote(self.path.split('?', 1)[0])
+        if path == '/modules':
+            self._send(200, 'application/json', json.dumps(store.manifest()))
+        elif path.startswith('/modules/'):
+            code = store.modules.get(path[len('/modules/'):])
+            if code is None:
+                self._send(404, 'text/plain', 'not found')
+            else:
+                mime = 'application/json' if path.endswith('.map') else 'text/javascript'
+                self._send(200, mime, code)
+        elif path == '/events':
+            self._stream_events(store)
+        else:
+            self._send(404, 'text/plain', 'not found')
+
+    def _send(self, status, mime, body):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', f'{mime}; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _stream_events(self, store):
+        # Read before the headers go out so a publish racing the connect is not missed
+        version = store.version
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        try:
+            while not store.closed:
+                event = store.wait(version, timeout=ModuleServer.KEEPALIVE)
+                if event is None:
+                    self.wfile.write(b": keepalive\n\n")
+                else:
+                    version = event['version']
+                    self.wfile.write(f"data: {json.dumps(event)}\n\n".encode('utf-8'))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass  # Vite polls constantly; keep the dev console quiet
+
+
+class ModuleServer:
+    """Holds the latest build's generated modules and pushes what changed"""
+
+    KEEPALIVE = 15  # seconds between SSE comments on an idle stream
+
+    def __init__(self, host='127.0.0.1', port=0):
+        self.modules: Dict[str, str] = {}
+        self.version = 0
+        self.closed = False
+        self._last_event = None
+        self._changed = threading.Condition()
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.store = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        with self._changed:
+            self.closed = True
+            self._changed.notify_all()
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def manifest(self) -> Dict:
+        return {'version': self.version, 'modules': sorted(self.modules)}
+
+    def publish(self, modules: Dict[str, str]) -> List[str]:
+        """Replaces the module set with a new build; returns the paths whose code changed"""
+        changed = sorted(path for path, code in modules.items() if self.modules.get(path) != code)
+        removed = set(self.modules) - set(modules)
+        if not changed and not removed:
+            return []
+        with self._changed:
+            self.modules = dict(modules)
+            self.version += 1
+            self._last_event = dict(self.manifest(), changed=changed, published=time.time())
+            self._changed.notify_all()
+        return changed
+
+    def wait(self, version, timeout=None):
+        """Blocks until a version newer than 'version' is published; None on timeout/close"""
+        with self._changed:
+            self._changed.wait_for(lambda: self.closed or self.version > version, timeout)
+            if self.closed or self.version <= version:
+                return None
+            return self._last_event
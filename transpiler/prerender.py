@@ -0,0 +1,299 @@
+"""
+Aura Prerender - Static HTML for the initial state of generated pages
+Renders the element trees HTMLGenerator builds (with initial state values) to
+markup that is injected into per-route index.html files for React to hydrate.
+Pages are rendered in parallel worker processes.
+"""
+
+import json
+import re
+from concurrent.futures import ProcessPoolExecutor
+from html import escape
+from typing import Any, Dict, List, Optional
+
+VOID_TAGS = {'img', 'input', 'hr', 'br', 'source', 'meta', 'link', 'area', 'col', 'wbr'}
+ATTRIBUTE_NAMES = {'className': 'class', 'htmlFor': 'for', 'srcSet': 'srcset', 'to': 'href'}
+_PATH = re.compile(r"[A-Za-z_$][\w$]*(?:\.[A-Za-z_$][\w$]*)*")
+
+
+def js_value(literal: Any) -> Any:
+    """Initial state as written in the JSX (e.g. "[]", "'guest'", "0") -> Python value"""
+    if not isinstance(literal, str):
+        return literal
+    text = literal.strip()
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in "'\"":
+        return text[1:-1]
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def _split_plus(expr: str) -> List[str]:
+    """Splits 'a + "b" + sum(c)' on top-level '+' signs"""
+    parts, depth, quote, start = [], 0, None, 0
+    for i, char in enumerate(expr):
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"`":
+            quote = char
+        elif char in '([{':
+            depth += 1
+        elif char in ')]}':
+            depth -= 1
+        elif char == '+' and not depth:
+            parts.append(expr[start:i])
+            start = i + 1
+    parts.append(expr[start:])
+    return parts
+
+
+def _sum(values) -> float:
+    """Python twin of the generated sum() helper"""
+    total = 0
+    for value in values or []:
+        candidates = [value.get('price')] if isinstance(value, dict) else []
+        candidates.append(value)
+        for candidate in candidates:
+            try:
+                number = float(candidate)
+            except (TypeError, ValueError):
+                continue
+            if number:
+                total += number
+                break
+    return total
+
+
+def evaluate(expr: str, scope: Dict) -> Any:
+    """Evaluates the binding subset the generator emits; raises ValueError otherwise"""
+    expr = expr.strip()
+    parts = _split_plus(expr)
+    if len(parts) > 1:
+        values = [evaluate(part, scope) for part in parts]
+        if any(isinstance(value, str) for value in values):
+            return "".join(to_text(value) for value in values)
+        return sum(values)
+    if len(expr) >= 2 and expr[0] == expr[-1] and expr[0] in "'\"`":
+        return expr[1:-1]
+    if re.fullmatch(r"-?\d+(\.\d+)?", expr):
+        return float(expr) if '.' in expr else int(expr)
+    if match := re.fullmatch(r"sum\((.+)\)", expr):
+        return _sum(evaluate(match.group(1), scope))
+    if _PATH.fullmatch(expr):
+        root, *attrs = expr.split('.')
+        if root not in scope:
+            raise ValueError(f"unknown name '{root}'")
+        value = scope[root]
+        for attr in attrs:
+            if attr == 'length' and isinstance(value, (list, str)):
+                value = len(value)
+            elif isinstance(value, dict):
+                value = value.get(attr)
+            else:
+                raise ValueError(f"cannot read '{attr}'")
+        return value
+    raise ValueError(f"unsupported expression '{expr}'")
+
+
+def to_text(value: Any) -> str:
+    """How React prints a value as a text child"""
+    if value is None or isinstance(value, bool):
+        return ""
+    if isinstance(value, float):
+        return str(int(value)) if value.is_integer() else repr(value)
+    if isinstance(value, list):
+        return "".join(to_text(item) for item in value)
+    if isinstance(value, dict):
+        raise ValueError("objects are not valid as a React child")
+    return str(value)
+
+
+def _text_html(text: str, scope: Dict) -> str:
+    """Text with {bindings}; adjacent text nodes get React's <!-- --> separator"""
+    nodes = []
+    for i, segment in enumerate(re.split(r"(\{[^{}]*\})", text)):
+        if i % 2:
+            try:
+                segment = to_text(evaluate(segment[1:-1], scope))
+            except ValueError:
+                segment = ""
+        if segment:
+            nodes.append(escape(segment, quote=False))
+    return "<!-- -->".join(nodes)
+
+
+def _style(value: str) -> Optional[str]:
+    """'{{ color: 'red' }}' -> 'color:red'"""
+    pairs = re.findall(r"(\w+)\s*:\s*'([^']*)'", value)
+    return ";".join(re.sub(r"[A-Z]", lambda m: '-' + m.group(0).lower(), key) + ':' + val
+                    for key, val in pairs) or None
+
+
+def _attributes(props: Dict, scope: Dict) -> str:
+    parts = []
+    for key, value in props.items():
+        if key == 'ref' or key.startswith('on') or value is None:
+            continue
+        if key == 'style':
+            value = _style(value)
+        elif isinstance(value, str) and value.startswith('{') and value.endswith('}'):
+            try:
+                value = evaluate(value[1:-1], scope)
+            except ValueError:
+                continue
+        if value is None:
+            continue
+        parts.append(f' {ATTRIBUTE_NAMES.get(key, key)}="{escape(to_text(value))}"')
+    return "".join(parts)
+
+
+class _Renderer:
+    def __init__(self, virtualize_threshold):
+        self.virtualize_threshold = virtualize_threshold
+        self.out = []
+
+    def elements(self, elements, scope, slot_html=""):
+        for el in elements:
+            if isinstance(el, dict) and 'id' in el:
+                self.element(el, scope, slot_html)
+
+    def element(self, el, scope, slot_html):
+        tag = el['type']
+        if tag == 'SLOT':
+            self.out.append(slot_html)
+            return
+        tag = {'Link': 'a'}.get(tag, tag.replace('motion.', ''))
+        attrs = _attributes(el['props'], scope)
+
+        repeater = el.get('repeater')
+        if repeater:
+            try:
+                items = evaluate(repeater['data'], scope) or []
+            except ValueError:
+                items = []
+            if repeater.get('virtual') or self.virtualize_threshold is not None:
+                threshold = 0 if repeater.get('virtual') else self.virtualize_threshold
+                self.virtual_repeater(el, repeater, items, threshold, scope, slot_html)
+                return
+            self.out.append(f"<{tag}{attrs}>")
+            self.repeat(el, repeater, items, scope, slot_html)
+            self.out.append(f"</{tag}>")
+            return
+
+        image = el.get('image')
+        if image and image.get('sources'):
+            self.out.append("<picture>")
+            for mime, srcset in image['sources'].items():
+                self.out.append(f'<source type="{mime}" srcset="{escape(srcset)}" sizes="{escape(image["sizes"])}"/>')
+        if tag in VOID_TAGS:
+            self.out.append(f"<{tag}{attrs}/>")
+        else:
+            self.out.append(f"<{tag}{attrs}>")
+            if el.get('children'):
+                self.elements(el['children'], scope, slot_html)
+            elif el.get('text_content'):
+                self.out.append(_text_html(str(el['text_content']), scope))
+            self.out.append(f"</{tag}>")
+        if image and image.get('sources'):
+            self.out.append("</picture>")
+
+    def repeat(self, el, repeater, items, scope, slot_html):
+        for index, item in enumerate(items):
+            self.elements(el['children'], dict(scope, **{repeater.get('item_name', 'item'): item, 'index': index}),
+                          slot_html)
+
+    def virtual_repeater(self, el, repeater, items, threshold, scope, slot_html):
+        """Mirrors VirtualRepeater's first render (no viewport measured yet)"""
+        class_name = escape(el['props'].get('className', ''))
+        if len(items) <= threshold:
+            self.out.append(f'<div class="{class_name}">')
+            self.repeat(el, repeater, items, scope, slot_html)
+            self.out.append("</div>")
+            return
+        columns = repeater.get('columns', 1) or 1
+        row_size = repeater.get('row_height') or 120
+        row_count = -(-len(items) // columns)
+        self.out.append('<div class="w-full" style="height:70vh;overflow-y:auto">')
+        self.out.append(f'<div style="position:relative;height:{row_count * row_size}px">')
+        for row in range(min(row_count, 3)):
+            top = f"{row * row_size}px" if row else "0"
+            self.out.append(f'<div class="grid pb-4 {escape(repeater.get("gap", "gap-4"))}" '
+                            f'style="position:absolute;top:{top};left:0;right:0;'
+                            f'grid-template-columns:repeat({columns}, minmax(0, 1fr))">')
+            self.repeat(el, repeater, items[row * columns:(row + 1) * columns], scope, slot_html)
+            self.out.append("</div>")
+        self.out.append("</div></div>")
+
+
+def _wrap(html: str, wrappers: List[str]) -> str:
+    for class_name in reversed(wrappers):
+        html = f'<div class="{escape(class_name)}">{html}</div>'
+    return html
+
+
+_LINK_CLASS = "px-3 py-2 rounded-md text-sm font-medium transition-colors "
+_LINK_ACTIVE = "text-blue-500 bg-gray-100 dark:bg-gray-800"
+_LINK_IDLE = "text-gray-700 dark:text-gray-200 hover:text-blue-500"
+# lucide-react's <Menu size={24} />
+_MENU_ICON = ('<svg xmlns="http://www.w3.org/2000/svg" width="24" height="24" viewBox="0 0 24 24" fill="none" '
+              'stroke="currentColor" stroke-width="2" stroke-linecap="round" stroke-linejoin="round" '
+              'class="lucide lucide-menu"><line x1="4" x2="20" y1="12" y2="12"></line>'
+              '<line x1="4" x2="20" y1="6" y2="6"></line><line x1="4" x2="20" y1="18" y2="18"></line></svg>')
+
+
+def navbar_html(navbar: Dict, pathname: str) -> str:
+    """The first render of the generated Navbar.jsx at pathname (menu closed)"""
+    links = "".join(
+        f'<a class="{_LINK_CLASS}{_LINK_ACTIVE if path == pathname else _LINK_IDLE}" href="{escape(path)}">'
+        f'{escape(label, quote=False)}</a>' for label, path in navbar['links'])
+    return ('<nav class="sticky top-0 z-50 bg-white/80 dark:bg-gray-900/80 backdrop-blur-md border-b '
+            'border-gray-200 dark:border-gray-800"><div class="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8">'
+            '<div class="flex items-center justify-between h-16"><div class="flex items-center">'
+            '<a class="text-xl font-bold bg-gradient-to-r from-blue-600 to-purple-600 bg-clip-text '
+            f'text-transparent" href="/">{escape(navbar["logo"], quote=False)}</a></div>'
+            f'<div class="hidden md:block"><div class="ml-10 flex items-baseline space-x-4">{links}</div></div>'
+            '<div class="-mr-2 flex md:hidden"><button class="inline-flex items-center justify-center p-2 '
+            'rounded-md text-gray-700 dark:text-gray-200 hover:text-blue-500 focus:outline-none">'
+            f'{_MENU_ICON}</button></div></div></div></nav>')
+
+
+def render_page(job: Dict) -> str:
+    """
+    job: {'page': tree, 'layout': tree or None, 'globals': {...},
+          'virtualize_threshold': int or None, 'suspense': bool,
+          'navbar': {'logo', 'links': [(label, path)]} or None, 'pathname': str}
+    where a tree is HTMLGenerator.prerender_tree(). Renders what App renders:
+    the global navbar, then the page inside its layout (and Suspense boundary).
+    """
+    globals_scope = {name: js_value(value) for name, value in job.get('globals', {}).items()}
+
+    def render(tree, slot_html=""):
+        scope = dict(globals_scope)
+        scope.update({name: js_value(value) for name, value in tree['states'].items()})
+        renderer = _Renderer(job.get('virtualize_threshold'))
+        renderer.elements(tree['elements'], scope, slot_html)
+        return _wrap("".join(renderer.out), tree['wrappers'])
+
+    html = render(job['page'])
+    if job.get('layout'):
+        html = render(job['layout'], html)
+    if job.get('suspense'):
+        # Completed Suspense boundary markers, as React's server renderer writes them
+        html = f"<!--$-->{html}<!--/$-->"
+    if job.get('navbar'):
+        html = navbar_html(job['navbar'], job.get('pathname', '/')) + html
+    return html
+
+
+def prerender_pages(jobs: Dict[str, Dict], workers: Optional[int] = None) -> Dict[str, str]:
+    """Renders {route: job} in a process pool; returns {route: html}"""
+    routes = list(jobs)
+    if len(routes) > 1 and workers != 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return dict(zip(routes, pool.map(render_page, [jobs[route] for route in routes])))
+        except (OSError, NotImplementedError) as e:
+            print(f"[Prerender] ⚠️ Process pool unavailable ({e}), rendering sequentially")
+    return {route: render_page(jobs[route]) for route in routes}
@@ -0,0 +1,171 @@
+"""
+Aura Regex Audit - Backtracking checks for every parser grammar rule
+Builds a matching witness string for each pattern, pumps characters in at every
+position and times the match at two input sizes. A rule whose time grows much
+faster than its input (quadratic or worse backtracking) is reported as superlinear.
+
+Run: python -m transpiler.regex_audit
+"""
+
+import time
+from typing import Dict, Iterator, Pattern, Tuple
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+try:
+    from .aura_parser import grammar
+    from .logic_parser import PATTERNS, CONDITION_REWRITES
+except ImportError:
+    from aura_parser import grammar
+    from logic_parser import PATTERNS, CONDITION_REWRITES
+
+SMALL = 128          # pumped repetitions for the baseline timing
+GROWTH = 4           # the large input is GROWTH times longer
+# Linear rules scale ~GROWTH x; quadratic ones ~GROWTH**2 x
+SUPERLINEAR_RATIO = GROWTH * 2.5
+MIN_SECONDS = 0.001  # a linear match over a few hundred characters takes microseconds
+
+_CATEGORIES = {
+    'CATEGORY_DIGIT': str.isdigit,
+    'CATEGORY_NOT_DIGIT': lambda c: not c.isdigit(),
+    'CATEGORY_SPACE': str.isspace,
+    'CATEGORY_NOT_SPACE': lambda c: not c.isspace(),
+    'CATEGORY_WORD': lambda c: c.isalnum() or c == '_',
+    'CATEGORY_NOT_WORD': lambda c: not (c.isalnum() or c == '_'),
+}
+_CANDIDATES = "a1 _'\"x-.,"
+
+
+def grammar_rules() -> Dict[str, Tuple[Pattern, str]]:
+    """{rule name: (pattern, 'match' | 'search')} for AuraParser, its actions and LogicParser"""
+    rules = {}
+    aura = grammar()
+    for name, pattern in aura.patterns.items():
+        rules[f"aura.{name}"] = (pattern, 'match')
+    seen = set()
+    for keyword, actions in aura.actions_by_keyword.items():
+        for pattern, _ in actions:
+            if pattern not in seen:
+                seen.add(pattern)
+                rules[f"action.{keyword}.{len(seen)}"] = (pattern, 'match')
+    rules["action.split"] = (aura.action_split, 'search')
+    for name, pattern in PATTERNS.items():
+        rules[f"logic.{name}"] = (pattern, 'match')
+    for i, (pattern, _) in enumerate(CONDITION_REWRITES):
+        rules[f"logic.condition.{i}"] = (pattern, 'search')
+    return rules
+
+
+def _in_set(char, items) -> bool:
+    negate, hit = False, False
+    for op, value in items:
+        name = str(op)
+        if name == 'NEGATE':
+            negate = True
+        elif name == 'LITERAL':
+            hit = hit or ord(char) == value
+        elif name == 'RANGE':
+            hit = hit or value[0] <= ord(char) <= value[1]
+        elif name == 'CATEGORY':
+            hit = hit or _CATEGORIES.get(str(value), lambda c: False)(char)
+    return hit != negate
+
+
+def _witness(items) -> str:
+    out = []
+    for op, value in items:
+        name = str(op)
+        if name == 'LITERAL':
+            out.append(chr(value))
+        elif name == 'NOT_LITERAL':
+            out.append(next(c for c in _CANDIDATES if ord(c) != value))
+        elif name == 'ANY':
+            out.append('a')
+        elif name == 'IN':
+            out.append(next((c for c in _CANDIDATES if _in_set(c, value)), 'a'))
+        elif name == 'BRANCH':
+            out.append(_witness(value[1][0]))
+        elif name == 'SUBPATTERN':
+            out.append(_witness(value[-1]))
+        elif name in ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT'):
+            low, _, body = value
+            # Optional parts are included so the pumps reach them
+            out.append(_witness(body) * max(low, 1))
+    return "".join(out)
+
+
+def witness(pattern: Pattern) -> str:
+    """A string the pattern matches, exercising every optional part"""
+    return _witness(sre_parse.parse(pattern.pattern, pattern.flags))
+
+
+def attack_inputs(pattern: Pattern) -> Iterator[Tuple[str, str, str]]:
+    """(prefix, pump, suffix): pump is repeated after a witness prefix, suffix breaks the match"""
+    text = witness(pattern)
+    for i in range(len(text) + 1):
+        pumps = {' ', 'a', 'a ', ' a', text[i - 1:i], text[i:i + 1]} - {''}
+        for pump in sorted(pumps):
+            for suffix in ('', '!'):
+                yield text[:i], pump, suffix
+
+
+def _time(pattern, mode, text, repeat=1) -> float:
+    run = pattern.match if mode == 'match' else pattern.search
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def audit_rule(pattern: Pattern, mode: str = 'match', small: int = SMALL) -> Dict:
+    """Worst large/small timing ratio over the attack inputs; stops at the first superlinear one"""
+    worst = {'ratio': 0.0, 'seconds': 0.0, 'input': None, 'superlinear': False}
+    for prefix, pump, suffix in attack_inputs(pattern):
+        large_text = prefix + pump * (small * GROWTH) + suffix
+        if _time(pattern, mode, large_text) < MIN_SECONDS:
+            continue  # too fast to matter at this size
+        # Confirm with best-of-3 so a scheduler hiccup is not reported as backtracking
+        large = _time(pattern, mode, large_text, repeat=3)
+        if large < MIN_SECONDS:
+            continue
+        base = max(_time(pattern, mode, prefix + pump * small + suffix, repeat=3), 1e-7)
+        ratio = large / base
+        if ratio > worst['ratio']:
+            worst.update(ratio=ratio, seconds=large, input=(prefix, pump, suffix))
+        if ratio > SUPERLINEAR_RATIO:
+            worst['superlinear'] = True
+            break
+    return worst
+
+
+def audit(rules=None) -> Dict[str, Dict]:
+    rules = rules if rules is not None else grammar_rules()
+    return {name: audit_rule(pattern, mode) for name, (pattern, mode) in rules.items()}
+
+
+def main():
+    results = audit()
+    print(f"[Regex Audit] {len(results)} grammar rules, pumped {SMALL} vs {SMALL * GROWTH} times")
+    failures = 0
+    for name, result in sorted(results.items(), key=lambda item: -item[1]['ratio']):
+        flag = "❌ superlinear" if result['superlinear'] else "✓"
+        if result['superlinear']:
+            failures += 1
+            prefix, pump, suffix = result['input']
+            flag += f"  (prefix {prefix!r} + {pump!r} * n + {suffix!r})"
+        if result['input'] is None:
+            print(f"  {name:<28} {'':>8} {'< 1':>8} ms  {flag}")
+        else:
+            print(f"  {name:<28} x{result['ratio']:7.1f} {result['seconds'] * 1000:8.2f} ms  {flag}")
+    print(f"[Regex Audit] {failures} superlinear rule(s)")
+    return failures
+
+
+if __name__ == "__main__":
+    raise SystemExit(1 if main() else 0)
@@ -2,19 +2,18 @@
 Semantic AST Nodes - High-level intent-based UI components
 """
 
-from dataclasses import dataclass
 from typing import List, Optional
-from transpiler.ast_nodes import ASTNode
+from transpiler.ast_nodes import ASTNode, node
 from transpiler.ui_nodes import UINode
 
 
-@dataclass
+@node
 class SemanticNode(UINode):
     """Base for intent-first nodes"""
     pass
 
 
-@dataclass
+@node
 class HeroNode(SemanticNode):
     title: str
     subtitle: Optional[str] = None
@@ -22,14 +21,14 @@ class HeroNode(SemanticNode):
     image_url: Optional[str] = None
 
 
-@dataclass
+@node
 class FeatureNode(SemanticNode):
     title: str
     description: Optional[str] = None
     icon: Optional[str] = None
 
 
-@dataclass
+@node
 class PricingNode(SemanticNode):
     plan_name: str
     price: str
@@ -37,25 +36,25 @@ class PricingNode(SemanticNode):
     is_premium: bool = False
 
 
-@dataclass
+@node
 class CtaNode(SemanticNode):
     title: str
     button_text: str
 
 
-@dataclass
+@node
 class BookingNode(SemanticNode):
     service_name: Optional[str] = None
     price_prefix: Optional[str] = None
 
 
-@dataclass
+@node
 class ContactNode(SemanticNode):
     email: Optional[str] = None
     show_form: bool = True
 
 
-@dataclass
+@node
 class IntentPageNode(SemanticNode):
     """
     A full product generated from a single intent string.
@@ -13,8 +13,9 @@ MODEL_FILENAME = "aura_brain_qwen.gguf"
 MODEL_PATH = os.path.join(BRAIN_DIR, MODEL_FILENAME)
 
 
-def ensure_aura_brain():
-    """Checks for the Aura Brain model and downloads it if missing."""
+def ensure_aura_brain(progress=None):
+    """Checks for the Aura Brain model and downloads it if missing.
+    progress, if given, is called with the fraction downloaded so far."""
 
     if os.path.exists(MODEL_PATH):
         return True
@@ -40,6 +41,8 @@ def ensure_aura_brain():
                 if chunk:
                     f.write(chunk)
                     downloaded += len(chunk)
+                    if progress and total_size:
+                        progress(downloaded / total_size)
                     # Simple progress indicator
                     done = int(50 * downloaded / total_size)
                     sys.stdout.write(
@@ -0,0 +1,82 @@
+"""
+Aura Source Maps - Streaming output buffer for generated JSX
+Tracks the output line/column while code is appended and records
+which .aura line produced each fragment (Source Map v3).
+"""
+
+from typing import List, Tuple
+
+_BASE64 = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+
+
+def encode_vlq(value: int) -> str:
+    """Base64 VLQ encoding used by the 'mappings' field"""
+    value = ((-value) << 1) | 1 if value < 0 else value << 1
+    encoded = []
+    while True:
+        digit = value & 31
+        value >>= 5
+        if value:
+            digit |= 32
+        encoded.append(_BASE64[digit])
+        if not value:
+            return "".join(encoded)
+
+
+def encode_mappings(mappings: List[Tuple[int, int, int]]) -> str:
+    """
+    Encode (generated_line, generated_column, source_line) triples, all 0-based,
+    into a v3 'mappings' string against a single source.
+    """
+    lines = []
+    prev_source_line = 0
+    for gen_line, gen_col, source_line in sorted(mappings):
+        while len(lines) <= gen_line:
+            lines.append([])
+        segments = lines[gen_line]
+        prev_col = segments[-1][0] if segments else 0
+        segments.append((gen_col, encode_vlq(gen_col - prev_col) + encode_vlq(0) +
+                         encode_vlq(source_line - prev_source_line) + encode_vlq(0)))
+        prev_source_line = source_line
+    return ";".join(",".join(segment for _, segment in segments) for segments in lines)
+
+
+class JSXWriter:
+    """Append-only output buffer that knows its current line/column"""
+
+    def __init__(self):
+        self._parts: List[str] = []
+        self.line = 0    # 0-based generated line
+        self.column = 0  # 0-based generated column
+        self.mappings: List[Tuple[int, int, int]] = []
+
+    def write(self, text: str):
+        self._parts.append(text)
+        newline = text.rfind('\n')
+        if newline == -1:
+            self.column += len(text)
+        else:
+            self.line += text.count('\n')
+            self.column = len(text) - newline - 1
+
+    def mark(self, source_line):
+        """Map the current output position to a 1-based .aura line"""
+        if source_line:
+            self.mappings.append((self.line, self.column, source_line - 1))
+
+    def getvalue(self) -> str:
+        return "".join(self._parts)
+
+
+def build_source_map(mappings, generated_file: str, source_file: str, source_content: str = None) -> dict:
+    """Assemble a Source Map v3 document for one generated file"""
+    source_map = {
+        "version": 3,
+        "file": generated_file,
+        "sources": [source_file.replace('\\', '/')],
+        "names": [],
+        "mappings": encode_mappings(mappings),
+    }
+    if source_content is not None:
+        source_map["sourcesContent"] = [source_content]
+    return source_map
@@ -0,0 +1,492 @@
+"""
+Aura Stylesheet - Used-class manifest and precomputed utility CSS
+Collects the Tailwind classes the transpiler emitted so the engine build can
+skip scanning sources, and can render the CSS for them directly.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+_CLASS_SITE = re.compile(r"\b(?:className|rowClassName)=|classList\.(?:add|remove|toggle)\(")
+_CLASS_TOKEN = re.compile(r"-?[A-Za-z0-9][\w:./\[\]%-]*")
+
+
+def _balanced(code: str, start: int) -> str:
+    """Text between the bracket at 'start' and its matching closer"""
+    opener = code[start]
+    closer = {'{': '}', '(': ')'}[opener]
+    depth = 0
+    for i in range(start, len(code)):
+        if code[i] == opener:
+            depth += 1
+        elif code[i] == closer:
+            depth -= 1
+            if not depth:
+                return code[start + 1:i]
+    return code[start + 1:]
+
+
+def _string_literals(expr: str) -> List[str]:
+    """String contents of a JS expression; template literals lose their ${...} parts"""
+    texts = [a or b for a, b in re.findall(r"'([^']*)'|\"([^\"]*)\"", expr)]
+    rest = re.sub(r"'[^']*'|\"[^\"]*\"", " ", expr)
+    for template in re.findall(r"`([^`]*)`", rest):
+        texts.append(re.sub(r"\$\{[^}]*\}", " ", template))
+    return texts
+
+
+def extract_classes(code: str) -> Set[str]:
+    """Every class name used in className/rowClassName props and classList calls"""
+    classes = set()
+    for match in _CLASS_SITE.finditer(code):
+        start = match.end()
+        if start >= len(code):
+            break
+        opener = code[start]
+        if opener in '"\'':
+            end = code.find(opener, start + 1)
+            texts = [code[start + 1:end]] if end != -1 else []
+        elif opener in '{(':
+            texts = _string_literals(_balanced(code, start))
+        else:
+            continue
+        for text in texts:
+            classes.update(token for token in text.split() if _CLASS_TOKEN.fullmatch(token))
+    return classes
+
+
+# --- Precomputed CSS -------------------------------------------------------
+
+_PALETTE = {
+    'gray': ['#f9fafb', '#f3f4f6', '#e5e7eb', '#d1d5db', '#9ca3af', '#6b7280', '#4b5563', '#374151', '#1f2937', '#111827', '#030712'],
+    'blue': ['#eff6ff', '#dbeafe', '#bfdbfe', '#93c5fd', '#60a5fa', '#3b82f6', '#2563eb', '#1d4ed8', '#1e40af', '#1e3a8a', '#172554'],
+    'indigo': ['#eef2ff', '#e0e7ff', '#c7d2fe', '#a5b4fc', '#818cf8', '#6366f1', '#4f46e5', '#4338ca', '#3730a3', '#312e81', '#1e1b4b'],
+    'purple': ['#faf5ff', '#f3e8ff', '#e9d5ff', '#d8b4fe', '#c084fc', '#a855f7', '#9333ea', '#7e22ce', '#6b21a8', '#581c87', '#3b0764'],
+    'red': ['#fef2f2', '#fee2e2', '#fecaca', '#fca5a5', '#f87171', '#ef4444', '#dc2626', '#b91c1c', '#991b1b', '#7f1d1d', '#450a0a'],
+    'green': ['#f0fdf4', '#dcfce7', '#bbf7d0', '#86efac', '#4ade80', '#22c55e', '#16a34a', '#15803d', '#166534', '#14532d', '#052e16'],
+}
+_SHADES = ['50', '100', '200', '300', '400', '500', '600', '700', '800', '900', '950']
+_NAMED_COLORS = {'white': '#ffffff', 'black': '#000000',
+                 'transparent': 'transparent', 'current': 'currentColor', 'inherit': 'inherit'}
+
+_SPACING_STEPS = {'0', 'px', '0.5', '1', '1.5', '2', '2.5', '3', '3.5', '4', '5', '6', '7', '8', '9', '10',
+                  '11', '12', '14', '16', '20', '24', '28', '32', '36', '40', '44', '48', '52', '56', '60',
+                  '64', '72', '80', '96'}
+_SCREENS = {'sm': 640, 'md': 768, 'lg': 1024, 'xl': 1280, '2xl': 1536}
+_PSEUDO = {'first': ':first-child', 'last': ':last-child', 'focus-within': ':focus-within',
+           'hover': ':hover', 'focus': ':focus', 'focus-visible': ':focus-visible',
+           'active': ':active', 'disabled': ':disabled'}
+
+_SANS = ('ui-sans-serif, system-ui, -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, '
+         '"Helvetica Neue", Arial, "Noto Sans", sans-serif, "Apple Color Emoji", "Segoe UI Emoji", '
+         '"Segoe UI Symbol", "Noto Color Emoji"')
+_MONO = 'ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, "Liberation Mono", "Courier New", monospace'
+
+_FONT_SIZES = {'xs': ('0.75rem', '1rem'), 'sm': ('0.875rem', '1.25rem'), 'base': ('1rem', '1.5rem'),
+               'lg': ('1.125rem', '1.75rem'), 'xl': ('1.25rem', '1.75rem'), '2xl': ('1.5rem', '2rem'),
+               '3xl': ('1.875rem', '2.25rem'), '4xl': ('2.25rem', '2.5rem'), '5xl': ('3rem', '1'),
+               '6xl': ('3.75rem', '1'), '7xl': ('4.5rem', '1'), '8xl': ('6rem', '1'), '9xl': ('8rem', '1')}
+_FONT_WEIGHTS = {'thin': 100, 'extralight': 200, 'light': 300, 'normal': 400, 'medium': 500,
+                 'semibold': 600, 'bold': 700, 'extrabold': 800, 'black': 900}
+_LEADING = {'none': '1', 'tight': '1.25', 'snug': '1.375', 'normal': '1.5', 'relaxed': '1.625', 'loose': '2'}
+_TRACKING = {'tighter': '-0.05em', 'tight': '-0.025em', 'normal': '0em', 'wide': '0.025em',
+             'wider': '0.05em', 'widest': '0.1em'}
+_RADII = {'none': '0px', 'sm': '0.125rem', '': '0.25rem', 'md': '0.375rem', 'lg': '0.5rem',
+          'xl': '0.75rem', '2xl': '1rem', '3xl': '1.5rem', 'full': '9999px'}
+_MAX_WIDTHS = {'none': 'none', 'xs': '20rem', 'sm': '24rem', 'md': '28rem', 'lg': '32rem', 'xl': '36rem',
+               '2xl': '42rem', '3xl': '48rem', '4xl': '56rem', '5xl': '64rem', '6xl': '72rem',
+               '7xl': '80rem', 'full': '100%', 'prose': '65ch'}
+_SHADOWS = {
+    'sm': '0 1px 2px 0 rgb(0 0 0 / 0.05)',
+    '': '0 1px 3px 0 rgb(0 0 0 / 0.1), 0 1px 2px -1px rgb(0 0 0 / 0.1)',
+    'md': '0 4px 6px -1px rgb(0 0 0 / 0.1), 0 2px 4px -2px rgb(0 0 0 / 0.1)',
+    'lg': '0 10px 15px -3px rgb(0 0 0 / 0.1), 0 4px 6px -4px rgb(0 0 0 / 0.1)',
+    'xl': '0 20px 25px -5px rgb(0 0 0 / 0.1), 0 8px 10px -6px rgb(0 0 0 / 0.1)',
+    '2xl': '0 25px 50px -12px rgb(0 0 0 / 0.25)',
+    'inner': 'inset 0 2px 4px 0 rgb(0 0 0 / 0.05)',
+    'none': '0 0 #0000',
+}
+_DROP_SHADOWS = {
+    'sm': 'drop-shadow(0 1px 1px rgb(0 0 0 / 0.05))',
+    '': 'drop-shadow(0 1px 2px rgb(0 0 0 / 0.1)) drop-shadow(0 1px 1px rgb(0 0 0 / 0.06))',
+    'md': 'drop-shadow(0 4px 3px rgb(0 0 0 / 0.07)) drop-shadow(0 2px 2px rgb(0 0 0 / 0.06))',
+    'lg': 'drop-shadow(0 10px 8px rgb(0 0 0 / 0.04)) drop-shadow(0 4px 3px rgb(0 0 0 / 0.1))',
+}
+_BLURS = {'sm': '4px', '': '8px', 'md': '12px', 'lg': '16px', 'xl': '24px', '2xl': '40px'}
+_TRANSITIONS = {
+    '': 'color, background-color, border-color, text-decoration-color, fill, stroke, opacity, box-shadow, transform, filter, backdrop-filter',
+    'all': 'all',
+    'colors': 'color, background-color, border-color, text-decoration-color, fill, stroke',
+    'opacity': 'opacity',
+    'shadow': 'box-shadow',
+    'transform': 'transform',
+}
+_GRADIENT_SIDES = {'t': 'top', 'tr': 'top right', 'r': 'right', 'br': 'bottom right',
+                   'b': 'bottom', 'bl': 'bottom left', 'l': 'left', 'tl': 'top left'}
+
+_TRANSFORM = ('transform: translate(var(--tw-translate-x), var(--tw-translate-y)) '
+              'scale(var(--tw-scale-x), var(--tw-scale-y))')
+_BOX_SHADOW = 'box-shadow: var(--tw-ring-offset-shadow), var(--tw-ring-shadow), var(--tw-shadow)'
+
+# Static utilities: class -> (order, declarations)
+_STATIC = {
+    'static': (10, 'position: static'), 'fixed': (10, 'position: fixed'),
+    'absolute': (10, 'position: absolute'), 'relative': (10, 'position: relative'),
+    'sticky': (10, 'position: sticky'),
+    'block': (30, 'display: block'), 'inline-block': (30, 'display: inline-block'),
+    'inline': (30, 'display: inline'), 'flex': (30, 'display: flex'),
+    'inline-flex': (30, 'display: inline-flex'), 'grid': (30, 'display: grid'),
+    'inline-grid': (30, 'display: inline-grid'), 'contents': (30, 'display: contents'),
+    'hidden': (30, 'display: none'),
+    'flex-1': (50, 'flex: 1 1 0%'), 'flex-auto': (50, 'flex: 1 1 auto'),
+    'flex-initial': (50, 'flex: 0 1 auto'), 'flex-none': (50, 'flex: none'),
+    'shrink-0': (51, 'flex-shrink: 0'), 'grow': (51, 'flex-grow: 1'),
+    'cursor-pointer': (57, 'cursor: pointer'), 'select-none': (58, 'user-select: none'),
+    'pointer-events-none': (58, 'pointer-events: none'),
+    'flex-row': (61, 'flex-direction: row'), 'flex-col': (61, 'flex-direction: column'),
+    'flex-row-reverse': (61, 'flex-direction: row-reverse'),
+    'flex-col-reverse': (61, 'flex-direction: column-reverse'),
+    'flex-wrap': (62, 'flex-wrap: wrap'), 'flex-nowrap': (62, 'flex-wrap: nowrap'),
+    'items-start': (63, 'align-items: flex-start'), 'items-end': (63, 'align-items: flex-end'),
+    'items-center': (63, 'align-items: center'), 'items-baseline': (63, 'align-items: baseline'),
+    'items-stretch': (63, 'align-items: stretch'),
+    'justify-start': (64, 'justify-content: flex-start'), 'justify-end': (64, 'justify-content: flex-end'),
+    'justify-center': (64, 'justify-content: center'),
+    'justify-between': (64, 'justify-content: space-between'),
+    'justify-around': (64, 'justify-content: space-around'),
+    'justify-evenly': (64, 'justify-content: space-evenly'),
+    'truncate': (71, 'overflow: hidden; text-overflow: ellipsis; white-space: nowrap'),
+    'whitespace-nowrap': (71, 'white-space: nowrap'),
+    'bg-clip-text': (95, '-webkit-background-clip: text; background-clip: text'),
+    'object-cover': (96, 'object-fit: cover'), 'object-contain': (96, 'object-fit: contain'),
+    'text-left': (110, 'text-align: left'), 'text-center': (110, 'text-align: center'),
+    'text-right': (110, 'text-align: right'), 'text-justify': (110, 'text-align: justify'),
+    'align-baseline': (111, 'vertical-align: baseline'), 'align-top': (111, 'vertical-align: top'),
+    'align-middle': (111, 'vertical-align: middle'), 'align-bottom': (111, 'vertical-align: bottom'),
+    'font-sans': (112, f'font-family: {_SANS}'), 'font-mono': (112, f'font-family: {_MONO}'),
+    'uppercase': (115, 'text-transform: uppercase'), 'lowercase': (115, 'text-transform: lowercase'),
+    'capitalize': (115, 'text-transform: capitalize'), 'normal-case': (115, 'text-transform: none'),
+    'italic': (116, 'font-style: italic'), 'not-italic': (116, 'font-style: normal'),
+    'underline': (120, 'text-decoration-line: underline'),
+    'line-through': (120, 'text-decoration-line: line-through'),
+    'no-underline': (120, 'text-decoration-line: none'),
+    'outline-none': (131, 'outline: 2px solid transparent; outline-offset: 2px'),
+    'ease-linear': (152, 'transition-timing-function: linear'),
+    'ease-in': (152, 'transition-timing-function: cubic-bezier(0.4, 0, 1, 1)'),
+    'ease-out': (152, 'transition-timing-function: cubic-bezier(0, 0, 0.2, 1)'),
+    'ease-in-out': (152, 'transition-timing-function: cubic-bezier(0.4, 0, 0.2, 1)'),
+}
+
+_SIDES = {'': [''], 'x': ['-left', '-right'], 'y': ['-top', '-bottom'],
+          't': ['-top'], 'r': ['-right'], 'b': ['-bottom'], 'l': ['-left']}
+
+PREFLIGHT = f"""*, ::before, ::after {{
+  box-sizing: border-box; border-width: 0; border-style: solid; border-color: #e5e7eb;
+  --tw-translate-x: 0; --tw-translate-y: 0; --tw-scale-x: 1; --tw-scale-y: 1;
+  --tw-ring-offset-width: 0px; --tw-ring-offset-color: #fff; --tw-ring-color: rgb(59 130 246 / 0.5);
+  --tw-ring-offset-shadow: 0 0 #0000; --tw-ring-shadow: 0 0 #0000; --tw-shadow: 0 0 #0000;
+}}
+html {{ line-height: 1.5; -webkit-text-size-adjust: 100%; tab-size: 4; font-family: {_SANS}; }}
+body {{ margin: 0; line-height: inherit; }}
+hr {{ height: 0; color: inherit; border-top-width: 1px; }}
+h1, h2, h3, h4, h5, h6 {{ font-size: inherit; font-weight: inherit; }}
+a {{ color: inherit; text-decoration: inherit; }}
+b, strong {{ font-weight: bolder; }}
+button, input, optgroup, select, textarea {{ font-family: inherit; font-size: 100%; font-weight: inherit; line-height: inherit; color: inherit; margin: 0; padding: 0; }}
+button, select {{ text-transform: none; }}
+button, [type='button'], [type='reset'], [type='submit'] {{ -webkit-appearance: button; background-color: transparent; background-image: none; }}
+blockquote, dl, dd, h1, h2, h3, h4, h5, h6, hr, figure, p, pre {{ margin: 0; }}
+ol, ul, menu {{ list-style: none; margin: 0; padding: 0; }}
+input::placeholder, textarea::placeholder {{ opacity: 1; color: #9ca3af; }}
+button, [role="button"] {{ cursor: pointer; }}
+img, svg, video, canvas, audio, iframe, embed, object {{ display: block; vertical-align: middle; }}
+img, video {{ max-width: 100%; height: auto; }}
+[hidden] {{ display: none; }}
+"""
+
+
+def _spacing(value: str, negative: bool = False) -> Optional[str]:
+    if value not in _SPACING_STEPS:
+        return None
+    if value == 'px':
+        size = '1px'
+    elif value == '0':
+        size = '0px'
+    else:
+        size = f"{float(value) * 0.25:g}rem"
+    return f"-{size}" if negative and value != '0' else size
+
+
+def _color(value: str) -> Optional[str]:
+    """'gray-900', 'white/80', 'blue-600' -> CSS color"""
+    value, _, alpha = value.partition('/')
+    if value in _NAMED_COLORS:
+        hex_color = _NAMED_COLORS[value]
+    else:
+        family, _, shade = value.rpartition('-')
+        if family not in _PALETTE or shade not in _SHADES:
+            return None
+        hex_color = _PALETTE[family][_SHADES.index(shade)]
+    if not alpha:
+        return hex_color
+    if not alpha.isdigit() or not hex_color.startswith('#'):
+        return None
+    r, g, b = (int(hex_color[i:i + 2], 16) for i in (1, 3, 5))
+    return f"rgb({r} {g} {b} / {int(alpha) / 100:g})"
+
+
+def _transparent(color: str) -> str:
+    if color.startswith('#'):
+        r, g, b = (int(color[i:i + 2], 16) for i in (1, 3, 5))
+        return f"rgb({r} {g} {b} / 0)"
+    if color.startswith('rgb('):
+        return color.rsplit('/', 1)[0].strip() + ' / 0)'
+    return 'transparent'
+
+
+def _size(value: str, axis: str) -> Optional[str]:
+    keywords = {'full': '100%', 'auto': 'auto', 'min': 'min-content', 'max': 'max-content',
+                'fit': 'fit-content', 'screen': '100vw' if axis == 'w' else '100vh'}
+    if value in keywords:
+        return keywords[value]
+    if re.fullmatch(r"\d+/\d+", value):
+        num, den = value.split('/')
+        return f"{int(num) / int(den) * 100:g}%"
+    return _spacing(value)
+
+
+def _utility(name: str) -> Optional[Tuple[float, str, str]]:
+    """Resolves a variant-free class to (order, declarations, selector suffix)"""
+    if name in _STATIC:
+        order, decls = _STATIC[name]
+        return order, decls, ''
+
+    negative = name.startswith('-')
+    base = name[1:] if negative else name
+
+    # Spacing: margin / padding / inset / gap / space
+    match = re.fullmatch(r"(m|p)([xytrbl]?)-(.+)", base)
+    if match:
+        kind, side, value = match.groups()
+        size = 'auto' if kind == 'm' and value == 'auto' else _spacing(value, negative)
+        if size is None or (negative and kind == 'p'):
+            return None
+        prop = 'margin' if kind == 'm' else 'padding'
+        order = (20 if kind == 'm' else 100) + (0 if not side else 0.1 if side in 'xy' else 0.2)
+        return order, "; ".join(f"{prop}{suffix}: {size}" for suffix in _SIDES[side]), ''
+    match = re.fullmatch(r"(top|right|bottom|left|inset)-(.+)", base)
+    if match:
+        prop, value = match.groups()
+        size = _size(value, 'w') if value in ('full', 'auto') else _spacing(value, negative)
+        if size is None:
+            return None
+        props = ['top', 'right', 'bottom', 'left'] if prop == 'inset' else [prop]
+        return 11, "; ".join(f"{p}: {size}" for p in props), ''
+    match = re.fullmatch(r"z-(\d+|auto)", base)
+    if match and not negative:
+        return 12, f"z-index: {match.group(1)}", ''
+    match = re.fullmatch(r"gap(-[xy])?-(.+)", base)
+    if match and not negative:
+        size = _spacing(match.group(2))
+        prop = {None: 'gap', '-x': 'column-gap', '-y': 'row-gap'}[match.group(1)]
+        return (65, f"{prop}: {size}", '') if size else None
+    match = re.fullmatch(r"space-([xy])-(.+)", base)
+    if match:
+        size = _spacing(match.group(2), negative)
+        prop = 'margin-left' if match.group(1) == 'x' else 'margin-top'
+        return (66, f"{prop}: {size}", ' > :not([hidden]) ~ :not([hidden])') if size else None
+
+    if negative:
+        match = re.fullmatch(r"translate-([xy])-(.+)", base)
+        if match:
+            size = _spacing(match.group(2), True)
+            return (55, f"--tw-translate-{match.group(1)}: {size}; {_TRANSFORM}", '') if size else None
+        return None
+
+    # Sizing
+    match = re.fullmatch(r"(w|h)-(.+)", name)
+    if match:
+        size = _size(match.group(2), match.group(1))
+        prop = 'width' if match.group(1) == 'w' else 'height'
+        return (40, f"{prop}: {size}", '') if size else None
+    match = re.fullmatch(r"(min|max)-(w|h)-(.+)", name)
+    if match:
+        bound, axis, value = match.groups()
+        prop = f"{bound}-{'width' if axis == 'w' else 'height'}"
+        if bound == 'max' and axis == 'w':
+            size = _MAX_WIDTHS.get(value)
+        else:
+            size = {'0': '0px', 'full': '100%', 'screen': '100vw' if axis == 'w' else '100vh'}.get(value)
+        return (41, f"{prop}: {size}", '') if size else None
+
+    # Transforms
+    match = re.fullmatch(r"translate-([xy])-(.+)", name)
+    if match:
+        size = _size(match.group(2), 'w') if match.group(2) in ('full',) else _spacing(match.group(2))
+        return (55, f"--tw-translate-{match.group(1)}: {size}; {_TRANSFORM}", '') if size else None
+    match = re.fullmatch(r"scale-(?:(\d+)|\[([\d.]+)\])", name)
+    if match:
+        scale = f"{int(match.group(1)) / 100:g}" if match.group(1) else match.group(2)
+        return 56, f"--tw-scale-x: {scale}; --tw-scale-y: {scale}; {_TRANSFORM}", ''
+
+    # Grid / overflow
+    match = re.fullmatch(r"grid-cols-(\d+)", name)
+    if match:
+        return 60, f"grid-template-columns: repeat({match.group(1)}, minmax(0, 1fr))", ''
+    match = re.fullmatch(r"col-span-(\d+|full)", name)
+    if match:
+        span = '1 / -1' if match.group(1) == 'full' else f"span {match.group(1)} / span {match.group(1)}"
+        return 59, f"grid-column: {span}", ''
+    match = re.fullmatch(r"overflow(-[xy])?-(auto|hidden|visible|scroll)", name)
+    if match:
+        return 70 + (0.1 if match.group(1) else 0), f"overflow{match.group(1) or ''}: {match.group(2)}", ''
+
+    # Borders
+    match = re.fullmatch(r"rounded(?:-(none|sm|md|lg|xl|2xl|3xl|full))?", name)
+    if match:
+        return 80, f"border-radius: {_RADII[match.group(1) or '']}", ''
+    match = re.fullmatch(r"border(?:-([xytrbl]))?(?:-(0|2|4|8))?", name)
+    if match:
+        side, width = match.groups()
+        order = 81 + (0.1 if side in ('x', 'y') else 0.2 if side else 0)
+        return order, "; ".join(f"border{s}-width: {width or 1}px" for s in _SIDES[side or '']), ''
+    if name.startswith('border-'):
+        color = _color(name[7:])
+        return (82, f"border-color: {color}", '') if color else None
+
+    # Backgrounds and gradients
+    match = re.fullmatch(r"bg-gradient-to-(t|tr|r|br|b|bl|l|tl)", name)
+    if match:
+        return 91, f"background-image: linear-gradient(to {_GRADIENT_SIDES[match.group(1)]}, var(--tw-gradient-stops))", ''
+    if name.startswith('bg-'):
+        color = _color(name[3:])
+        return (90, f"background-color: {color}", '') if color else None
+    match = re.fullmatch(r"(from|via|to)-(.+)", name)
+    if match:
+        color = _color(match.group(2))
+        if not color:
+            return None
+        if match.group(1) == 'from':
+            return 92, (f"--tw-gradient-from: {color}; --tw-gradient-to: {_transparent(color)}; "
+                        "--tw-gradient-stops: var(--tw-gradient-from), var(--tw-gradient-to)"), ''
+        if match.group(1) == 'via':
+            return 93, (f"--tw-gradient-to: {_transparent(color)}; "
+                        f"--tw-gradient-stops: var(--tw-gradient-from), {color}, var(--tw-gradient-to)"), ''
+        return 94, f"--tw-gradient-to: {color}", ''
+
+    # Typography
+    if name.startswith('text-'):
+        value = name[5:]
+        if value in _FONT_SIZES:
+            size, line_height = _FONT_SIZES[value]
+            return 113, f"font-size: {size}; line-height: {line_height}", ''
+        color = _color(value)
+        return (119, f"color: {color}", '') if color else None
+    match = re.fullmatch(r"font-(\w+)", name)
+    if match and match.group(1) in _FONT_WEIGHTS:
+        return 114, f"font-weight: {_FONT_WEIGHTS[match.group(1)]}", ''
+    match = re.fullmatch(r"leading-(\w+)", name)
+    if match and match.group(1) in _LEADING:
+        return 117, f"line-height: {_LEADING[match.group(1)]}", ''
+    match = re.fullmatch(r"tracking-(\w+)", name)
+    if match and match.group(1) in _TRACKING:
+        return 118, f"letter-spacing: {_TRACKING[match.group(1)]}", ''
+
+    # Effects
+    match = re.fullmatch(r"opacity-(\d+)", name)
+    if match:
+        return 121, f"opacity: {int(match.group(1)) / 100:g}", ''
+    match = re.fullmatch(r"shadow(?:-(sm|md|lg|xl|2xl|inner|none))?", name)
+    if match:
+        return 130, f"--tw-shadow: {_SHADOWS[match.group(1) or '']}; {_BOX_SHADOW}", ''
+    match = re.fullmatch(r"ring(?:-(0|1|2|4|8))?", name)
+    if match:
+        width = match.group(1) or '3'
+        return 132, ("--tw-ring-offset-shadow: 0 0 0 var(--tw-ring-offset-width) var(--tw-ring-offset-color); "
+                     f"--tw-ring-shadow: 0 0 0 calc({width}px + var(--tw-ring-offset-width)) var(--tw-ring-color); "
+                     f"{_BOX_SHADOW}"), ''
+    if name.startswith('ring-'):
+        color = _color(name[5:])
+        return (133, f"--tw-ring-color: {color}", '') if color else None
+    match = re.fullmatch(r"drop-shadow(?:-(sm|md|lg))?", name)
+    if match:
+        return 140, f"filter: {_DROP_SHADOWS[match.group(1) or '']}", ''
+    match = re.fullmatch(r"backdrop-blur(?:-(sm|md|lg|xl|2xl))?", name)
+    if match:
+        blur = _BLURS[match.group(1) or '']
+        return 141, f"-webkit-backdrop-filter: blur({blur}); backdrop-filter: blur({blur})", ''
+    match = re.fullmatch(r"transition(?:-(all|colors|opacity|shadow|transform))?", name)
+    if match:
+        return 150, (f"transition-property: {_TRANSITIONS[match.group(1) or '']}; "
+                     "transition-timing-function: cubic-bezier(0.4, 0, 0.2, 1); transition-duration: 150ms"), ''
+    match = re.fullmatch(r"duration-(\d+)", name)
+    if match:
+        return 151, f"transition-duration: {match.group(1)}ms", ''
+    return None
+
+
+def _escape(class_name: str) -> str:
+    escaped = "".join(c if c.isalnum() or c in '-_' else '\\' + c for c in class_name)
+    if class_name[0].isdigit():
+        escaped = f"\\3{class_name[0]} " + escaped[1:]
+    return escaped
+
+
+def _rule(class_name: str):
+    """(sort key, media query, CSS rule) for one class, or None if it is not a known utility"""
+    *variants, name = class_name.split(':')
+    screen = None
+    dark = False
+    pseudos = []
+    for variant in variants:
+        if variant in _SCREENS and screen is None:
+            screen = variant
+        elif variant == 'dark':
+            dark = True
+        elif variant in _PSEUDO:
+            pseudos.append(variant)
+        else:
+            return None
+    resolved = _utility(name)
+    if not resolved:
+        return None
+    order, decls, suffix = resolved
+
+    queries = []
+    if screen:
+        queries.append(f"(min-width: {_SCREENS[screen]}px)")
+    if dark:
+        queries.append("(prefers-color-scheme: dark)")
+    pseudo_rank = max((list(_PSEUDO).index(p) + 1 for p in pseudos), default=0)
+    key = (list(_SCREENS).index(screen) + 1 if screen else 0, dark, pseudo_rank, order, class_name)
+    selector = "." + _escape(class_name) + "".join(_PSEUDO[p] for p in pseudos) + suffix
+    return key, " and ".join(queries), f"{selector} {{ {decls} }}"
+
+
+def build_stylesheet(classes: Iterable[str], preflight: bool = True) -> Tuple[str, List[str]]:
+    """Precomputes the CSS for 'classes'; returns (css, classes it could not resolve)"""
+    rules = []
+    unsupported = []
+    for class_name in set(classes):
+        rule = _rule(class_name)
+        if rule:
+            rules.append(rule)
+        else:
+            unsupported.append(class_name)
+    rules.sort(key=lambda rule: rule[0])
+
+    lines = ["/* Generated by Aura: precomputed utilities for the classes in aura-classes.json */"]
+    if preflight:
+        lines.append(PREFLIGHT)
+    media = None
+    for _, query, css in rules:
+        if query != media:
+            if media:
+                lines.append("}")
+            if query:
+                lines.append(f"@media {query} {{")
+            media = query
+        lines.append(f"  {css}" if query else css)
+    if media:
+        lines.append("}")
+    return "\n".join(lines) + "\n", sorted(unsupported)
@@ -0,0 +1,360 @@
+"""
+Aura Syntax Fixer - Deterministic fast path for Aura Brain corrections
+Most broken lines are keyword typos or missing filler words ("crete a butn",
+"with title"). Misspelled words are corrected against the command grammar's own
+vocabulary with a SymSpell-style delete index. Then up to MAX_EDITS filler
+words are inserted, substituted or dropped. Every candidate is validated
+against the grammar, and the LLM is only needed when none parses.
+"""
+
+import re
+from difflib import SequenceMatcher
+from itertools import combinations, islice, product
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+try:
+    from .aura_parser import ACTION_RULES, COMMAND_RULES, grammar
+except ImportError:
+    from aura_parser import ACTION_RULES, COMMAND_RULES, grammar
+
+MAX_DISTANCE = 2          # Damerau-Levenshtein budget for a misspelled word
+MAX_EDITS = 2             # filler words inserted/substituted/dropped per line
+MAX_CANDIDATES = 4000     # validation budget per line
+MAX_BASES = 64            # spellings of the line tried before any filler edits
+SUGGESTIONS_PER_WORD = 2
+FILLERS = ('the', 'a', 'an', 'with')
+ARTICLES = ('the', 'a', 'an')  # only inserted before a noun the grammar puts after one
+
+_TOKEN = re.compile(r"(?:'[^']*'|\"[^\"]*\"|\[[^\]]*\])\S*|\S+")
+_WORD = re.compile(r"([A-Za-z]+)([,.:;!?]*)$")
+# Whole-line rewrites applied before any word edits
+REWRITES = [
+    # When clicked show the card -> When clicked, show the card
+    (re.compile(r"^(when\s+\w+)\s+(?=[^,\s])", re.IGNORECASE), r"\1, "),
+]
+
+
+def _words(line: str) -> List[str]:
+    """Lowercase tokens without trailing punctuation, for comparing a fix with its line"""
+    return [token.lower().rstrip(',.:;!?') for token in _TOKEN.findall(line)]
+
+
+def _literal_words(items, words: List[str], current: List[str]):
+    """Collects the runs of literal letters in a parsed pattern"""
+    for op, value in items:
+        name = str(op)
+        if name == 'LITERAL' and chr(value).isalpha():
+            current.append(chr(value))
+            continue
+        if current:
+            words.append("".join(current))
+            current.clear()
+        if name == 'SUBPATTERN':
+            _literal_words(value[-1], words, current)
+        elif name == 'BRANCH':
+            for branch in value[1]:
+                _literal_words(branch, words, current)
+                if current:
+                    words.append("".join(current))
+                    current.clear()
+        elif name in ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT'):
+            _literal_words(value[2], words, current)
+        if current:
+            words.append("".join(current))
+            current.clear()
+
+
+def _article_nouns(items, states: Set[Tuple[Optional[str], str]], nouns: Set[str]) -> Set[Tuple[Optional[str], str]]:
+    """
+    Collects the words a parsed pattern has right after an article. states are
+    the (previous word, letters so far) pairs the pattern can be in before items.
+    """
+    def end_word(states, space):
+        ended = set()
+        for previous, letters in states:
+            if letters and previous in ARTICLES:
+                nouns.add(letters.lower())
+            ended.add(((letters.lower() or previous) if space else None, ""))
+        return ended
+
+    for op, value in items:
+        name = str(op)
+        if name == 'LITERAL' and chr(value).isalpha():
+            states = {(previous, letters + chr(value)) for previous, letters in states}
+        elif name == 'IN' and all(str(o) == 'CATEGORY' and str(v) == 'CATEGORY_SPACE' for o, v in value):
+            states = end_word(states, space=True)
+        elif name == 'SUBPATTERN':
+            states = _article_nouns(value[-1], states, nouns)
+        elif name == 'BRANCH':
+            states = set().union(*(_article_nouns(branch, states, nouns) for branch in value[1]))
+        elif name in ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT'):
+            low, high, body = value
+            once = _article_nouns(body, states, nouns)
+            again = _article_nouns(body, once, nouns) if high != 1 else set()
+            states = once | again | (states if low == 0 else set())
+        else:
+            states = end_word(states, space=False)  # quotes, \w+ values, punctuation
+    return states
+
+
+def article_nouns() -> Set[str]:
+    """Lowercase words some command or action has right after 'the', 'a' or 'an' ('the text', 'a card')"""
+    nouns = set()
+    sources = [rule[2] for rule in COMMAND_RULES] + [rule[1] for rule in ACTION_RULES]
+    for source in sources:
+        # A pattern ending on a word ends it too: 'Use the default theme'
+        for previous, letters in _article_nouns(sre_parse.parse(source), {(None, "")}, nouns):
+            if letters and previous in ARTICLES:
+                nouns.add(letters.lower())
+    return nouns
+
+
+def _is_literal(items) -> bool:
+    """Whether a parsed pattern only matches fixed words: 'show|hide', never '\\w+'"""
+    for op, value in items:
+        name = str(op)
+        if name == 'LITERAL':
+            continue
+        if name == 'IN' and all(str(o) == 'LITERAL' for o, _ in value):
+            continue
+        if name == 'SUBPATTERN' and _is_literal(value[-1]):
+            continue
+        if name == 'BRANCH' and all(_is_literal(branch) for branch in value[1]):
+            continue
+        return False
+    return True
+
+
+def _slot_groups(items, slots: Set[int]) -> Set[int]:
+    """Numbers of the capturing groups that hold the user's words (values, identifiers)"""
+    for op, value in items:
+        name = str(op)
+        if name == 'SUBPATTERN':
+            if value[0] is not None and not _is_literal(value[-1]):
+                slots.add(value[0])
+            _slot_groups(value[-1], slots)
+        elif name == 'BRANCH':
+            for branch in value[1]:
+                _slot_groups(branch, slots)
+        elif name in ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT'):
+            _slot_groups(value[2], slots)
+    return slots
+
+
+def grammar_vocabulary() -> Dict[str, Tuple[str, int]]:
+    """{lowercase word: (spelling in the grammar, number of rules using it)} over commands and actions"""
+    vocabulary = {}
+    # The 'then' between actions is a keyword too
+    sources = ([rule[2] for rule in COMMAND_RULES] + [rule[1] for rule in ACTION_RULES]
+               + [grammar().action_split.pattern])
+    for source in sources:
+        words = []
+        _literal_words(sre_parse.parse(source), words, [])
+        for word in set(words):
+            spelling, count = vocabulary.get(word.lower(), (word, 0))
+            vocabulary[word.lower()] = (spelling, count + 1)
+    return vocabulary
+
+
+def _deletes(word: str, distance: int) -> Set[str]:
+    found, frontier = {word}, {word}
+    for _ in range(distance):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))} - found
+        found |= frontier
+    return found
+
+
+def edit_distance(a: str, b: str, limit: int = MAX_DISTANCE) -> int:
+    """Damerau-Levenshtein (optimal string alignment); limit + 1 once it is exceeded"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2, previous = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        row = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            row[j] = min(previous[j] + 1, row[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                row[j] = min(row[j], previous2[j - 2] + 1)
+        if min(row) > limit:
+            return limit + 1
+        previous2, previous = previous, row
+    return previous[-1]
+
+
+class SyntaxFixer:
+    """Typo and filler-word corrector over the AuraParser command grammar"""
+
+    def __init__(self):
+        self.grammar = grammar()
+        self.vocabulary = grammar_vocabulary()
+        self.nouns = article_nouns()
+        self.slots: Dict[object, Set[int]] = {}  # { compiled pattern: its slot group numbers }
+        self.index: Dict[str, Set[str]] = {}  # { delete variant: words it comes from }
+        for word in self.vocabulary:
+            for variant in _deletes(word, MAX_DISTANCE):
+                self.index.setdefault(variant, set()).add(word)
+
+    def suggest(self, word: str) -> List[str]:
+        """Grammar words within edit distance of 'word': closest, same first letter, most used first"""
+        word = word.lower()
+        if word in self.vocabulary:
+            return [word]
+        # Three-letter words only get one edit, or 'hid' could become 'in' and 'id'
+        limit = 1 if len(word) <= 3 else MAX_DISTANCE
+        found = {}
+        for variant in _deletes(word, limit):
+            for candidate in self.index.get(variant, ()):
+                if candidate not in found:
+                    distance = edit_distance(word, candidate, limit)
+                    if distance <= limit:
+                        found[candidate] = distance
+        # Typos rarely hit the first letter: 'butn' is 'button' before 'out'
+        return sorted(found, key=lambda w: (found[w], w[0] != word[0], -self.vocabulary[w][1], w))
+
+    def _spellings(self, token: str) -> List[str]:
+        """The token followed by its corrections; quoted text and known words are kept"""
+        match = _WORD.match(token)
+        if not match or match.group(1).lower() in self.vocabulary:
+            return [token]
+        word, punctuation = match.groups()
+        if len(word) < 3:
+            return [token]
+        fixes = [self.vocabulary[w][0].lower() + punctuation for w in self.suggest(word)[:SUGGESTIONS_PER_WORD]]
+        return fixes + [token]
+
+    def _fillers(self, following: List[str]) -> Iterator[str]:
+        """
+        FILLERS that read right before the next token: articles only before a
+        noun the grammar has after one ('the card', never 'the me'), and 'an
+        input', not 'a input'
+        """
+        word = _WORD.match(following[0]) if following else None
+        if not word or word.group(1).lower() not in self.nouns:
+            return iter(('with',))
+        vowel = following[0][:1].lower() in 'aeiou'
+        return (f for f in FILLERS if not (f == 'a' and vowel or f == 'an' and not vowel))
+
+    def _filler_edits(self, tokens: List[str]) -> Iterator[List[str]]:
+        """Every single filler insertion, substitution of a short word, or removal of a repeat"""
+        for i in range(len(tokens) + 1):
+            for filler in self._fillers(tokens[i:]):
+                yield tokens[:i] + [filler] + tokens[i:]
+        for i in range(1, len(tokens)):
+            if _WORD.match(tokens[i]) and len(tokens[i]) <= 3:
+                for filler in self._fillers(tokens[i + 1:]):
+                    if tokens[i].lower() != filler:
+                        yield tokens[:i] + [filler] + tokens[i + 1:]
+            if _WORD.match(tokens[i]) and tokens[i].lower() == tokens[i - 1].lower():
+                yield tokens[:i] + tokens[i + 1:]
+
+    def _spelled(self, options: List[List[str]]) -> Iterator[List[str]]:
+        """
+        Every word at its best spelling, then one word kept or spelled otherwise,
+        then two, and so on: 'hide teh cart, then fcus on the email' has to keep
+        both 'cart' and 'email' as written
+        """
+        best = [spellings[0] for spellings in options]
+        respelled = [i for i, spellings in enumerate(options) if len(spellings) > 1]
+        for count in range(len(respelled) + 1):
+            for positions in combinations(respelled, count):
+                for others in product(*(options[i][1:] for i in positions)):
+                    tokens = list(best)
+                    for i, other in zip(positions, others):
+                        tokens[i] = other
+                    yield tokens
+
+    def candidates(self, line: str) -> Iterator[str]:
+        """Corrections to try, in order of how little they change the line"""
+        for pattern, replacement in REWRITES:
+            line = pattern.sub(replacement, line)
+        options = [self._spellings(token) for token in _TOKEN.findall(line)]
+        if not options:
+            return
+        seen = set()
+        level = list(islice(self._spelled(options), MAX_BASES))
+        for _ in range(MAX_EDITS + 1):
+            next_level = []
+            for tokens in level:
+                text = " ".join(tokens)
+                if text in seen:
+                    continue
+                seen.add(text)
+                yield text
+                if len(seen) >= MAX_CANDIDATES:
+                    return
+                next_level.append(tokens)
+            level = [edited for tokens in next_level for edited in self._filler_edits(tokens)]
+
+    def fix(self, line: str) -> Optional[str]:
+        """The first plausible candidate the grammar accepts, with its leading keyword capitalized"""
+        original = _words(line)
+        for candidate in self.candidates(line.strip()):
+            if self.accepts(candidate) and self._plausible(line, original, candidate):
+                return candidate[:1].upper() + candidate[1:]
+        return None
+
+    def _slots(self, pattern) -> Set[int]:
+        if pattern not in self.slots:
+            self.slots[pattern] = _slot_groups(sre_parse.parse(pattern.pattern), set())
+        return self.slots[pattern]
+
+    def _keeps_slots(self, line: str, match) -> bool:
+        """
+        Every value and identifier the match captured is the user's own text:
+        'Hide teh cart' is never 'Hide the card', nor 'slot' 'Show the the'
+        """
+        for group in self._slots(match.re):
+            value = match.group(group)
+            if not value or group == match.re.groupindex.get('actions'):
+                continue
+            # A quoted 'A' is the user's text; an unquoted filler stood in for a word
+            quoted = match.string[match.start(group) - 1:match.start(group)] in ("'", '"')
+            if value.lower() in FILLERS and not quoted:
+                return False
+            if not re.search(r"(?<!\w)" + re.escape(value) + r"(?!\w)", line, re.IGNORECASE):
+                return False
+        # Rules match a prefix; what follows it is left as the user wrote it
+        rest = match.string[match.end():].strip(" ,.:;!?")
+        return not rest or rest.lower() in line.lower()
+
+    def _plausible(self, line: str, original: List[str], candidate: str) -> bool:
+        """A fix keeps most of the line and only ever respells or adds grammar keywords"""
+        cmd_type, match = self.grammar.match_line(candidate)
+        if not self._keeps_slots(line, match):
+            return False
+        if cmd_type == 'action_sequence':
+            for action in self.grammar.action_split.split(match.group('actions')):
+                found = self.grammar.match_action(action.strip())
+                if found and not self._keeps_slots(line, found[0]):
+                    return False
+        words = _words(candidate)
+        kept = sum(block.size for block in SequenceMatcher(None, original, words).get_matching_blocks())
+        return max(len(original), len(words)) - kept <= max(MAX_EDITS, kept)
+
+    def accepts(self, line: str) -> bool:
+        """The line parses, and for a 'When ...,' line every action is one the generator knows"""
+        found = self.grammar.match_line(line)
+        if not found:
+            return False
+        cmd_type, match = found
+        if cmd_type != 'action_sequence':
+            return True
+        actions = self.grammar.action_split.split(match.group('actions'))
+        return all(self.grammar.parse_action(action.strip())['type'] != 'unknown' for action in actions)
+
+
+_fixer = None
+
+
+def fixer() -> SyntaxFixer:
+    """The process-wide fixer, indexed on first use"""
+    global _fixer
+    if _fixer is None:
+        _fixer = SyntaxFixer()
+    return _fixer
@@ -11,19 +11,67 @@ try:
     from .logic_parser import LogicParser
     from .html_generator import HTMLGenerator
     from .ast_nodes import AppNode, PageNode, Program, LayoutNode, SlotNode, VariableNode, FetchNode
+    from .source_map import build_source_map
+    from .stylesheet import extract_classes, build_stylesheet
+    from .image_pipeline import ImagePipeline
+    from .prerender import prerender_pages
+    from .analyzer import REPORT_FILE, analyze_component, build_report, diff_reports, format_summary, load_report, save_report
 except ImportError:
     from aura_parser import AuraParser
     from logic_parser import LogicParser
     from html_generator import HTMLGenerator
     from ast_nodes import AppNode, PageNode, Program, LayoutNode, SlotNode, VariableNode, FetchNode
+    from source_map import build_source_map
+    from stylesheet import extract_classes, build_stylesheet
+    from image_pipeline import ImagePipeline
+    from prerender import prerender_pages
+    from analyzer import REPORT_FILE, analyze_component, build_report, diff_reports, format_summary, load_report, save_report
 
 
 class AuraTranspiler:
     ENGINE_DIR = ".aura_engine"
 
-    def __init__(self):
+    def __init__(self, code_split=True, group_layout_chunks=False, prefetch='hover',
+                 virtualize_threshold=HTMLGenerator.VIRTUALIZE_THRESHOLD, report_dce=False,
+                 source_maps=True, memoize=True, fetch_ttl=60, css_mode='manifest',
+                 optimize_images=True, prerender=False, prerender_workers=None,
+                 analyze=False, module_server_url=None):
         self.parser = AuraParser()
         self.logic_parser = LogicParser()
+        # Route-level code splitting: each page becomes a React.lazy chunk
+        self.code_split = code_split
+        # Bundle pages that share a layout into one chunk (layout-<name>)
+        self.group_layout_chunks = group_layout_chunks
+        # Route prefetching for nav targets: 'hover', 'idle' or None
+        self.prefetch = prefetch if code_split else None
+        # Lists/grids longer than this render windowed (None: only 'virtual' ones)
+        self.virtualize_threshold = virtualize_threshold
+        # Print bytes removed by dead-code elimination per component
+        self.report_dce = report_dce
+        # Emit <Component>.jsx.map files pointing back at .aura lines
+        self.source_maps = source_maps
+        # Hoist static subtrees and wrap derived values/handlers in useMemo/useCallback
+        self.memoize = memoize
+        # Seconds a 'fetch from' response is served without revalidating (fetchCache.js)
+        self.fetch_ttl = fetch_ttl
+        # How index.css gets its utilities: 'scan' (Tailwind scans src), 'manifest'
+        # (Tailwind reads aura-classes.json) or 'precompute' (no Tailwind pass)
+        self.css_mode = css_mode
+        self.used_classes = set()
+        # Resize local images to AVIF/WebP variants with srcset and dimensions
+        self.optimize_images = optimize_images
+        self.image_pipeline = None
+        # Render each route's initial state to static HTML for React to hydrate
+        self.prerender = prerender
+        self.prerender_workers = prerender_workers  # None: one worker per CPU
+        self.dce_report = {}
+        # Write aura-build-report.json and print a size/composition table diffed against the last build
+        self.analyze = analyze
+        self.analysis = {}
+        # Dev: keep generated src modules in self.modules for the ModuleServer at this URL;
+        # Vite loads them as virtual:aura/* through aura-modules-plugin.js
+        self.module_server_url = module_server_url
+        self.modules = {}
 
     def build(self, input_file: str):
         """Builds the entire project (Multi-page support + Global Navbar)"""
@@ -48,6 +96,11 @@ class AuraTranspiler:
 
         # Helper to set home page correctly
         actual_home_page = None
+        self.dce_report = {}
+        self.analysis = {}
+        self.modules = {}
+        self.used_classes = set()
+        self.image_pipeline = ImagePipeline(self.ENGINE_DIR) if self.optimize_images else None
 
         try:
             with tqdm(total=len(aura_files), desc="🚀 Building Project", bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt} files") as pbar:
@@ -92,9 +145,13 @@ class AuraTranspiler:
                                 comp_name += 'Layout'
 
                             generator = HTMLGenerator(
-                                component_name=comp_name, shared_states=global_states)
-                            jsx = generator.generate(layout)
-                            layouts[l_name] = {'comp': comp_name, 'code': jsx}
+                                component_name=comp_name, shared_states=global_states,
+                                prefetch=self.prefetch, virtualize_threshold=self.virtualize_threshold,
+                                memoize=self.memoize, **self._image_options(file_path))
+                            jsx = self._generate(generator, layout)
+                            layouts[l_name] = {'comp': comp_name, 'code': jsx,
+                                               'source': file_path, 'mappings': generator.source_mappings,
+                                               'tree': generator.prerender_tree()}
 
                         # Structural Build
                         for page in structural_pages:
@@ -107,10 +164,14 @@ class AuraTranspiler:
                             generator = HTMLGenerator(
                                 component_name=comp_name,
                                 params=getattr(page, 'params', []),
-                                shared_states=global_states)
-                            jsx = generator.generate(page)
+                                shared_states=global_states,
+                                prefetch=self.prefetch, virtualize_threshold=self.virtualize_threshold,
+                                memoize=self.memoize, **self._image_options(file_path))
+                            jsx = self._generate(generator, page)
                             pages[p_name] = {
-                                'comp': comp_name, 'code': jsx, 'params': getattr(page, 'params', [])}
+                                'comp': comp_name, 'code': jsx, 'params': getattr(page, 'params', []),
+                                'layout': page.layout, 'source': file_path, 'mappings': generator.source_mappings,
+                                'tree': generator.prerender_tree()}
 
                             # Set initial home page or explicit 'home'
                             if not actual_home_page:
@@ -132,9 +193,14 @@ class AuraTranspiler:
                             if hasattr(cmd, 'command_type') and cmd.command_type == 'ui_navbar':
                                 global_navbar = cmd.data
 
-                        generator = HTMLGenerator(component_name=comp_name)
-                        jsx = generator.generate(commands)
-                        pages[name] = {'comp': comp_name, 'code': jsx}
+                        generator = HTMLGenerator(
+                            component_name=comp_name, prefetch=self.prefetch,
+                            virtualize_threshold=self.virtualize_threshold,
+                            memoize=self.memoize, **self._image_options(file_path))
+                        jsx = self._generate(generator, commands)
+                        pages[name] = {'comp': comp_name, 'code': jsx,
+                                       'source': file_path, 'mappings': generator.source_mappings,
+                                       'tree': generator.prerender_tree()}
 
                         if not actual_home_page:
                             actual_home_page = name
@@ -145,7 +211,9 @@ class AuraTranspiler:
             print(f"[Error] Compilation Failed: {e}")
             return False
 
-        self._ensure_engine_structure()
+        routes = self._prerender_routes(
+            pages, actual_home_page or home_page_name) if self.prerender else {}
+        self._ensure_engine_structure(self._layout_chunk_groups(pages), list(routes))
 
         pages_dir = os.path.join(self.ENGINE_DIR, 'src', 'pages')
         layouts_dir = os.path.join(self.ENGINE_DIR, 'src', 'layouts')
@@ -154,21 +222,80 @@ class AuraTranspiler:
 
         for name, data in layouts.items():
             out_path = os.path.join(layouts_dir, f"{data['comp']}.jsx")
-            self._write_file(out_path, data['code'])
+            self._write_component(out_path, data)
 
         for name, data in pages.items():
             out_path = os.path.join(pages_dir, f"{data['comp']}.jsx")
-            self._write_file(out_path, data['code'])
+            self._write_component(out_path, data)
 
         # Generate Context and Router
         self._generate_global_context(
             global_states if 'global_states' in locals() else {})
         self._generate_router(
             pages, actual_home_page or home_page_name, global_navbar)
+        self._generate_stylesheet()
+        if routes:
+            self._prerender(routes, pages, layouts,
+                            global_states if 'global_states' in locals() else {}, global_navbar)
+
+        if self.image_pipeline and self.image_pipeline.processed:
+            self.image_pipeline.save()
+            print(f"[Images] Optimized {self.image_pipeline.processed} image(s)")
+
+        if self.report_dce:
+            self._print_dce_report()
+        if self.analyze:
+            self._write_analysis()
 
         # print("[Build] Project Updated.")
         return True
 
+    def _write_component(self, out_path, data):
+        """Writes a generated component plus its .map back to the .aura source"""
+        code = data['code']
+        if self.source_maps and data.get('source'):
+            map_name = os.path.basename(out_path) + '.map'
+            with open(data['source'], 'r', encoding='utf-8') as f:
+                source_content = f.read()
+            source_map = build_source_map(
+                data['mappings'], os.path.basename(out_path),
+                os.path.relpath(os.path.abspath(data['source']), os.path.dirname(os.path.abspath(out_path))),
+                source_content)
+            self._write_file(out_path + '.map', json.dumps(source_map))
+            code += f"//# sourceMappingURL={map_name}\n"
+        self._write_file(out_path, code)
+
+    def _image_options(self, file_path):
+        """Image pipeline settings for a generator, resolving paths next to the .aura file"""
+        return {'image_pipeline': self.image_pipeline,
+                'source_dir': os.path.dirname(os.path.abspath(file_path))}
+
+    def _generate(self, generator, source):
+        """Runs a generator and records the bytes its dead-code pass saved"""
+        jsx = generator.generate(source)
+        if self.report_dce:
+            self.dce_report[generator.component_name] = generator.dead_code_savings(
+                jsx)
+        if self.analyze:
+            self.analysis[generator.component_name] = analyze_component(jsx, generator)
+        return jsx
+
+    def _print_dce_report(self):
+        total = sum(self.dce_report.values())
+        print("[DCE] Bytes saved per component:")
+        for comp, saved in sorted(self.dce_report.items(), key=lambda item: -item[1]):
+            print(f"  {comp:<24} {saved:>8,} B")
+        print(f"  {'Total':<24} {total:>8,} B")
+
+    def _write_analysis(self):
+        """Saves this build's composition report and prints it next to the previous one"""
+        path = os.path.join(self.ENGINE_DIR, REPORT_FILE)
+        previous = load_report(path)
+        report = build_report(self.analysis)
+        print(format_summary(report, diff_reports(previous, report)))
+        save_report(path, report)
+        print(f"[Analyze] Report written to {path}")
+
     def run(self, input_file: str):
         if not self.build(input_file):
             return
@@ -184,7 +311,7 @@ class AuraTranspiler:
         self._run_npm(['run', 'dev', '--', '--open'], block=True)
 
     def _generate_router(self, pages, home_page_name, navbar_config=None):
-        """Generates App.jsx and Navbar.jsx if needed"""
+        """Generates App.jsx, routes.js and Navbar.jsx if needed"""
 
         imports = []
         routes = []
@@ -193,7 +320,10 @@ class AuraTranspiler:
         for name, data in pages.items():
             comp = data['comp']
             params = data.get('params', [])
-            imports.append(f"import {comp} from './pages/{comp}';")
+            if self.code_split:
+                imports.append(f"const {comp} = lazy(pageLoaders.{comp});")
+            else:
+                imports.append(f"import {comp} from './pages/{comp}';")
 
             # Build path with params
             param_path = "".join([f"/:{p}" for p in params])
@@ -204,6 +334,8 @@ class AuraTranspiler:
                 home_comp = comp
             routes.append(f'<Route path="{path}" element={{<{comp} />}} />')
 
+        self._generate_route_table(pages, home_page_name)
+
         navbar_import = ""
         navbar_element = ""
 
@@ -212,9 +344,21 @@ class AuraTranspiler:
             navbar_import = "import Navbar from './components/Navbar';"
             navbar_element = "<Navbar />"
 
-        router_code = f"""import React from 'react';
+        react_import = "import React, { lazy, Suspense } from 'react';" if self.code_split else "import React from 'react';"
+        loaders_import = "import { pageLoaders } from './routes';" if self.code_split else ""
+        routes_block = f"""<Routes>
+        {chr(10).join(routes)}
+        {f'<Route path="*" element={{<{home_comp} />}} />' if home_comp else ''}
+      </Routes>"""
+        if self.code_split:
+            routes_block = f"""<Suspense fallback={{<div className="min-h-screen flex items-center justify-center text-gray-400">Loading...</div>}}>
+      {routes_block}
+      </Suspense>"""
+
+        router_code = f"""{react_import}
 import {{ Routes, Route }} from 'react-router-dom';
 import {{ GlobalStateProvider }} from './context/GlobalContext';
+{loaders_import}
 {navbar_import}
 {chr(10).join(imports)}
 
@@ -222,10 +366,7 @@ export default function App() {{
   return (
     <GlobalStateProvider>
       {navbar_element}
-      <Routes>
-        {chr(10).join(routes)}
-        {f'<Route path="*" element={{<{home_comp} />}} />' if home_comp else ''}
-      </Routes>
+      {routes_block}
     </GlobalStateProvider>
   );
 }}
@@ -233,24 +374,80 @@ export default function App() {{
         self._write_file(os.path.join(
             self.ENGINE_DIR, 'src', 'App.jsx'), router_code)
 
+    def _generate_route_table(self, pages, home_page_name):
+        """Generates routes.js: lazy page loaders plus prefetchRoute() for nav targets"""
+        loaders = []
+        route_keys = []
+
+        for name, data in pages.items():
+            comp = data['comp']
+            loaders.append(f"  {comp}: () => import('./pages/{comp}'),")
+            route_keys.append(f"  '/{name.lower()}': pageLoaders.{comp},")
+            if name == home_page_name:
+                route_keys.append(f"  '/': pageLoaders.{comp},")
+
+        routes_code = f"""// Generated by Aura: one lazy chunk per page
+export const pageLoaders = {{
+{chr(10).join(loaders)}
+}};
+
+const routeLoaders = {{
+{chr(10).join(route_keys)}
+}};
+
+const prefetched = new Set();
+
+// Start downloading a route's chunk before the user navigates to it
+export function prefetchRoute(path) {{
+  const segment = path.split('/').filter(Boolean)[0];
+  const key = segment ? `/${{segment.toLowerCase()}}` : '/';
+  const load = routeLoaders[key];
+  if (!load || prefetched.has(key)) return;
+  prefetched.add(key);
+  load().catch(() => prefetched.delete(key));
+}}
+"""
+        self._write_file(os.path.join(
+            self.ENGINE_DIR, 'src', 'routes.js'), routes_code)
+
+    def _layout_chunk_groups(self, pages):
+        """Maps page components to a shared 'layout-<name>' chunk when grouping is enabled"""
+        if not (self.code_split and self.group_layout_chunks):
+            return {}
+        groups = {}
+        for data in pages.values():
+            layout = data.get('layout')
+            if layout:
+                clean = layout.replace(' ', '').replace(
+                    '_', '').replace('-', '').lower()
+                groups[data['comp']] = f"layout-{clean}"
+        return groups
+
+    @staticmethod
+    def _navbar_links(config):
+        """(logo, [(label, path)]) of a global navbar; shared by Navbar.jsx and its prerendered markup"""
+        links = [l.strip() for l in config['links'].split(',')]
+        return config.get('logo', 'Aura App'), [
+            (link, "/" if link.lower() == 'home' else f"/{link.lower()}") for link in links]
+
     def _generate_navbar_component(self, config):
         """Generates the Navbar.jsx component"""
         components_dir = os.path.join(self.ENGINE_DIR, 'src', 'components')
         os.makedirs(components_dir, exist_ok=True)
 
-        links_str = config['links']
-        links_list = [l.strip() for l in links_str.split(',')]
-        logo = config.get('logo', 'Aura App')
+        logo, links = self._navbar_links(config)
 
         # Generate generic link logic
         links_jsx = ""
         mobile_links_jsx = ""
+        paths = []
 
-        for link in links_list:
-            path = "/" if link.lower() == 'home' else f"/{link.lower()}"
+        for link, path in links:
+            paths.append(path)
+            hover_prefetch = f" onMouseEnter={{() => prefetchRoute('{path}')}}" if self.prefetch == 'hover' else ""
             # Desktop Link
             links_jsx += f"""
-              <Link to="{path}" className={{`px-3 py-2 rounded-md text-sm font-medium transition-colors ${{location.pathname === '{path}' ? 'text-blue-500 bg-gray-100 dark:bg-gray-800' : 'text-gray-700 dark:text-gray-200 hover:text-blue-500'}}`}}>
+              <Link to="{path}"{hover_prefetch} className={{`px-3 py-2 rounded-md text-sm font-medium transition-colors ${{location.pathname === '{path}' ? 'text-blue-500 bg-gray-100 dark:bg-gray-800' : 'text-gray-700 dark:text-gray-200 hover:text-blue-500'}}`}}>
                 {link}
               </Link>
             """
@@ -261,14 +458,26 @@ export default function App() {{
               </Link>
             """
 
-        navbar_code = f"""import React, {{ useState }} from 'react';
+        prefetch_import = "import { prefetchRoute } from '../routes';" if self.prefetch else ""
+        idle_prefetch = ""
+        if self.prefetch == 'idle':
+            targets = ", ".join(f"'{p}'" for p in paths)
+            idle_prefetch = f"""
+  useEffect(() => {{
+    const schedule = window.requestIdleCallback || ((cb) => setTimeout(cb, 200));
+    schedule(() => [{targets}].forEach(prefetchRoute));
+  }}, []);
+"""
+
+        navbar_code = f"""import React, {{ useState, useEffect }} from 'react';
 import {{ Link, useLocation }} from 'react-router-dom';
 import {{ Menu, X }} from 'lucide-react';
+{prefetch_import}
 
 export default function Navbar() {{
   const [isOpen, setIsOpen] = useState(false);
   const location = useLocation();
-
+{idle_prefetch}
   return (
     <nav className="sticky top-0 z-50 bg-white/80 dark:bg-gray-900/80 backdrop-blur-md border-b border-gray-200 dark:border-gray-800">
       <div className="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8">
@@ -305,7 +514,7 @@ export default function Navbar() {{
         self._write_file(os.path.join(
             components_dir, 'Navbar.jsx'), navbar_code)
 
-    def _ensure_engine_structure(self):
+    def _ensure_engine_structure(self, chunk_groups=None, html_routes=None):
         if not os.path.exists(self.ENGINE_DIR):
             os.makedirs(self.ENGINE_DIR)
 
@@ -314,23 +523,31 @@ export default function Navbar() {{
         # I'll rely on the fact that they are already written, OR re-write them to be safe.
         # Re-writing minimal needed.
 
-        main_jsx = """import React from 'react'
+        module_dir = "virtual:aura" if self.module_server_url else "."
+        main_jsx = f"""import React from 'react'
 import ReactDOM from 'react-dom/client'
-import { BrowserRouter } from 'react-router-dom'
-import App from './App.jsx'
-import ErrorBoundary from './ErrorBoundary.jsx'
+import {{ BrowserRouter }} from 'react-router-dom'
+import App from '{module_dir}/App.jsx'
+import ErrorBoundary from '{module_dir}/ErrorBoundary.jsx'
 import './index.css'
 
-ReactDOM.createRoot(document.getElementById('root')).render(
+const app = (
   <React.StrictMode>
     <ErrorBoundary>
       <BrowserRouter>
         <App />
       </BrowserRouter>
     </ErrorBoundary>
-  </React.StrictMode>,
+  </React.StrictMode>
 )
+
+const root = document.getElementById('root')
 """
+        if html_routes:
+            # Prerendered markup is hydrated instead of replaced
+            main_jsx += "if (root.hasChildNodes()) ReactDOM.hydrateRoot(root, app)\nelse ReactDOM.createRoot(root).render(app)\n"
+        else:
+            main_jsx += "ReactDOM.createRoot(root).render(app)\n"
         src_dir = os.path.join(self.ENGINE_DIR, 'src')
         os.makedirs(src_dir, exist_ok=True)
         self._write_file(os.path.join(src_dir, 'main.jsx'), main_jsx)
@@ -359,26 +576,401 @@ ReactDOM.createRoot(document.getElementById('root')).render(
             self.ENGINE_DIR, 'package.json'), json.dumps(package_json, indent=2))
 
         # Configs
-        vite_config = "import { defineConfig } from 'vite'\nimport react from '@vitejs/plugin-react'\nexport default defineConfig({ plugins: [react()], server: { hmr: { overlay: false } } })"
-        index_html = "<!doctype html><html lang='en'><head><meta charset='UTF-8' /><meta name='viewport' content='width=device-width, initial-scale=1.0' /><title>Aura App</title></head><body><div id='root'></div><script type='module' src='/src/main.jsx'></script></body></html>"
-        index_css = "@tailwind base;\n@tailwind components;\n@tailwind utilities;"
-        tailwind_config = "export default { content: ['./index.html', './src/**/*.{js,ts,jsx,tsx}'], theme: { extend: {} }, plugins: [], }"
-        postcss_config = "export default { plugins: { tailwindcss: {}, autoprefixer: {}, }, }"
+        self._write_file(os.path.join(
+            self.ENGINE_DIR, 'vite.config.js'), self._vite_config(chunk_groups, html_routes))
         error_boundary = "import React from 'react';\nclass ErrorBoundary extends React.Component {\n  constructor(props) { super(props); this.state = { hasError: false, error: null }; }\n  static getDerivedStateFromError(error) { return { hasError: true, error }; }\n  render() { if (this.state.hasError) return <div className='p-10 text-red-500'>Aura Error: {this.state.error.toString()}</div>; return this.props.children; }\n}\nexport default ErrorBoundary;"
 
+        if not html_routes or '' not in html_routes:
+            # Prerendered routes get their index.html after rendering; the SPA shell serves the rest
+            self._write_file(os.path.join(
+                self.ENGINE_DIR, 'index.html'), self._index_html())
         self._write_file(os.path.join(
-            self.ENGINE_DIR, 'vite.config.js'), vite_config)
-        self._write_file(os.path.join(
-            self.ENGINE_DIR, 'index.html'), index_html)
+            src_dir, 'ErrorBoundary.jsx'), error_boundary)
+        self._generate_virtual_repeater()
+        self._generate_fetch_cache()
+        if self.module_server_url:
+            self._generate_module_plugin()
+
+    def _vite_config(self, chunk_groups=None, html_routes=None):
+        """vite.config.js, with layout chunk groups, one HTML entry per prerendered route
+        and the in-memory module plugin in dev"""
+        if not chunk_groups and not html_routes and not self.module_server_url:
+            return "import { defineConfig } from 'vite'\nimport react from '@vitejs/plugin-react'\nexport default defineConfig({ plugins: [react()], server: { hmr: { overlay: false } } })"
+
+        imports = "import react from '@vitejs/plugin-react'"
+        plugins = "react()"
+        declarations = ""
+        options = []
+        rollup_options = []
+        if self.module_server_url:
+            imports += "\nimport auraModules from './aura-modules-plugin.js'"
+            plugins = f"auraModules({json.dumps(self.module_server_url)}), react()"
+            # Virtual modules hide their imports from the dep scanner; pre-bundle them up front
+            options.append("  optimizeDeps: { include: ['react', 'react-dom/client', 'react-router-dom', "
+                           "'lucide-react', 'framer-motion'] },")
+        if html_routes:
+            # The root index.html is an entry even when the home page isn't prerendered
+            entries = ", ".join(f"{json.dumps(route or 'main')}: '{self._route_html_path(route)}'"
+                                for route in ([''] + [r for r in html_routes if r]))
+            rollup_options.append(f"      input: {{ {entries} }},")
+        if chunk_groups:
+            # Pages sharing a layout land in one lazy chunk
+            declarations = f"\nconst pageChunks = {json.dumps(chunk_groups)};\n"
+            rollup_options.append("""      output: {
+        manualChunks(id) {
+          const match = id.match(/\\/src\\/pages\\/(\\w+)\\.jsx$/);
+          if (match && pageChunks[match[1]]) return pageChunks[match[1]];
+        },
+      },""")
+        if rollup_options:
+            options.append(f"""  build: {{
+    rollupOptions: {{
+{chr(10).join(rollup_options)}
+    }},
+  }},""")
+        return f"""import {{ defineConfig }} from 'vite'
+{imports}
+{declarations}
+export default defineConfig({{
+  plugins: [{plugins}],
+  server: {{ hmr: {{ overlay: false }} }},
+{chr(10).join(options)}
+}})
+"""
+
+    @staticmethod
+    def _route_html_path(route):
+        return f"{route}/index.html" if route else "index.html"
+
+    def _index_html(self, markup=""):
+        return f"<!doctype html><html lang='en'><head><meta charset='UTF-8' /><meta name='viewport' content='width=device-width, initial-scale=1.0' /><title>Aura App</title></head><body><div id='root'>{markup}</div><script type='module' src='/src/main.jsx'></script></body></html>"
+
+    def _prerender_routes(self, pages, home_page_name):
+        """{route: page name} for every page without URL params ('' is the home route)"""
+        routes = {}
+        for name, data in pages.items():
+            if data.get('params'):
+                continue  # needs runtime params
+            routes['' if name == home_page_name else name.lower()] = name
+        return routes
+
+    def _prerender(self, routes, pages, layouts, global_states, navbar_config=None):
+        """Renders each route's initial HTML in a process pool and writes <route>/index.html"""
+        navbar = None
+        if navbar_config:
+            logo, links = self._navbar_links(navbar_config)
+            navbar = {'logo': logo, 'links': links}
+        jobs = {}
+        for route, name in routes.items():
+            data = pages[name]
+            layout = layouts.get(data.get('layout')) if data.get('layout') else None
+            jobs[route] = {
+                'page': data['tree'],
+                'layout': layout['tree'] if layout else None,
+                'globals': {key: [] if isinstance(value, FetchNode) else value
+                            for key, value in global_states.items()},
+                'virtualize_threshold': self.virtualize_threshold,
+                'suspense': self.code_split,
+                'navbar': navbar,
+                'pathname': f"/{route}",
+            }
+        rendered = prerender_pages(jobs, self.prerender_workers)
+        for route, markup in rendered.items():
+            path = os.path.join(self.ENGINE_DIR, self._route_html_path(route))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._write_file(path, self._index_html(markup))
+        print(f"[Prerender] {len(rendered)} route(s) rendered to static HTML")
+
+    def _generate_stylesheet(self):
+        """Writes aura-classes.json plus the Tailwind/PostCSS setup for the chosen css_mode"""
+        classes = sorted(self.used_classes)
+        self._write_file(os.path.join(self.ENGINE_DIR, 'aura-classes.json'),
+                         json.dumps(classes, indent=0) + "\n")
+
+        content = "['./index.html', './aura-classes.json']"
+        # In-memory dev modules never reach src/, so the manifest stays the content source
+        if self.css_mode == 'scan' and not self.module_server_url:
+            content = "['./index.html', './src/**/*.{js,ts,jsx,tsx}']"
+        tailwind_config = f"export default {{ content: {content}, theme: {{ extend: {{}} }}, plugins: [], }}"
+        postcss_config = "export default { plugins: { tailwindcss: {}, autoprefixer: {}, }, }"
+        index_css = "@tailwind base;\n@tailwind components;\n@tailwind utilities;"
+
+        if self.css_mode == 'precompute':
+            index_css, unsupported = build_stylesheet(classes)
+            postcss_config = "export default { plugins: { autoprefixer: {}, }, }"
+            if unsupported:
+                print(f"[CSS] No precomputed rule for {len(unsupported)} class(es): {' '.join(unsupported)}")
+
         self._write_file(os.path.join(
             self.ENGINE_DIR, 'tailwind.config.js'), tailwind_config)
         self._write_file(os.path.join(
             self.ENGINE_DIR, 'postcss.config.js'), postcss_config)
-        self._write_file(os.path.join(src_dir, 'index.css'), index_css)
         self._write_file(os.path.join(
-            src_dir, 'ErrorBoundary.jsx'), error_boundary)
+            self.ENGINE_DIR, 'src', 'index.css'), index_css)
+
+    def _generate_virtual_repeater(self):
+        """Generates the windowed list/grid component used by large repeaters (no npm dependency)"""
+        components_dir = os.path.join(self.ENGINE_DIR, 'src', 'components')
+        os.makedirs(components_dir, exist_ok=True)
+
+        code = """import React, { forwardRef, useState, useRef, useCallback, useLayoutEffect } from 'react';
+
+// Generated by Aura: renders only the rows of a list/grid that are on screen.
+// Rows use rowHeight when given, otherwise the first rendered row is measured.
+// Any other props (the repeated element's ref and handlers) go on the outer element.
+const ESTIMATED_ROW_HEIGHT = 120;
+
+export default forwardRef(function VirtualRepeater({
+  items, renderItem, columns = 1, threshold = 0, rowHeight,
+  overscan = 3, height = '70vh', className = '', rowClassName = '', onScroll, ...rest
+}, ref) {
+  const data = items || [];
+  const scrollerRef = useRef(null);
+  const setScroller = useCallback((node) => {
+    scrollerRef.current = node;
+    if (typeof ref === 'function') ref(node);
+    else if (ref) ref.current = node;
+  }, [ref]);
+  const firstRowRef = useRef(null);
+  const [scrollTop, setScrollTop] = useState(0);
+  const [viewport, setViewport] = useState(0);
+  const [measured, setMeasured] = useState(0);
+  const windowed = data.length > threshold;
+
+  useLayoutEffect(() => {
+    const scroller = scrollerRef.current;
+    if (!scroller) return undefined;
+    setViewport(scroller.clientHeight);
+    if (typeof ResizeObserver === 'undefined') return undefined;
+    const observer = new ResizeObserver(() => setViewport(scroller.clientHeight));
+    observer.observe(scroller);
+    return () => observer.disconnect();
+  }, [windowed]);
+
+  useLayoutEffect(() => {
+    if (!rowHeight && firstRowRef.current && firstRowRef.current.offsetHeight !== measured) {
+      setMeasured(firstRowRef.current.offsetHeight);
+    }
+  });
+
+  if (!windowed) {
+    return <div ref={ref} className={className} onScroll={onScroll} {...rest}>{data.map((item, index) => <React.Fragment key={index}>{renderItem(item, index)}</React.Fragment>)}</div>;
+  }
+
+  const rowSize = rowHeight || measured || ESTIMATED_ROW_HEIGHT;
+  const rowCount = Math.ceil(data.length / columns);
+  const first = Math.max(0, Math.floor(scrollTop / rowSize) - overscan);
+  const last = Math.min(rowCount, Math.ceil((scrollTop + viewport) / rowSize) + overscan);
+
+  const rows = [];
+  for (let row = first; row < last; row++) {
+    const start = row * columns;
+    rows.push(
+      <div
+        key={row}
+        ref={row === first ? firstRowRef : undefined}
+        className={`grid pb-4 ${rowClassName}`}
+        style={{ position: 'absolute', top: row * rowSize, left: 0, right: 0, gridTemplateColumns: `repeat(${columns}, minmax(0, 1fr))` }}
+      >
+        {data.slice(start, start + columns).map((item, offset) => (
+          <React.Fragment key={start + offset}>{renderItem(item, start + offset)}</React.Fragment>
+        ))}
+      </div>
+    );
+  }
+
+  return (
+    <div
+      {...rest}
+      ref={setScroller}
+      className="w-full"
+      style={{ height, overflowY: 'auto' }}
+      onScroll={(e) => { setScrollTop(e.currentTarget.scrollTop); if (onScroll) onScroll(e); }}
+    >
+      <div style={{ position: 'relative', height: rowCount * rowSize }}>{rows}</div>
+    </div>
+  );
+});
+"""
+        self._write_file(os.path.join(
+            components_dir, 'VirtualRepeater.jsx'), code)
+
+    def _generate_fetch_cache(self):
+        """Generates fetchCache.js: deduped, stale-while-revalidate 'fetch from' requests"""
+        ttl_ms = int((self.fetch_ttl or 0) * 1000)
+        code = f"""// Generated by Aura: one request per URL, shared by every page and the global store.
+// Cached data is served immediately; entries older than the TTL are revalidated
+// in the background and pushed to every subscriber.
+const FETCH_TTL = {ttl_ms};
+
+const cache = new Map();
+
+function entryFor(url) {{
+  let entry = cache.get(url);
+  if (!entry) {{
+    entry = {{ data: undefined, fetchedAt: 0, request: null, subscribers: new Set() }};
+    cache.set(url, entry);
+  }}
+  return entry;
+}}
+
+function revalidate(url, entry) {{
+  // Concurrent callers share the in-flight request
+  if (!entry.request) {{
+    entry.request = fetch(url)
+      .then((res) => {{
+        if (!res.ok) throw new Error(`${{res.status}} ${{url}}`);
+        return res.json();
+      }})
+      .then((data) => {{
+        entry.data = data;
+        entry.fetchedAt = Date.now();
+        entry.subscribers.forEach((notify) => notify(data));
+        return data;
+      }})
+      .finally(() => {{ entry.request = null; }});
+  }}
+  return entry.request;
+}}
+
+const isFresh = (entry, ttl) => entry.fetchedAt > 0 && Date.now() - entry.fetchedAt < ttl;
+
+// Resolves with cached data while fresh, otherwise with the (shared) network response
+export function fetchCached(url, {{ ttl = FETCH_TTL }} = {{}}) {{
+  const entry = entryFor(url);
+  return isFresh(entry, ttl) ? Promise.resolve(entry.data) : revalidate(url, entry);
+}}
+
+// Calls onData with cached data now and again after each revalidation; returns an unsubscribe
+export function subscribeFetch(url, onData, {{ ttl = FETCH_TTL }} = {{}}) {{
+  const entry = entryFor(url);
+  entry.subscribers.add(onData);
+  if (entry.fetchedAt > 0) onData(entry.data);
+  if (!isFresh(entry, ttl)) {{
+    revalidate(url, entry).catch((error) => console.warn('[Aura] fetch failed:', error));
+  }}
+  return () => entry.subscribers.delete(onData);
+}}
+
+export function invalidateFetch(url) {{
+  if (url === undefined) cache.clear();
+  else cache.delete(url);
+}}
+"""
+        self._write_file(os.path.join(self.ENGINE_DIR, 'src', 'fetchCache.js'), code)
+
+    def _generate_module_plugin(self):
+        """Generates aura-modules-plugin.js: Vite loads virtual:aura/* from the ModuleServer"""
+        code = """// Generated by Aura: serves generated modules from the dev server's memory.
+// 'virtual:aura/pages/Shop.jsx' is loaded from <endpoint>/modules/pages/Shop.jsx and
+// reloaded through HMR as soon as the dev server pushes a build that changed it.
+import http from 'node:http'
+import path from 'node:path'
+
+const PREFIX = 'virtual:aura/'
+
+function get(url) {
+  return new Promise((resolve, reject) => {
+    http.get(url, (res) => {
+      let body = ''
+      res.setEncoding('utf8')
+      res.on('data', (chunk) => { body += chunk })
+      res.on('end', () => resolve({ status: res.statusCode, body }))
+    }).on('error', reject)
+  })
+}
+
+export default function auraModules(endpoint) {
+  let modules = new Set()
+  let server = null
+  let root = process.cwd()
+
+  const find = (file) =>
+    [file, `${file}.jsx`, `${file}.js`, `${file}/index.jsx`, `${file}/index.js`].find((c) => modules.has(c))
+
+  async function refresh() {
+    const { body } = await get(`${endpoint}/modules`)
+    modules = new Set(JSON.parse(body).modules)
+  }
+
+  function update({ modules: list, changed, published }) {
+    modules = new Set(list)
+    for (const file of changed) {
+      if (file.endsWith('.map')) continue
+      const mod = server && server.moduleGraph.getModuleById(PREFIX + file)
+      if (mod) server.reloadModule(mod)
+    }
+    if (published) server?.config.logger.info(`[aura] ${changed.length} file(s) pushed in ${Date.now() - published * 1000}ms`)
+  }
+
+  function listen() {
+    http.get(`${endpoint}/events`, (res) => {
+      let buffer = ''
+      res.setEncoding('utf8')
+      res.on('data', (chunk) => {
+        buffer += chunk
+        let end
+        while ((end = buffer.indexOf('\\n\\n')) >= 0) {
+          const data = buffer.slice(0, end).split('\\n')
+            .filter((line) => line.startsWith('data:')).map((line) => line.slice(5)).join('\\n')
+          buffer = buffer.slice(end + 2)
+          if (data) update(JSON.parse(data))
+        }
+      })
+      res.on('end', () => setTimeout(listen, 500))
+    }).on('error', () => setTimeout(listen, 1000))
+  }
+
+  return {
+    name: 'aura-modules',
+    enforce: 'pre',
+    configResolved(config) {
+      root = config.root
+    },
+    async configureServer(devServer) {
+      server = devServer
+      await refresh()
+      listen()
+    },
+    async resolveId(source, importer) {
+      let file
+      if (source.startsWith(PREFIX)) {
+        file = source.slice(PREFIX.length)
+      } else if (importer && importer.startsWith(PREFIX)) {
+        if (!source.startsWith('.')) {
+          // Packages resolve as if imported from src/
+          return this.resolve(source, path.join(root, 'src', 'main.jsx'), { skipSelf: true })
+        }
+        file = path.posix.normalize(path.posix.join(path.posix.dirname(importer.slice(PREFIX.length)), source))
+      } else {
+        return null
+      }
+      if (!modules.size) await refresh()
+      const found = find(file)
+      if (found) return PREFIX + found
+      // Hand-written files that stay on disk (e.g. ./index.css)
+      return this.resolve(path.join(root, 'src', file), undefined, { skipSelf: true })
+    },
+    async load(id) {
+      if (!id.startsWith(PREFIX)) return null
+      const file = id.slice(PREFIX.length)
+      const { status, body } = await get(`${endpoint}/modules/${file}`)
+      if (status !== 200) throw new Error(`Aura dev server has no module ${file}`)
+      const map = modules.has(`${file}.map`) ? (await get(`${endpoint}/modules/${file}.map`)).body : null
+      return { code: body.replace(/\\/\\/# sourceMappingURL=.*\\n?$/, ''), map }
+    },
+  }
+}
+"""
+        self._write_file(os.path.join(self.ENGINE_DIR, 'aura-modules-plugin.js'), code)
 
     def _write_file(self, path, content):
+        if path.endswith('.jsx'):
+            self.used_classes |= extract_classes(content)
+        module = self._module_path(path)
+        if module:
+            self.modules[module] = content
+            return
         if os.path.exists(path):
             try:
                 with open(path, 'r', encoding='utf-8') as f:
@@ -389,6 +981,15 @@ ReactDOM.createRoot(document.getElementById('root')).render(
         with open(path, 'w', encoding='utf-8') as f:
             f.write(content)
 
+    def _module_path(self, path):
+        """'pages/Shop.jsx' when a generated src file is served from memory, else None"""
+        if not self.module_server_url:
+            return None
+        relative = os.path.relpath(path, os.path.join(self.ENGINE_DIR, 'src')).replace(os.sep, '/')
+        if relative.startswith('../') or relative == 'main.jsx':
+            return None
+        return relative if relative.endswith(('.js', '.jsx', '.map')) else None
+
     def _run_npm(self, args, block=True):
         use_shell = (os.name == 'nt')
         npm_cmd = 'npm.cmd' if use_shell else 'npm'
@@ -404,21 +1005,24 @@ ReactDOM.createRoot(document.getElementById('root')).render(
             pass
 
     def _generate_global_context(self, global_states):
+        """Generates GlobalContext.jsx: an external store components subscribe to per key"""
         context_dir = os.path.join(self.ENGINE_DIR, 'src', 'context')
         os.makedirs(context_dir, exist_ok=True)
 
-        states_init = []
-        context_values = []
+        store_init = []
+        listener_init = []
+        setters = []
         effects = []
+        cleanups = []
 
         for name, val in global_states.items():
             setter = f"set{name.capitalize()}"
             if isinstance(val, FetchNode):
                 initial = "[]"
-                # Add useEffect for fetching
-                effects.append(f"""    useEffect(() => {{
-        fetch('{val.source}').then(res => res.json()).then(data => {setter}(data));
-    }}, []);""")
+                # Fetch once for the whole app, sharing the page-level cache
+                effects.append(
+                    f"        const stop{setter[3:]} = subscribeFetch('{val.source}', globalSetters.{setter});")
+                cleanups.append(f"stop{setter[3:]}();")
             elif isinstance(val, (list, dict)):
                 initial = json.dumps(val)
             elif isinstance(val, (int, float)):
@@ -426,32 +1030,59 @@ ReactDOM.createRoot(document.getElementById('root')).render(
             else:
                 initial = f"'{val}'"
 
-            states_init.append(
-                f"    const [{name}, {setter}] = useState({initial});")
-            context_values.append(name)
-            context_values.append(setter)
+            store_init.append(f"    {name}: {initial},")
+            listener_init.append(f"    {name}: new Set(),")
+            setters.append(
+                f"    {setter}: (value) => setGlobalValue('{name}', value),")
 
-        states_code = "\n".join(states_init)
-        effects_code = "\n".join(effects)
-        values_code = ", ".join(context_values)
+        effects_code = ""
+        if effects:
+            effects_code = "    useEffect(() => {\n" + \
+                "\n".join(effects) + \
+                f"\n        return () => {{ {' '.join(cleanups)} }};\n    }}, []);\n"
 
-        code = f"""import React, {{ createContext, useContext, useState, useEffect }} from 'react';
+        fetch_import = "\nimport { subscribeFetch } from '../fetchCache';" if effects else ""
+        code = f"""import React, {{ useEffect, useSyncExternalStore }} from 'react';{fetch_import}
 
-const GlobalStateContext = createContext();
+// Generated by Aura: components subscribe only to the keys they read
+const store = {{
+{chr(10).join(store_init)}
+}};
 
-export const GlobalStateProvider = ({{ children }}) => {{
-{states_code}
+const listeners = {{
+{chr(10).join(listener_init)}
+}};
 
-{effects_code}
+const subscribers = Object.fromEntries(Object.keys(store).map((key) => [key, (listener) => {{
+    listeners[key].add(listener);
+    return () => listeners[key].delete(listener);
+}}]));
 
-    return (
-        <GlobalStateContext.Provider value={{{{ {values_code} }}}}>
-            {{children}}
-        </GlobalStateContext.Provider>
-    );
+export const setGlobalValue = (key, value) => {{
+    const next = typeof value === 'function' ? value(store[key]) : value;
+    if (Object.is(next, store[key])) return;
+    store[key] = next;
+    listeners[key].forEach((listener) => listener());
+}};
+
+// The server snapshot is the same store, so hydrating prerendered pages reads the initial values
+export const useGlobalValue = (key) => useSyncExternalStore(subscribers[key], () => store[key], () => store[key]);
+
+export const globalSetters = {{
+{chr(10).join(setters)}
 }};
 
-export const useGlobalState = () => useContext(GlobalStateContext);
+export const GlobalStateProvider = ({{ children }}) => {{
+{effects_code}
+    return <>{{children}}</>;
+}};
+
+// Legacy accessor: subscribes to every key, prefer useGlobalValue
+export const useGlobalState = () => {{
+    const values = {{}};
+    for (const key of Object.keys(store)) values[key] = useGlobalValue(key);
+    return {{ ...values, ...globalSetters }};
+}};
 """
         self._write_file(os.path.join(context_dir, 'GlobalContext.jsx'), code)
 
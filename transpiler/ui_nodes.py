@@ -3,21 +3,20 @@ UI AST Nodes - Semantic nodes for Aura's visual layer
 Pure representation, no rendering logic
 """
 
-from dataclasses import dataclass
 from typing import List, Optional, Dict, Any
 try:
-    from .ast_nodes import ASTNode
+    from .ast_nodes import ASTNode, node
 except ImportError:
-    from ast_nodes import ASTNode
+    from ast_nodes import ASTNode, node
 
 
-@dataclass
+@node
 class UINode(ASTNode):
     """Base class for all UI nodes"""
     pass
 
 
-@dataclass
+@node
 class ScreenNode(UINode):
     """Root container - top-level UI"""
     children: List[UINode]
@@ -26,7 +25,7 @@ class ScreenNode(UINode):
         return f"<Screen with {len(self.children)} children>"
 
 
-@dataclass
+@node
 class ColumnNode(UINode):
     """Vertical layout"""
     children: List[UINode]
@@ -35,7 +34,7 @@ class ColumnNode(UINode):
         return f"<Column with {len(self.children)} children>"
 
 
-@dataclass
+@node
 class RowNode(UINode):
     """Horizontal layout"""
     children: List[UINode]
@@ -44,7 +43,7 @@ class RowNode(UINode):
         return f"<Row with {len(self.children)} children>"
 
 
-@dataclass
+@node
 class StackNode(UINode):
     """Layered layout (z-axis)"""
     children: List[UINode]
@@ -53,7 +52,7 @@ class StackNode(UINode):
         return f"<Stack with {len(self.children)} children>"
 
 
-@dataclass
+@node
 class TextNode(UINode):
     """Display text or variable value"""
     value: str  # Literal text or variable name
@@ -65,7 +64,7 @@ class TextNode(UINode):
         return f"<Text '{self.value}'>"
 
 
-@dataclass
+@node
 class ButtonNode(UINode):
     """Interactive button"""
     label: str
@@ -75,9 +74,10 @@ class ButtonNode(UINode):
         return f"<Button '{self.label}'>"
 
 
-@dataclass
+@node
 class InputNode(UINode):
     """Text input field"""
+    _interned = ('binding',)
     binding: str  # Variable name to bind to
     placeholder: Optional[str] = None
 
@@ -86,7 +86,7 @@ class InputNode(UINode):
 
 
 # UI Event nodes
-@dataclass
+@node
 class WhenClickedNode(ASTNode):
     """Click event handler"""
     statements: List[ASTNode]
@@ -95,7 +95,7 @@ class WhenClickedNode(ASTNode):
         return f"<WhenClicked: {len(self.statements)} statements>"
 
 
-@dataclass
+@node
 class WhenChangedNode(ASTNode):
     """Input change event handler"""
     statements: List[ASTNode]
@@ -104,7 +104,7 @@ class WhenChangedNode(ASTNode):
         return f"<WhenChanged: {len(self.statements)} statements>"
 
 
-@dataclass
+@node
 class WhenHoveredNode(ASTNode):
     """Hover event handler"""
     statements: List[ASTNode]
@@ -115,7 +115,7 @@ class WhenHoveredNode(ASTNode):
 
 # === PHASE 6.0: ADVANCED UI ===
 
-@dataclass
+@node
 class TableNode(UINode):
     """Data table: columns, sortable"""
     columns: List[str]
@@ -125,19 +125,23 @@ class TableNode(UINode):
         return f"<Table columns={self.columns}>"
 
 
-@dataclass
+@node
 class GridNode(UINode):
     """Responsive grid layout"""
     items_expr: str  # e.g. "products from inventory"
     children: List[UINode]
+    columns: Optional[int] = None
+    virtual: bool = False  # windowed rendering: grid products virtual [row height]
+    row_height: Optional[int] = None  # fixed px row height, measured when None
 
     def __repr__(self):
         return f"<Grid items='{self.items_expr}'>"
 
 
-@dataclass
+@node
 class LayoutBlockNode(UINode):
     """Specialized layout area: sidebar, main, footer"""
+    _interned = ('block_type',)
     block_type: str  # sidebar, main, header, footer
     children: List[UINode]
 
@@ -145,42 +149,45 @@ class LayoutBlockNode(UINode):
         return f"<LayoutBlock '{self.block_type}'>"
 
 
-@dataclass
+@node
 class CardNode(UINode):
     """Container with styles like hover, lift"""
     children: List[UINode]
     effects: List[str]  # hover, lift, etc.
 
 
-@dataclass
+@node
 class ListNode(UINode):
     """Vertical list of items"""
     items_expr: str
     children: List[UINode]
+    virtual: bool = False  # windowed rendering: list cart virtual [row height]
+    row_height: Optional[int] = None  # fixed px row height, measured when None
 
 
-@dataclass
+@node
 class PanelNode(UINode):
     """Themed container with title: panel 'Summary'"""
     title: str
     children: List[UINode]
 
 
-@dataclass
+@node
 class DividerNode(UINode):
     """Horizontal line separator"""
     pass
 
 
-@dataclass
+@node
 class IconNode(UINode):
     """Visual icon: icon 'check-circle'"""
+    _interned = ('icon_name', 'size', 'color')
     icon_name: str
     size: str = "medium"
     color: str = "currentColor"
 
 
-@dataclass
+@node
 class ImageNode(UINode):
     """Display image: image 'url'"""
     src: str
@@ -3,7 +3,7 @@ Visual Runtime Engine (VRE) - Core of Aura's visual layer
 Subscribes to runtime state, builds render tree, triggers updates
 """
 
-from typing import Optional, List, Callable
+from typing import Optional, List, Callable, Any
 from visual.render_tree import RenderTree, RenderNode
 from transpiler.ui_nodes import (
     ScreenNode, ColumnNode, RowNode, StackNode,
@@ -1,9 +1,15 @@
 const vscode = require('vscode');
 const { spawn } = require('child_process');
+const crypto = require('crypto');
+const fs = require('fs');
+const net = require('net');
+const os = require('os');
 const path = require('path');
 
-let brainDaemon = null;
+let brainSocket = null;  // connection to the project's daemon, shared with the CLI and dev server
 let requestId = 0;
+const pending = new Map();  // request id -> resolve, answered in any order
+const partials = new Map();  // request id -> callback for its streamed partial answers
 
 /**
  * @param {vscode.ExtensionContext} context
@@ -125,41 +131,166 @@ function activate(context) {
 }
 
 /**
- * Start the Brain Daemon process
+ * Where the daemon of a workspace listens; mirrors transpiler/brain_ipc.py
  */
-function startBrainDaemon(context) {
-    const workspaceFolder = vscode.workspace.workspaceFolders?.[0]?.uri.fsPath;
-    if (!workspaceFolder) return;
+function brainAddress(workspaceFolder) {
+    const brainDir = path.join(workspaceFolder, '.aura_brain');
+    if (process.platform === 'win32') {
+        const port = parseInt(fs.readFileSync(path.join(brainDir, 'daemon.port'), 'utf8'), 10);
+        return { host: '127.0.0.1', port: port };
+    }
+    let socketPath = path.join(brainDir, 'daemon.sock');
+    if (Buffer.byteLength(socketPath) > 100) {
+        const digest = crypto.createHash('sha1').update(path.resolve(brainDir)).digest('hex').slice(0, 12);
+        socketPath = path.join(os.tmpdir(), `aura-brain-${digest}.sock`);
+    }
+    return { path: socketPath };
+}
 
-    try {
-        brainDaemon = spawn('python', ['-m', 'transpiler.brain_daemon'], {
-            cwd: workspaceFolder,
-            stdio: ['pipe', 'pipe', 'pipe']
-        });
+/**
+ * Connect to the workspace's daemon if one is listening
+ * @returns {Promise<boolean>}
+ */
+function connectBrain(workspaceFolder) {
+    return new Promise((resolve) => {
+        let address;
+        try {
+            address = brainAddress(workspaceFolder);
+        } catch (error) {
+            resolve(false);
+            return;
+        }
 
-        brainDaemon.stderr.on('data', (data) => {
-            console.log(`[Aura Brain Daemon] ${data.toString()}`);
-        });
+        const socket = net.createConnection(address);
+        socket.once('error', () => resolve(false));
+        socket.once('connect', () => {
+            brainSocket = socket;
+            socket.setEncoding('utf8');
+
+            let buffered = '';
+            socket.on('data', (data) => {
+                buffered += data;
+                let newline;
+                while ((newline = buffered.indexOf('\n')) >= 0) {
+                    const message = buffered.slice(0, newline);
+                    buffered = buffered.slice(newline + 1);
+                    try {
+                        const response = JSON.parse(message);
+                        if (response.method === 'partial') {
+                            // The model's answer so far, ahead of the final response
+                            const onPartial = partials.get(response.params.id);
+                            if (onPartial) onPartial(response.params);
+                            continue;
+                        }
+                        const done = pending.get(response.id);
+                        if (done) {
+                            pending.delete(response.id);
+                            done(response.result || null);
+                        }
+                    } catch (e) {
+                        // Not a response we can read
+                    }
+                }
+            });
+
+            socket.on('error', (error) => {
+                console.log(`[Aura Brain Daemon] Connection error: ${error.message}`);
+            });
 
-        brainDaemon.on('close', (code) => {
-            console.log(`[Aura Brain Daemon] Process exited with code ${code}`);
-            brainDaemon = null;
+            socket.on('close', () => {
+                console.log('[Aura Brain Daemon] Disconnected');
+                brainSocket = null;
+                for (const done of pending.values()) done(null);
+                pending.clear();
+                partials.clear();
+            });
+
+            resolve(true);
         });
+    });
+}
 
-        console.log('[Aura Brain Daemon] Started successfully');
+/**
+ * Whether the workspace's pidfile names a live daemon, possibly still starting up
+ */
+function daemonRunning(workspaceFolder) {
+    try {
+        const pid = parseInt(fs.readFileSync(path.join(workspaceFolder, '.aura_brain', 'daemon.pid'), 'utf8'), 10);
+        process.kill(pid, 0);
+        return true;
     } catch (error) {
-        console.error('[Aura Brain Daemon] Failed to start:', error);
+        return error.code === 'EPERM';
     }
 }
 
 /**
- * Request correction from the daemon
- * @param {string} line - Line of code to correct
- * @returns {Promise<{original: string, corrected: string, changed: boolean}>}
+ * Start the Brain Daemon process, or join the one the CLI or dev server started,
+ * then wait for its ready signal while showing load progress
  */
-function requestCorrection(line) {
-    return new Promise((resolve, reject) => {
-        if (!brainDaemon) {
+async function startBrainDaemon(context) {
+    const workspaceFolder = vscode.workspace.workspaceFolders?.[0]?.uri.fsPath;
+    if (!workspaceFolder) return;
+
+    if (!await connectBrain(workspaceFolder)) {
+        if (!daemonRunning(workspaceFolder)) {
+            try {
+                const brainDir = path.join(workspaceFolder, '.aura_brain');
+                fs.mkdirSync(brainDir, { recursive: true });
+                const log = fs.openSync(path.join(brainDir, 'daemon.log'), 'a');
+
+                // Detached, so it keeps serving the CLI and dev server when VS Code closes
+                const daemon = spawn('python', ['-m', 'transpiler.brain_daemon'], {
+                    cwd: workspaceFolder,
+                    detached: true,
+                    stdio: ['ignore', log, log]
+                });
+                daemon.on('error', (error) => {
+                    console.error('[Aura Brain Daemon] Failed to start:', error);
+                });
+                daemon.unref();
+            } catch (error) {
+                console.error('[Aura Brain Daemon] Failed to start:', error);
+                return;
+            }
+        }
+
+        // The daemon listens within moments, before its model has loaded
+        let connected = false;
+        for (let waited = 0; waited < 10000 && !connected; waited += 100) {
+            await new Promise((resolve) => setTimeout(resolve, 100));
+            connected = await connectBrain(workspaceFolder);
+        }
+        if (!connected) {
+            console.error('[Aura Brain Daemon] Did not come up, see .aura_brain/daemon.log');
+            return;
+        }
+    }
+
+    const ready = sendRequest('wait_ready', {}, 10 * 60 * 1000);
+    let loaded = false;
+    ready.then(() => { loaded = true; });
+    let status = await sendRequest('status', {}, 1000);
+    while (!loaded && status && status.state === 'loading') {
+        const percent = Math.round(status.progress * 100);
+        vscode.window.setStatusBarMessage(`$(sync~spin) Aura Brain: ${status.stage} (${percent}%)`, 600);
+        await new Promise((resolve) => setTimeout(resolve, 500));
+        status = await sendRequest('status', {}, 1000);
+    }
+    status = await ready;
+    if (status && status.state === 'ready') {
+        console.log('[Aura Brain Daemon] Ready');
+    } else {
+        console.error(`[Aura Brain Daemon] Failed to load: ${status ? status.error : 'no response'}`);
+    }
+}
+
+/**
+ * Send a JSON-RPC request to the daemon; resolves to its result, or null on error or timeout.
+ * onPartial, if given, receives the params of each partial notification for the request.
+ */
+function sendRequest(method, params, timeoutMs, onPartial) {
+    return new Promise((resolve) => {
+        if (!brainSocket) {
             resolve(null);
             return;
         }
@@ -168,43 +299,58 @@ function requestCorrection(line) {
         const request = {
             jsonrpc: '2.0',
             id: id,
-            method: 'correct',
-            params: { line: line }
+            method: method,
+            params: params
         };
 
-        let responseData = '';
-        
-        const onData = (data) => {
-            responseData += data.toString();
-            
-            // Check if we have a complete JSON response
-            try {
-                const response = JSON.parse(responseData);
-                if (response.id === id) {
-                    brainDaemon.stdout.removeListener('data', onData);
-                    resolve(response.result);
-                }
-            } catch (e) {
-                // Not complete yet, keep accumulating
-            }
-        };
+        const timer = setTimeout(() => {
+            pending.delete(id);
+            partials.delete(id);
+            resolve(null);
+        }, timeoutMs);
 
-        brainDaemon.stdout.on('data', onData);
-        
-        // Send request
-        brainDaemon.stdin.write(JSON.stringify(request) + '\n');
+        pending.set(id, (result) => {
+            clearTimeout(timer);
+            partials.delete(id);
+            resolve(result);
+        });
+        if (onPartial) partials.set(id, onPartial);
 
-        // Timeout after 500ms
-        setTimeout(() => {
-            brainDaemon.stdout.removeListener('data', onData);
-            resolve(null);
-        }, 500);
+        // The response is matched by id, so requests can overlap
+        brainSocket.write(JSON.stringify(request) + '\n');
+    });
+}
+
+let restarting = null;
+
+/**
+ * Request correction from the daemon. The answer streams into the status bar as
+ * the model writes it; if time runs out, a whole command already streamed is used.
+ * @param {string} line - Line of code to correct
+ * @returns {Promise<{original: string, corrected: string, changed: boolean}>}
+ */
+async function requestCorrection(line) {
+    if (!brainSocket) {
+        // The daemon exits when idle; bring it back for the next request
+        if (!restarting) {
+            restarting = startBrainDaemon().finally(() => { restarting = null; });
+        }
+        return null;
+    }
+    let streamed = null;
+    // Timeout after 500ms
+    const result = await sendRequest('correct', { line: line, stream: true }, 500, (partial) => {
+        vscode.window.setStatusBarMessage(`$(sparkle) Aura Brain: ${partial.text}`, 1500);
+        if (partial.complete) streamed = partial.text;
     });
+    if (result) return result;
+    return streamed ? { original: line, corrected: streamed, changed: streamed !== line } : null;
 }
 
 function deactivate() {
-    if (brainDaemon) {
-        brainDaemon.kill();
+    // The daemon stays up for the other clients of this project
+    if (brainSocket) {
+        brainSocket.end();
     }
 }
 